@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import collections
+import copy
 from functools import wraps
 import sys
 import warnings
@@ -41,6 +42,7 @@ from lifelines.utils import (
     check_low_var,
     check_positivity,
     StatisticalWarning,
+    ConvergenceWarning,
     StatError,
     median_survival_times,
     normalize,
@@ -272,6 +274,8 @@ class ParametericUnivariateFitter(UnivariateFitter):
 
     _KNOWN_MODEL = False
     _MIN_PARAMETER_VALUE = 1e-9
+    # the maximum number of points in the default timeline.
+    _TIMELINE_RESOLUTION = 1000
 
     def __init__(self, *args, **kwargs):
         super(ParametericUnivariateFitter, self).__init__(*args, **kwargs)
@@ -398,6 +402,62 @@ class ParametericUnivariateFitter(UnivariateFitter):
         ll = ll + (W[non_zero_entries] * self._cumulative_hazard(params, entry[non_zero_entries])).sum()
         return -ll / W.sum()
 
+    def _cumulative_hazard_and_derivatives(self, params, times):
+        """
+        Known models can implement this, and ``_log_hazard_and_derivatives``, with their closed-form derivatives.
+        They return the values at ``times``, a (k, n) array of the gradients with respect to the k parameters,
+        and a (k, k, n) array of the Hessians. Otherwise, autograd is used to differentiate the likelihood.
+        """
+        raise NotImplementedError("Subclass may implement this.")
+
+    def _log_hazard_and_derivatives(self, params, times):
+        """
+        See ``_cumulative_hazard_and_derivatives``.
+        """
+        raise NotImplementedError("Subclass may implement this.")
+
+    @staticmethod
+    def _chain_rule(value, first, second, gradient, hessian):
+        """
+        The derivatives of f(u), from the first and second derivatives of f, and the (k, n) gradient and
+        (k, k, n) Hessian of u with respect to the parameters.
+        """
+        return value, first * gradient, second * np.einsum("in,jn->ijn", gradient, gradient) + first * hessian
+
+    def _has_closed_form_derivatives(self):
+        # the derivatives of a known model are wrong for a subclass that changes its hazard.
+        for cls in type(self).__mro__:
+            if "_cumulative_hazard_and_derivatives" in vars(cls):
+                return cls is not ParametericUnivariateFitter
+            if any(name in vars(cls) for name in ("_cumulative_hazard", "_hazard", "_log_hazard")):
+                return False
+        return False
+
+    def _negative_log_likelihood_right_censoring_and_derivatives(self, params, Ts, E, entry, W):
+        """
+        The value, gradient and Hessian of ``_negative_log_likelihood_right_censoring``, without autograd.
+        """
+        T = Ts[0]
+        non_zero_entries = entry > 0
+        observed_weights, entry_weights = W[E], W[non_zero_entries]
+
+        log_hz, log_hz_gradient, log_hz_hessian = self._log_hazard_and_derivatives(params, T[E])
+        cum_haz, cum_haz_gradient, cum_haz_hessian = self._cumulative_hazard_and_derivatives(params, T)
+        entry_cum_haz, entry_cum_haz_gradient, entry_cum_haz_hessian = self._cumulative_hazard_and_derivatives(
+            params, entry[non_zero_entries]
+        )
+
+        ll = observed_weights.dot(log_hz) - W.dot(cum_haz) + entry_weights.dot(entry_cum_haz)
+        gradient = (
+            log_hz_gradient.dot(observed_weights) - cum_haz_gradient.dot(W) + entry_cum_haz_gradient.dot(entry_weights)
+        )
+        hessian_ = (
+            log_hz_hessian.dot(observed_weights) - cum_haz_hessian.dot(W) + entry_cum_haz_hessian.dot(entry_weights)
+        )
+
+        n = W.sum()
+        return -ll / n, -gradient / n, -hessian_ / n
+
     def _negative_log_likelihood_interval_censoring(self, params, Ts, E, entry, W):
         start, stop = Ts
         non_zero_entries = entry > 0
@@ -420,8 +480,93 @@ class ParametericUnivariateFitter(UnivariateFitter):
         ll = ll + (W[non_zero_entries] * self._cumulative_hazard(params, entry[non_zero_entries])).sum()
         return -ll / W.sum()
 
+    def _compress(self, Ts, E, entry, weights):
+        """
+        Merges identical (durations, event, entry) rows into a single row, with the sum of their weights. The
+        log-likelihood, and hence the parameters and Hessian, are unchanged, but each iteration of the
+        optimization is proportional to the number of unique rows, not the number of observations.
+        """
+        columns = [T for T in Ts if T is not None] + [E, entry]
+        rows, inverse = np.unique(np.column_stack(columns).astype(float), axis=0, return_inverse=True)
+        if rows.shape[0] == E.shape[0]:
+            return Ts, E, entry, weights
+
+        compressed_weights = np.bincount(inverse.ravel(), weights=weights, minlength=rows.shape[0])
+        columns = iter(rows.T)
+        compressed_Ts = tuple(None if T is None else next(columns) for T in Ts)
+        compressed_E = next(columns).astype(bool)
+        compressed_entry = next(columns)
+        return compressed_Ts, compressed_E, compressed_entry, compressed_weights
+
     def _compute_confidence_bounds_of_cumulative_hazard(self, alpha, ci_labels):
-        return self._compute_confidence_bounds_of_transform(self._cumulative_hazard, alpha, ci_labels)
+        jacobian = self._jacobians_on_timeline()["cumulative_hazard_"]
+        return self._compute_confidence_bounds(
+            self.cumulative_hazard_.values[:, 0], self._standard_errors_of_transform(jacobian), alpha, ci_labels
+        )
+
+    def _compute_confidence_bounds_of_hazard(self, alpha, ci_labels):
+        jacobian = self._jacobians_on_timeline()["hazard_"]
+        return self._compute_confidence_bounds(
+            self.hazard_.values[:, 0], self._standard_errors_of_transform(jacobian), alpha, ci_labels
+        )
+
+    def _compute_confidence_bounds_of_survival_function(self, alpha, ci_labels):
+        return self._compute_confidence_bounds(
+            self.survival_function_.values[:, 0], self._standard_errors_of_survival_function(), alpha, ci_labels
+        )
+
+    def _compute_confidence_bounds_of_cumulative_density(self, alpha, ci_labels):
+        return self._compute_confidence_bounds(
+            self.cumulative_density_.values[:, 0], self._standard_errors_of_survival_function(), alpha, ci_labels
+        )
+
+    def _standard_errors_of_survival_function(self):
+        # the gradients of S = exp(-H), and of 1 - S, are -S and S times the gradient of H.
+        jacobian = self._jacobians_on_timeline()["cumulative_hazard_"]
+        return self.survival_function_.values[:, 0] * self._standard_errors_of_transform(jacobian)
+
+    def _jacobians_on_timeline(self):
+        """
+        The (k, len(timeline)) Jacobians of the cumulative hazard and the hazard on the timeline, with respect to
+        the parameters. They are computed once per fit, and shared by all the confidence intervals.
+        """
+        if "jacobians" in self._estimates:
+            return self._estimates["jacobians"]
+
+        params, timeline = self._fitted_parameters_, self.timeline.astype(float)
+        if self._has_closed_form_derivatives() and (timeline > 0).all():
+            log_hz, log_hz_jacobian, _ = self._log_hazard_and_derivatives(params, timeline)
+            _, cum_haz_jacobian, _ = self._cumulative_hazard_and_derivatives(params, timeline)
+            jacobians = {"cumulative_hazard_": cum_haz_jacobian, "hazard_": np.exp(log_hz) * log_hz_jacobian}
+        else:
+            jacobians = {
+                "cumulative_hazard_": self._jacobian_of_transform(self._cumulative_hazard, params, timeline),
+                "hazard_": self._jacobian_of_transform(self._hazard, params, timeline),
+            }
+
+        self._estimates["jacobians"] = jacobians
+        return jacobians
+
+    @staticmethod
+    def _jacobian_of_transform(transform, params, times):
+        # pylint: disable=no-value-for-parameter
+        jvp = make_jvp_reversemode(transform)(params, times)
+        return np.vstack([jvp(basis) for basis in np.eye(len(params), dtype=float)])
+
+    def _standard_errors_of_transform(self, jacobian):
+        return np.sqrt(np.einsum("jn,jk,kn->n", jacobian, self.variance_matrix_, jacobian))
+
+    def _compute_confidence_bounds(self, estimate, standard_errors, alpha, ci_labels):
+        z = inv_normal_cdf(1 - alpha / 2.0)
+
+        if ci_labels is None:
+            ci_labels = ["%s_upper_%g" % (self._label, 1 - alpha), "%s_lower_%g" % (self._label, 1 - alpha)]
+        assert len(ci_labels) == 2, "ci_labels should be a length 2 array."
+
+        df = pd.DataFrame(index=self.timeline)
+        df[ci_labels[0]] = estimate + z * standard_errors
+        df[ci_labels[1]] = estimate - z * standard_errors
+        return df
 
     def _compute_confidence_bounds_of_transform(self, transform, alpha, ci_labels):
         """
@@ -441,30 +586,9 @@ class ParametericUnivariateFitter(UnivariateFitter):
         ci_labels: tuple
 
         """
-        alpha2 = 1 - alpha / 2.0
-        z = inv_normal_cdf(alpha2)
-        df = pd.DataFrame(index=self.timeline)
-
-        # pylint: disable=no-value-for-parameter
-        gradient_of_cum_hazard_at_mle = make_jvp_reversemode(transform)(
-            self._fitted_parameters_, self.timeline.astype(float)
-        )
-
-        gradient_at_times = np.vstack(
-            [gradient_of_cum_hazard_at_mle(basis) for basis in np.eye(len(self._fitted_parameters_), dtype=float)]
-        )
-
-        std_cumulative_hazard = np.sqrt(
-            np.einsum("nj,jk,nk->n", gradient_at_times.T, self.variance_matrix_, gradient_at_times.T)
-        )
-
-        if ci_labels is None:
-            ci_labels = ["%s_upper_%g" % (self._label, 1 - alpha), "%s_lower_%g" % (self._label, 1 - alpha)]
-        assert len(ci_labels) == 2, "ci_labels should be a length 2 array."
-
-        df[ci_labels[0]] = transform(self._fitted_parameters_, self.timeline) + z * std_cumulative_hazard
-        df[ci_labels[1]] = transform(self._fitted_parameters_, self.timeline) - z * std_cumulative_hazard
-        return df
+        params, timeline = self._fitted_parameters_, self.timeline.astype(float)
+        standard_errors = self._standard_errors_of_transform(self._jacobian_of_transform(transform, params, timeline))
+        return self._compute_confidence_bounds(transform(params, timeline), standard_errors, alpha, ci_labels)
 
     def _fit_model(self, Ts, E, entry, weights, show_progress=True):
         if CensoringType.is_left_censoring(self):
@@ -474,11 +598,19 @@ class ParametericUnivariateFitter(UnivariateFitter):
         elif CensoringType.is_right_censoring(self):
             negative_log_likelihood = self._negative_log_likelihood_right_censoring
 
+        if CensoringType.is_right_censoring(self) and self._has_closed_form_derivatives():
+            derivatives = self._negative_log_likelihood_right_censoring_and_derivatives
+            value_and_gradient = lambda *args: derivatives(*args)[:2]
+            hessian_of_negative_log_likelihood = lambda *args: derivatives(*args)[2]
+        else:
+            value_and_gradient = value_and_grad(negative_log_likelihood)  # pylint: disable=no-value-for-parameter
+            hessian_of_negative_log_likelihood = hessian(negative_log_likelihood)
+
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
 
             results = minimize(
-                value_and_grad(negative_log_likelihood),  # pylint: disable=no-value-for-parameter
+                value_and_gradient,
                 self._initial_values,
                 jac=True,
                 method="L-BFGS-B",
@@ -488,8 +620,7 @@ class ParametericUnivariateFitter(UnivariateFitter):
             )
 
             if results.success:
-                # pylint: disable=no-value-for-parameter
-                hessian_ = hessian(negative_log_likelihood)(results.x, Ts, E, entry, weights)
+                hessian_ = hessian_of_negative_log_likelihood(results.x, Ts, E, entry, weights)
                 return results.x, -results.fun * weights.sum(), hessian_ * weights.sum()
 
             # convergence failed.
@@ -637,7 +768,8 @@ class ParametericUnivariateFitter(UnivariateFitter):
         event_observed: numpy array or pd.Series, optional
           length n, True if the the death was observed, False if the event was lost (right-censored). Defaults all True if event_observed==None
         timeline: list, optional
-            return the estimate at the values in timeline (positively increasing)
+            return the estimate at the values in timeline (positively increasing). Default is up to
+            1000 evenly spaced points between the smallest and largest durations.
         label: string, optional
             a string to name the column of the estimate.
         alpha: float, optional
@@ -706,7 +838,8 @@ class ParametericUnivariateFitter(UnivariateFitter):
         event_observed: numpy array or pd.Series, optional
           length n, True if the the death was observed, False if the event was lost (right-censored). Defaults all True if event_observed==None
         timeline: list, optional
-            return the estimate at the values in timeline (positively increasing)
+            return the estimate at the values in timeline (positively increasing). Default is up to
+            1000 evenly spaced points between the smallest and largest durations.
         label: string, optional
             a string to name the column of the estimate.
         alpha: float, optional
@@ -770,7 +903,8 @@ class ParametericUnivariateFitter(UnivariateFitter):
         event_observed: numpy array or pd.Series, optional
           length n, if left optional, infer from ``lower_bound`` and ``upper_cound`` (if lower_bound==upper_bound then event observed, if lower_bound < upper_bound, then event censored)
         timeline: list, optional
-            return the estimate at the values in timeline (positively increasing)
+            return the estimate at the values in timeline (positively increasing). Default is up to
+            1000 evenly spaced points between the smallest and largest durations.
         label: string, optional
             a string to name the column of the estimate.
         alpha: float, optional
@@ -820,6 +954,207 @@ class ParametericUnivariateFitter(UnivariateFitter):
             weights=weights,
         )
 
+    def fit_groups(
+        self, durations, event_observed, groups, entry=None, weights=None, max_steps=100, precision=1e-8
+    ):  # pylint: disable=too-many-arguments
+        """
+        Fit a separate model, to right-censored data, for each group, ex: for each product. For models with
+        closed-form derivatives (``ExponentialFitter``, ``WeibullFitter``, ``LogNormalFitter`` and
+        ``LogLogisticFitter``), all the groups are fit at once, by a damped (Levenberg-Marquardt) Newton's
+        method on the block-diagonal problem. Other models fit each group in turn.
+
+        Parameters
+        ----------
+        durations: an array, or pd.Series
+          length n, duration subject was observed for
+        event_observed: numpy array or pd.Series
+          length n, True if the the death was observed, False if the event was lost (right-censored). If None, all
+          deaths are observed.
+        groups: an array, or pd.Series
+          length n, the group of each subject.
+        entry: an array, or pd.Series, of length n, optional
+            relative time when a subject entered the study. See ``fit``.
+        weights: an array, or pd.Series, of length n, optional
+            integer weights per observation
+        max_steps: int, optional (default=100)
+            the maximum number of Newton steps.
+        precision: float, optional (default=1e-8)
+            a group has converged when the largest change of its parameters is less than this.
+
+        Returns
+        -------
+        summary: DataFrame
+            indexed by (group, parameter), with the columns of ``summary``, except the p-values, plus
+            ``log-likelihood``, the log-likelihood of the group's fit, and ``converged``.
+
+        Note
+        ----
+        The fitter itself is unchanged.
+
+        Examples
+        --------
+        >>> from lifelines import WeibullFitter
+        >>> from lifelines.datasets import load_waltons
+        >>>
+        >>> waltons = load_waltons()
+        >>> WeibullFitter().fit_groups(waltons['T'], waltons['E'], waltons['group'])
+
+        """
+        T = np.asarray(pass_for_numeric_dtypes_or_raise_array(durations)).astype(float)
+        check_nans_or_infs(T)
+        check_positivity(T)
+        n = T.shape[0]
+        E = np.asarray(event_observed, dtype=bool) if event_observed is not None else np.ones(n, dtype=bool)
+        entry = np.asarray(entry, dtype=float) if entry is not None else np.zeros(n)
+        W = np.asarray(weights, dtype=float) if weights is not None else np.ones(n)
+        codes, labels = pd.factorize(np.asarray(groups), sort=True)
+
+        if self._has_closed_form_derivatives():
+            params, log_likelihoods, hessians, converged = self._fit_groups_model(
+                codes, labels.shape[0], T, E, entry, W, max_steps, precision
+            )
+        else:
+            params, log_likelihoods, hessians, converged = self._fit_groups_in_turn(codes, labels, T, E, entry, W)
+
+        if not converged.all() and self._has_closed_form_derivatives():
+            warnings.warn(
+                "%d of %d groups did not converge within max_steps=%d steps. Try a larger max_steps."
+                % ((~converged).sum(), labels.shape[0], max_steps),
+                ConvergenceWarning,
+            )
+        elif not converged.all():
+            warnings.warn(
+                "%d of %d groups did not converge." % ((~converged).sum(), labels.shape[0]), ConvergenceWarning
+            )
+
+        se = np.full(params.shape, np.nan)
+        finite = np.isfinite(hessians).all(axis=(1, 2))
+        if finite.any():
+            with np.errstate(invalid="ignore"):
+                se[finite] = np.sqrt(np.diagonal(pinv(-hessians[finite]), axis1=1, axis2=2))
+
+        ci = 1 - self.alpha
+        z = inv_normal_cdf(1 - self.alpha / 2.0)
+        k = len(self._fitted_parameter_names)
+        summary = pd.DataFrame(
+            index=pd.MultiIndex.from_product([labels, self._fitted_parameter_names], names=["group", "param"])
+        )
+        summary["coef"] = params.ravel()
+        summary["se(coef)"] = se.ravel()
+        summary["lower %g" % ci] = summary["coef"] - z * summary["se(coef)"]
+        summary["upper %g" % ci] = summary["coef"] + z * summary["se(coef)"]
+        summary["log-likelihood"] = np.repeat(log_likelihoods, k)
+        summary["converged"] = np.repeat(converged, k)
+        return summary
+
+    def _fit_groups_in_turn(self, codes, labels, T, E, entry, W):
+        k = len(self._fitted_parameter_names)
+        params = np.full((labels.shape[0], k), np.nan)
+        log_likelihoods = np.full(labels.shape[0], np.nan)
+        hessians = np.full((labels.shape[0], k, k), np.nan)
+        converged = np.zeros(labels.shape[0], dtype=bool)
+
+        for g in range(labels.shape[0]):
+            rows = codes == g
+            try:
+                f = copy.copy(self).fit(T[rows], E[rows], entry=entry[rows], weights=W[rows])
+            except ConvergenceError:
+                continue
+            params[g], log_likelihoods[g], hessians[g] = f._fitted_parameters_, f._log_likelihood, -f._hessian_
+            converged[g] = True
+        return params, log_likelihoods, hessians, converged
+
+    def _fit_groups_model(self, codes, n_groups, T, E, entry, W, max_steps, precision):
+        # merge identical rows within a group, see _compress.
+        rows, inverse = np.unique(np.column_stack([codes, T, E, entry]), axis=0, return_inverse=True)
+        W = np.bincount(inverse.ravel(), weights=W, minlength=rows.shape[0])
+        codes, T, E, entry = rows[:, 0].astype(int), rows[:, 1], rows[:, 2].astype(bool), rows[:, 3]
+
+        lower_bounds = np.array([-np.inf if lb is None else lb for (lb, _) in self._bounds])
+        upper_bounds = np.array([np.inf if ub is None else ub for (_, ub) in self._bounds])
+
+        def log_likelihood_and_derivatives(params):
+            return self._grouped_log_likelihood_and_derivatives(params, codes, n_groups, T, E, entry, W)
+
+        # every group starts from the same initial values as fit.
+        params = np.tile(self._initial_values, (n_groups, 1)).astype(float)
+        ll, gradient, hessian_ = log_likelihood_and_derivatives(params)
+        converged = np.zeros(n_groups, dtype=bool)
+        # the Levenberg-Marquardt damping of each group.
+        damping = np.zeros(n_groups)
+        identity = np.eye(params.shape[1])
+
+        for _ in range(max_steps):
+            # Marquardt's scaling: the damping is relative to the diagonal of the negative Hessian, so it is
+            # the same for every parameter, whatever the scale of the durations.
+            diagonal_scale = np.sqrt(np.abs(np.diagonal(hessian_, axis1=1, axis2=2))) + 1e-12
+            scaled_hessian = -hessian_ / (diagonal_scale[:, :, None] * diagonal_scale[:, None, :])
+            scaled_gradient = gradient / diagonal_scale
+            # the shift that makes each group's scaled negative Hessian positive definite.
+            definite_shift = np.maximum(0, 1e-8 - np.linalg.eigvalsh(scaled_hessian)[:, 0])
+
+            # increase each group's damping until its step is within the bounds and doesn't decrease its
+            # log-likelihood. The damped step moves from Newton's step towards a short gradient step.
+            for _ in range(50):
+                shift = definite_shift + damping
+                damped_hessian = scaled_hessian + shift[:, None, None] * identity
+                delta = np.linalg.solve(damped_hessian, scaled_gradient[..., None])[..., 0] / diagonal_scale
+                delta[converged] = 0
+                candidate = params + delta
+                within_bounds = ((candidate > lower_bounds) & (candidate < upper_bounds)).all(1)
+                candidate[~within_bounds] = params[~within_bounds]
+                with np.errstate(all="ignore"):
+                    candidate_ll, candidate_gradient, candidate_hessian = log_likelihood_and_derivatives(candidate)
+                rejected = ~within_bounds | ~(candidate_ll >= ll - 1e-12 * np.abs(ll))
+                if not rejected.any():
+                    break
+                damping[rejected] = np.maximum(10 * damping[rejected], 1e-3)
+
+            accepted = ~rejected
+            small_step = (np.abs(delta) < precision * (1 + np.abs(params))).all(1)
+            converged |= accepted & small_step & (shift <= 1e-3)
+            damping[accepted] /= 10
+            params[accepted] = candidate[accepted]
+            ll[accepted] = candidate_ll[accepted]
+            gradient[accepted] = candidate_gradient[accepted]
+            hessian_[accepted] = candidate_hessian[accepted]
+
+            if converged.all():
+                break
+
+        return params, ll, hessian_, converged
+
+    def _grouped_log_likelihood_and_derivatives(self, params, codes, n_groups, T, E, entry, W):
+        """
+        The log-likelihood, and its gradient and Hessian, of each group's right-censored data, where params is a
+        (n_groups, k) array of each group's parameters.
+        """
+        k = params.shape[1]
+        ll, gradient, hessian_ = np.zeros(n_groups), np.zeros((n_groups, k)), np.zeros((n_groups, k, k))
+        non_zero_entries = entry > 0
+        everyone = np.ones(T.shape[0], dtype=bool)
+
+        for rows, times, sign, derivatives in [
+            (E, T, 1, self._log_hazard_and_derivatives),
+            (everyone, T, -1, self._cumulative_hazard_and_derivatives),
+            (non_zero_entries, entry, 1, self._cumulative_hazard_and_derivatives),
+        ]:
+            if not rows.any():
+                continue
+            value, value_gradient, value_hessian = derivatives(params[codes[rows]].T, times[rows])
+            weights = sign * W[rows]
+            ll += self._sum_by_group(codes[rows], weights * value, n_groups)
+            gradient += self._sum_by_group(codes[rows], weights * value_gradient, n_groups)
+            hessian_ += self._sum_by_group(codes[rows], weights * value_hessian, n_groups)
+
+        return ll, gradient, hessian_
+
+    @staticmethod
+    def _sum_by_group(codes, values, n_groups):
+        # sums the last axis of values by group, and moves the groups to the first axis.
+        sums = [np.bincount(codes, weights=v, minlength=n_groups) for v in values.reshape(-1, values.shape[-1])]
+        return np.moveaxis(np.reshape(sums, values.shape[:-1] + (n_groups,)), -1, 0)
+
     def _fit(
         self,
         Ts,
@@ -850,15 +1185,18 @@ class ParametericUnivariateFitter(UnivariateFitter):
         if timeline is not None:
             self.timeline = np.sort(np.asarray(timeline).astype(float))
         else:
-            self.timeline = np.linspace(coalesce(*Ts).min(), coalesce(*Ts).max(), n)
+            self.timeline = np.linspace(coalesce(*Ts).min(), coalesce(*Ts).max(), min(n, self._TIMELINE_RESOLUTION))
 
         self._label = label
         self._ci_labels = ci_labels
         self.alpha = coalesce(alpha, self.alpha)
 
         # estimation
+        compressed_Ts, compressed_E, compressed_entry, compressed_weights = self._compress(
+            Ts, self.event_observed.astype(bool), self.entry, self.weights
+        )
         self._fitted_parameters_, self._log_likelihood, self._hessian_ = self._fit_model(
-            Ts, self.event_observed.astype(bool), self.entry, self.weights, show_progress=show_progress
+            compressed_Ts, compressed_E, compressed_entry, compressed_weights, show_progress=show_progress
         )
 
         if not self._KNOWN_MODEL:
@@ -890,14 +1228,44 @@ class ParametericUnivariateFitter(UnivariateFitter):
             warnings.warn(warning_text, StatisticalWarning)
 
         self._update_docstrings()
-
-        self.survival_function_ = self.survival_function_at_times(self.timeline).to_frame()
-        self.hazard_ = self.hazard_at_times(self.timeline).to_frame()
-        self.cumulative_hazard_ = self.cumulative_hazard_at_times(self.timeline).to_frame()
-        self.cumulative_density_ = self.cumulative_density_at_times(self.timeline).to_frame()
+        # the estimates on the timeline are computed on first access.
+        self._estimates = {}
 
         return self
 
+    def _estimate_on_timeline(self, name, estimate_at_times):
+        if name not in self._estimates:
+            self._estimates[name] = estimate_at_times(self.timeline).to_frame()
+        return self._estimates[name]
+
+    @property
+    def survival_function_(self):
+        """
+        The estimated survival function on the ``timeline``. It's computed on first access.
+        """
+        return self._estimate_on_timeline("survival_function_", self.survival_function_at_times)
+
+    @property
+    def hazard_(self):
+        """
+        The estimated hazard on the ``timeline``. It's computed on first access.
+        """
+        return self._estimate_on_timeline("hazard_", self.hazard_at_times)
+
+    @property
+    def cumulative_hazard_(self):
+        """
+        The estimated cumulative hazard on the ``timeline``. It's computed on first access.
+        """
+        return self._estimate_on_timeline("cumulative_hazard_", self.cumulative_hazard_at_times)
+
+    @property
+    def cumulative_density_(self):
+        """
+        The estimated cumulative density function on the ``timeline``. It's computed on first access.
+        """
+        return self._estimate_on_timeline("cumulative_density_", self.cumulative_density_at_times)
+
     def survival_function_at_times(self, times, label=None):
         """
         Return a Pandas series of the predicted survival value at specific times.
@@ -1001,21 +1369,21 @@ class ParametericUnivariateFitter(UnivariateFitter):
         """
         The confidence interval of the hazard.
         """
-        return self._compute_confidence_bounds_of_transform(self._hazard, self.alpha, self._ci_labels)
+        return self._compute_confidence_bounds_of_hazard(self.alpha, self._ci_labels)
 
     @property
     def confidence_interval_survival_function_(self):
         """
         The confidence interval of the survival function.
         """
-        return self._compute_confidence_bounds_of_transform(self._survival_function, self.alpha, self._ci_labels)
+        return self._compute_confidence_bounds_of_survival_function(self.alpha, self._ci_labels)
 
     @property
     def confidence_interval_cumulative_density_(self):
         """
         The confidence interval of the survival function.
         """
-        return self._compute_confidence_bounds_of_transform(self._cumulative_density, self.alpha, self._ci_labels)
+        return self._compute_confidence_bounds_of_cumulative_density(self.alpha, self._ci_labels)
 
     def plot(self, **kwargs):
         """
@@ -1977,6 +2345,18 @@ class ParametericAFTRegressionFitter(BaseFitter):
         """
         return self.predict_percentile(X, p=0.5, ancillary_X=ancillary_X)
 
+    def to_scorer(self):
+        """
+        Returns an immutable scorer that predicts the cumulative hazard, survival function, percentiles and
+        expectation of new subjects from numpy arrays. It skips the pandas overhead of the ``predict_*`` methods,
+        so it's much faster for scoring one subject at a time, and can be shared between threads.
+
+        Returns
+        -------
+        scorer: see ``lifelines.scorers``
+        """
+        return self._scorer_class(self)
+
     @property
     def score_(self):
         """
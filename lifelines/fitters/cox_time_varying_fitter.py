@@ -28,6 +28,8 @@ from lifelines.utils import (
     check_for_instantaneous_events,
     pass_for_numeric_dtypes_or_raise_array,
     ConvergenceError,
+    _get_thread_pool,
+    _contiguous_strata,
     ConvergenceWarning,
     inv_normal_cdf,
     normalize,
@@ -88,6 +90,7 @@ class CoxTimeVaryingFitter(BaseFitter):
         self.alpha = alpha
         self.penalizer = penalizer
         self.strata = strata
+        self._executor = None
 
     def fit(
         self,
@@ -102,6 +105,7 @@ class CoxTimeVaryingFitter(BaseFitter):
         robust=False,
         strata=None,
         initial_point=None,
+        n_jobs=1,
     ):  # pylint: disable=too-many-arguments
         """
         Fit the Cox Proportional Hazard model to a time varying dataset. Tied survival times
@@ -128,9 +132,9 @@ class CoxTimeVaryingFitter(BaseFitter):
             the column that contains (possibly time-varying) weight of each subject-period row.
         show_progress: since the fitter is iterative, show convergence
            diagnostics.
-        robust: boolean, optional (default: True)
-            Compute the robust errors using the Huber sandwich estimator, aka Wei-Lin estimate. This does not handle
-          ties, so if there are high number of ties, results may significantly differ. See
+        robust: boolean, optional (default: False)
+            Compute the robust errors using the Huber sandwich estimator, aka Wei-Lin estimate, clustered on the subjects
+          in ``id_col``. Ties are handled using Efron's method. See
           "The Robust Inference for the Cox Proportional Hazards Model", Journal of the American Statistical Association, Vol. 84, No. 408 (Dec., 1989), pp. 1074- 1078
         step_size: float, optional
             set an initial step size for the fitting algorithm.
@@ -142,6 +146,9 @@ class CoxTimeVaryingFitter(BaseFitter):
         initial_point: (d,) numpy array, optional
             initialize the starting point of the iterative
             algorithm. Default is the zero vector.
+        n_jobs: int, optional (default=1)
+            when using strata, the number of threads used to compute the strata in parallel. Use -1 to use all CPUs.
+            This is useful when there are many, large, strata.
 
         Returns
         --------
@@ -151,8 +158,6 @@ class CoxTimeVaryingFitter(BaseFitter):
         """
         self.strata = coalesce(strata, self.strata)
         self.robust = robust
-        if self.robust:
-            raise NotImplementedError("Not available yet.")
 
         self.event_col = event_col
         self.id_col = id_col
@@ -186,6 +191,8 @@ class CoxTimeVaryingFitter(BaseFitter):
             df = df.set_index(_to_list(self.strata) + ["id"])  # TODO: needs to be a list
             df = df.sort_index()
 
+        self._clusters = df.index.get_level_values("id").values
+
         events, start, stop = (
             pass_for_numeric_dtypes_or_raise_array(df.pop("event")).astype(bool),
             df.pop("start"),
@@ -199,22 +206,28 @@ class CoxTimeVaryingFitter(BaseFitter):
         self._norm_mean = df.mean(0)
         self._norm_std = df.std(0)
 
-        hazards_ = self._newton_rhaphson(
-            normalize(df, self._norm_mean, self._norm_std),
-            events,
-            start,
-            stop,
-            weights,
-            initial_point=initial_point,
-            show_progress=show_progress,
-            step_size=step_size,
-        )
+        self._executor = _get_thread_pool(n_jobs) if self.strata is not None else None
+        try:
+            hazards_ = self._newton_rhaphson(
+                normalize(df, self._norm_mean, self._norm_std),
+                events,
+                start,
+                stop,
+                weights,
+                initial_point=initial_point,
+                show_progress=show_progress,
+                step_size=step_size,
+            )
 
-        self.hazards_ = pd.Series(hazards_, index=df.columns, name="coef") / self._norm_std
-        self.variance_matrix_ = -inv(self._hessian_) / np.outer(self._norm_std, self._norm_std)
-        self.standard_errors_ = self._compute_standard_errors(
-            normalize(df, self._norm_mean, self._norm_std), events, start, stop, weights
-        )
+            self.hazards_ = pd.Series(hazards_, index=df.columns, name="coef") / self._norm_std
+            self.variance_matrix_ = -inv(self._hessian_) / np.outer(self._norm_std, self._norm_std)
+            self.standard_errors_ = self._compute_standard_errors(
+                normalize(df, self._norm_mean, self._norm_std), events, start, stop, weights
+            )
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
         self.confidence_intervals_ = self._compute_confidence_intervals()
         self.baseline_cumulative_hazard_ = self._compute_cumulative_baseline_hazard(df, events, start, stop, weights)
         self.baseline_survival_ = self._compute_baseline_survival()
@@ -236,25 +249,24 @@ class CoxTimeVaryingFitter(BaseFitter):
         check_for_instantaneous_events(start, stop)
 
     def _partition_by_strata(self, X, events, start, stop, weights):
-        for stratum, stratified_X in X.groupby(self.strata):
-            stratified_W = weights.loc[stratum]
-            stratified_start = start.loc[stratum]
-            stratified_events = events.loc[stratum]
-            stratified_stop = stop.loc[stratum]
-            yield (
-                stratified_X.values,
-                stratified_events.values,
-                stratified_start.values,
-                stratified_stop.values,
-                stratified_W.values,
-            ), stratum
+        # the data is sorted by strata in fit, so each stratum is a contiguous block of rows,
+        # and the partitions can be views rather than copies made by pandas indexing.
+        strata = _contiguous_strata(X.index.droplevel("id"))
+        X, events, start, stop, weights = X.values, events.values, start.values, stop.values, weights.values
+        for stratum, i, j in strata:
+            yield (X[i:j], events[i:j], start[i:j], stop[i:j], weights[i:j]), stratum
 
     def _partition_by_strata_and_apply(self, X, events, start, stop, weights, function, *args):
-        for (
-            (stratified_X, stratified_events, stratified_start, stratified_stop, stratified_W),
-            _,
-        ) in self._partition_by_strata(X, events, start, stop, weights):
-            yield function(stratified_X, stratified_events, stratified_start, stratified_stop, stratified_W, *args)
+        partitions = [partition for partition, _ in self._partition_by_strata(X, events, start, stop, weights)]
+        return self._apply_to_partitions(partitions, function, *args)
+
+    def _apply_to_partitions(self, partitions, function, *args):
+        if self._executor is None:
+            for (stratified_X, stratified_events, stratified_start, stratified_stop, stratified_W) in partitions:
+                yield function(stratified_X, stratified_events, stratified_start, stratified_stop, stratified_W, *args)
+        else:
+            # threads share memory, so the partitions are not copied. Results are yielded in the order of the strata.
+            yield from self._executor.map(lambda partition: function(*(partition + args)), partitions)
 
     def _compute_z_values(self):
         return self.hazards_ / self.standard_errors_
@@ -336,6 +348,10 @@ class CoxTimeVaryingFitter(BaseFitter):
         else:
             beta = np.zeros((d,))
 
+        if self.strata is not None:
+            # the strata don't change between iterations, so only partition the data once.
+            partitions = [partition for partition, _ in self._partition_by_strata(df, events, start, stop, weights)]
+
         i = 0
         converging = True
         ll, previous_ll = 0, 0
@@ -355,9 +371,7 @@ class CoxTimeVaryingFitter(BaseFitter):
                 g = np.zeros_like(beta)
                 h = np.zeros((d, d))
                 ll = 0
-                for _h, _g, _ll in self._partition_by_strata_and_apply(
-                    df, events, start, stop, weights, self._get_gradients, beta
-                ):
+                for _h, _g, _ll in self._apply_to_partitions(partitions, self._get_gradients, beta):
                     g += _g
                     h += _h
                     ll += _ll
@@ -462,10 +476,100 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
 
         return beta
 
+    @staticmethod
+    def _risk_set_entries_and_exits(start, stop, death_times):
+        """
+        A subject-period row is in the risk set of death_times[k] iff start < death_times[k] <= stop. Since death_times
+        is sorted, this is a contiguous range of k, [entry, exit). Sweeping forward through the death times, the row
+        enters the risk set at index entry and leaves it at index exit.
+        """
+        entries = np.searchsorted(death_times, start, side="right")
+        exits = np.searchsorted(death_times, stop, side="right")
+        return entries, exits
+
+    @staticmethod
+    def _sum_over_risk_sets(values, entries, exits, n_death_times):
+        """
+        Computes sum_{rows in risk set of death time k} values, for all k, by adding rows to a running sum as they
+        enter the risk set and subtracting them as they leave.
+        """
+        if values.ndim == 2:
+            sums = np.empty((n_death_times, values.shape[1]))
+            for j in range(values.shape[1]):
+                sums[:, j] = CoxTimeVaryingFitter._sum_over_risk_sets(values[:, j], entries, exits, n_death_times)
+            return sums
+
+        changes = np.bincount(entries, values, n_death_times + 1) - np.bincount(exits, values, n_death_times + 1)
+        return changes.cumsum()[:n_death_times]
+
+    @staticmethod
+    def _efron_risk_sets(X, events, start, stop, scores):
+        """
+        Assumes there is at least one death.
+
+        Computes the Efron-adjusted risk set sums for every death, using a single sweep through time for the
+        risk sets (see _risk_set_entries_and_exits).
+
+        Returns
+        -------
+        entries, exits: (n,) numpy arrays
+            each row is in the risk set of death times [entry, exit).
+        death_ix: (n_deaths,) numpy array
+            the index of the death time of each death.
+        tied_death_counts: (n_death_times,) numpy array
+        increasing_proportion: (n_deaths,) numpy array
+            k/m for the kth of m tied deaths.
+        denom: (n_deaths,) numpy array
+            the Efron-adjusted risk_phi.
+        numer: (n_deaths, d) numpy array
+            the Efron-adjusted risk_phi_x.
+        """
+        unique_death_times = np.unique(stop[events])
+        n_death_times = unique_death_times.shape[0]
+
+        entries, exits = CoxTimeVaryingFitter._risk_set_entries_and_exits(start, stop, unique_death_times)
+
+        phi_x = scores[:, None] * X
+
+        # Calculate sums of Risk set
+        risk_phi = CoxTimeVaryingFitter._sum_over_risk_sets(scores, entries, exits, n_death_times)
+        risk_phi_x = CoxTimeVaryingFitter._sum_over_risk_sets(phi_x, entries, exits, n_death_times)
+
+        # Calculate the sums of Tie set. A death occurs at the last death time of the row's risk set, and
+        # the tie set of a death is, in the notation above, the "risk set" [death_ix, death_ix + 1).
+        death_ix = exits[events] - 1
+        tied_death_counts = np.bincount(death_ix, minlength=n_death_times)  # should always be at least 1
+        tie_phi = CoxTimeVaryingFitter._sum_over_risk_sets(scores[events], death_ix, death_ix + 1, n_death_times)
+        tie_phi_x = CoxTimeVaryingFitter._sum_over_risk_sets(phi_x[events], death_ix, death_ix + 1, n_death_times)
+
+        #
+        # This code is near identical to the _vectorized algorithm in CoxPHFitter. In fact, see that for comments.
+        #
+        # A good explaination for how Efron handles ties. Consider three of five subjects who fail at the time.
+        # As it is not known a priori that who is the first to fail, so one-third of
+        # (φ1 + φ2 + φ3) is adjusted from sum_j^{5} φj after one fails. Similarly two-third
+        # of (φ1 + φ2 + φ3) is adjusted after first two individuals fail, etc.
+        #
+        # Each death is assigned a distinct k in 0..m-1 within its tie group, and contributes the kth Efron term.
+        order = np.argsort(death_ix, kind="mergesort")
+        tie_starts = np.cumsum(tied_death_counts) - tied_death_counts
+        rank_in_ties = np.empty_like(death_ix)
+        rank_in_ties[order] = np.arange(death_ix.shape[0]) - tie_starts[death_ix[order]]
+        increasing_proportion = rank_in_ties / tied_death_counts[death_ix]
+
+        denom = risk_phi[death_ix] - increasing_proportion * tie_phi[death_ix]
+        numer = risk_phi_x[death_ix] - increasing_proportion[:, None] * tie_phi_x[death_ix]
+        return entries, exits, death_ix, tied_death_counts, increasing_proportion, denom, numer
+
     def _get_gradients(self, X, events, start, stop, weights, beta):  # pylint: disable=too-many-locals
         """
         Calculates the first and second order vector differentials, with respect to beta.
 
+        The risk set sums at each death time are computed with a single sweep through time (see
+        _efron_risk_sets), rather than scanning all rows at each death time. The risk_phi_x_x terms
+        are never materialized per death time: since sum_t c_t * risk_phi_x_x(t) is equal to
+        sum_j phi_j * x_j x_j' * (sum_{t in risk set of j} c_t), the Hessian contribution is a single weighted X'X product.
+
         Returns
         -------
         hessian: (d, d) numpy array,
@@ -474,81 +578,38 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         """
 
         _, d = X.shape
-        hessian = np.zeros((d, d))
-        gradient = np.zeros(d)
-        log_lik = 0
-        # weights = weights[:, None]
-        unique_death_times = np.unique(stop[events])
-
-        for t in unique_death_times:
-
-            # I feel like this can be made into some tree-like structure
-            ix = (start < t) & (t <= stop)
-
-            X_at_t = X[ix]
-            weights_at_t = weights[ix]
-            stops_events_at_t = stop[ix]
-            events_at_t = events[ix]
-
-            phi_i = weights_at_t * np.exp(np.dot(X_at_t, beta))
-            phi_x_i = phi_i[:, None] * X_at_t
-            phi_x_x_i = np.dot(X_at_t.T, phi_x_i)
-
-            # Calculate sums of Risk set
-            risk_phi = array_sum_to_scalar(phi_i)
-            risk_phi_x = matrix_axis_0_sum_to_array(phi_x_i)
-            risk_phi_x_x = phi_x_x_i
-
-            # Calculate the sums of Tie set
-            deaths = events_at_t & (stops_events_at_t == t)
-
-            tied_death_counts = array_sum_to_scalar(deaths.astype(int))  # should always at least 1
 
-            xi_deaths = X_at_t[deaths]
+        if not np.any(events):
+            return np.zeros((d, d)), np.zeros(d), 0
 
-            x_death_sum = matrix_axis_0_sum_to_array(weights_at_t[deaths, None] * xi_deaths)
-
-            weight_count = array_sum_to_scalar(weights_at_t[deaths])
-            weighted_average = weight_count / tied_death_counts
-
-            #
-            # This code is near identical to the _batch algorithm in CoxPHFitter. In fact, see _batch for comments.
-            #
+        phi_i = weights * np.exp(np.dot(X, beta))
+        entries, exits, death_ix, tied_death_counts, increasing_proportion, denom, numer = self._efron_risk_sets(
+            X, events, start, stop, phi_i
+        )
+        n_death_times = tied_death_counts.shape[0]
 
-            if tied_death_counts > 1:
+        weights_deaths = weights[events]
+        weighted_average = (np.bincount(death_ix, weights_deaths, n_death_times) / tied_death_counts)[death_ix]
 
-                # A good explaination for how Efron handles ties. Consider three of five subjects who fail at the time.
-                # As it is not known a priori that who is the first to fail, so one-third of
-                # (φ1 + φ2 + φ3) is adjusted from sum_j^{5} φj after one fails. Similarly two-third
-                # of (φ1 + φ2 + φ3) is adjusted after first two individuals fail, etc.
+        denom = 1.0 / denom
+        summand = numer * denom[:, None]
 
-                # a lot of this is now in einstien notation for performance, but see original "expanded" code here
-                # https://github.com/CamDavidsonPilon/lifelines/blob/e7056e7817272eb5dff5983556954f56c33301b1/lifelines/fitters/cox_time_varying_fitter.py#L458-L490
+        x_death_sum = matrix_axis_0_sum_to_array(weights_deaths[:, None] * X[events])
 
-                tie_phi = array_sum_to_scalar(phi_i[deaths])
-                tie_phi_x = matrix_axis_0_sum_to_array(phi_x_i[deaths])
-                tie_phi_x_x = np.dot(xi_deaths.T, phi_i[deaths, None] * xi_deaths)
+        gradient = x_death_sum - matrix_axis_0_sum_to_array(weighted_average[:, None] * summand)
+        log_lik = np.dot(x_death_sum, beta) + array_sum_to_scalar(weighted_average * np.log(denom))
 
-                increasing_proportion = np.arange(tied_death_counts) / tied_death_counts
-                denom = 1.0 / (risk_phi - increasing_proportion * tie_phi)
-                numer = risk_phi_x - np.outer(increasing_proportion, tie_phi_x)
+        a2 = summand.T.dot(weighted_average[:, None] * summand)
 
-                a1 = np.einsum("ab, i->ab", risk_phi_x_x, denom) - np.einsum(
-                    "ab, i->ab", tie_phi_x_x, increasing_proportion * denom
-                )
-            else:
-                # no tensors here, but do some casting to make it easier in the converging step next.
-                denom = 1.0 / np.array([risk_phi])
-                numer = risk_phi_x
-                a1 = risk_phi_x_x * denom
+        # coefficients of risk_phi_x_x and tie_phi_x_x per death time, see docstring above.
+        risk_coef = np.append(0, np.bincount(death_ix, weighted_average * denom, n_death_times).cumsum())
+        tie_coef = np.bincount(death_ix, weighted_average * increasing_proportion * denom, n_death_times)
 
-            summand = numer * denom[:, None]
-            a2 = summand.T.dot(summand)
-
-            gradient = gradient + x_death_sum - weighted_average * summand.sum(0)
-            log_lik = log_lik + np.dot(x_death_sum, beta) + weighted_average * np.log(denom).sum()
-            hessian = hessian + weighted_average * (a2 - a1)
+        row_coef = phi_i * (risk_coef[exits] - risk_coef[entries])
+        row_coef[events] -= phi_i[events] * tie_coef[death_ix]
+        a1 = np.dot(X.T, row_coef[:, None] * X)
 
+        hessian = a2 - a1
         return hessian, gradient, log_lik
 
     def predict_log_partial_hazard(self, X):
@@ -636,6 +697,9 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         if self.strata:
             print("{} = {}".format(justify("strata"), self.strata))
 
+        if self.robust:
+            print("{} = {}".format(justify("robust variance"), True))
+
         if self.penalizer > 0:
             print("{} = {}".format(justify("penalizer"), self.penalizer))
 
@@ -764,29 +828,19 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
 
         return ax
 
-    def _compute_cumulative_baseline_hazard(
-        self, tv_data, events, start, stop, weights
-    ):  # pylint: disable=too-many-locals
-        hazards = self.predict_partial_hazard(tv_data).values
+    def _compute_cumulative_baseline_hazard(self, tv_data, events, start, stop, weights):
+        hazards = self.predict_partial_hazard(tv_data).values[:, 0]
 
         unique_death_times = np.unique(stop[events.values])
-        baseline_hazard_ = pd.DataFrame(
-            np.zeros_like(unique_death_times), index=unique_death_times, columns=["baseline hazard"]
-        )
-
-        for t in unique_death_times:
-            ix = (start.values < t) & (t <= stop.values)
-
-            events_at_t = events.values[ix]
-            stops_at_t = stop.values[ix]
-            weights_at_t = weights.values[ix]
-            hazards_at_t = hazards[ix]
-
-            deaths = events_at_t & (stops_at_t == t)
+        n_death_times = unique_death_times.shape[0]
+        entries, exits = self._risk_set_entries_and_exits(start.values, stop.values, unique_death_times)
 
-            death_counts = (weights_at_t.squeeze() * deaths).sum()  # should always be atleast 1.
-            baseline_hazard_.loc[t] = death_counts / hazards_at_t.sum()
+        death_counts = np.bincount(exits[events.values] - 1, weights.values[events.values], n_death_times)
+        hazards_at_t = self._sum_over_risk_sets(hazards, entries, exits, n_death_times)
 
+        baseline_hazard_ = pd.DataFrame(
+            death_counts / hazards_at_t, index=unique_death_times, columns=["baseline hazard"]
+        )
         return baseline_hazard_.cumsum()
 
     def _compute_baseline_survival(self):
@@ -808,12 +862,78 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         return s
 
     def _compute_residuals(self, df, events, start, stop, weights):
-        raise NotImplementedError()
+        if self.strata is None:
+            return self._compute_residuals_within_strata(
+                df.values, events.values, start.values, stop.values, weights.values
+            )
+
+        return np.concatenate(
+            list(
+                self._partition_by_strata_and_apply(
+                    df, events, start, stop, weights, self._compute_residuals_within_strata
+                )
+            ),
+            axis=0,
+        )
+
+    def _compute_residuals_within_strata(self, X, events, start, stop, weights):  # pylint: disable=too-many-locals
+        """
+        Score residuals for counting process data. This is the same as CoxPHFitter's score residuals, except that the
+        sum over the hazard increments, dH(t) and dH(t) * xbar(t), is over the death times in (start, stop] instead of
+        all death times before the subject's duration. Using the sweep through time (see _efron_risk_sets), this is
+        a difference of two cumulative sums, so it costs about as much as a single gradient evaluation.
+
+        Returns the unweighted residuals, one row per subject-period row.
+        """
+        n, d = X.shape
+        events = events.astype(bool)
+
+        if not np.any(events):
+            return np.zeros((n, d))
+
+        # we already unnormalized the betas in `fit`, so we need normalize them again since X is
+        # normalized.
+        beta = self.hazards_.values * self._norm_std.values
+
+        phi_i = np.exp(np.dot(X, beta))
+        entries, exits, death_ix, tied_death_counts, increasing_proportion, denom, numer = self._efron_risk_sets(
+            X, events, start, stop, weights * phi_i
+        )
+        n_death_times = tied_death_counts.shape[0]
+        weighted_average = np.bincount(death_ix, weights[events], n_death_times) / tied_death_counts
+
+        x_bar = numer / denom[:, None]
+        hazard = weighted_average[death_ix] / denom
+        x_hazard = x_bar * hazard[:, None]
+
+        # increments per death time, as a "risk set" of [death_ix, death_ix + 1). Subjects that die at the
+        # death time use the down-weighted versions, so we also keep track of the corrections.
+        hazard_increment = self._sum_over_risk_sets(hazard, death_ix, death_ix + 1, n_death_times)
+        x_hazard_increment = self._sum_over_risk_sets(x_hazard, death_ix, death_ix + 1, n_death_times)
+        hazard_correction = self._sum_over_risk_sets(
+            increasing_proportion * hazard, death_ix, death_ix + 1, n_death_times
+        )
+        x_hazard_correction = self._sum_over_risk_sets(
+            increasing_proportion[:, None] * x_hazard, death_ix, death_ix + 1, n_death_times
+        )
+        x_bar_mean = self._sum_over_risk_sets(x_bar, death_ix, death_ix + 1, n_death_times) / tied_death_counts[:, None]
+
+        cumulative_hazard = np.append(0, hazard_increment.cumsum())
+        cumulative_x_hazard = np.vstack([np.zeros((1, d)), x_hazard_increment.cumsum(0)])
+
+        hazard_over_interval = cumulative_hazard[exits] - cumulative_hazard[entries]
+        x_hazard_over_interval = cumulative_x_hazard[exits] - cumulative_x_hazard[entries]
+        hazard_over_interval[events] -= hazard_correction[death_ix]
+        x_hazard_over_interval[events] -= x_hazard_correction[death_ix]
+
+        score_residuals = -phi_i[:, None] * (X * hazard_over_interval[:, None] - x_hazard_over_interval)
+        score_residuals[events] += X[events] - x_bar_mean[death_ix]
+        return score_residuals
 
     def _compute_delta_beta(self, df, events, start, stop, weights):
         """ approximate change in betas as a result of excluding ith row"""
 
-        score_residuals = self._compute_residuals(df, events, start, stop, weights) * weights[:, None]
+        score_residuals = self._compute_residuals(df, events, start, stop, weights) * weights.values[:, None]
 
         naive_var = inv(self._hessian_)
         delta_betas = -score_residuals.dot(naive_var) / self._norm_std.values
@@ -824,8 +944,8 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
 
         delta_betas = self._compute_delta_beta(X, events, start, stop, weights)
 
-        if self.cluster_col:
-            delta_betas = pd.DataFrame(delta_betas).groupby(self._clusters).sum().values
+        # a subject's rows are not independent, so we cluster on the subject.
+        delta_betas = pd.DataFrame(delta_betas).groupby(self._clusters).sum().values
 
         sandwich_estimator = delta_betas.T.dot(delta_betas)
         return sandwich_estimator
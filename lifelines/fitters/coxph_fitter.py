@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import copy
 import time
 from datetime import datetime
 import warnings
@@ -8,12 +9,13 @@ import pandas as pd
 
 from numpy.linalg import norm, inv
 from scipy.linalg import solve as spsolve, LinAlgError
-from scipy.integrate import trapz
 from scipy import stats
+from scipy import sparse
 from bottleneck import nansum as array_sum_to_scalar
 
 from lifelines.fitters import BaseFitter
 from lifelines.plotting import set_kwargs_ax, set_kwargs_drawstyle
+from lifelines.scorers import CoxPHScorer
 from lifelines.statistics import chisq_test, proportional_hazard_test, TimeTransformers, StatisticalResult
 from lifelines.utils.lowess import lowess
 from lifelines.utils.concordance import _concordance_summary_statistics, _concordance_ratio
@@ -35,6 +37,12 @@ from lifelines.utils import (
     StatisticalWarning,
     StepSizer,
     ConvergenceError,
+    _get_thread_pool,
+    _contiguous_strata,
+    _has_sparse_columns,
+    _sparse_mean_var,
+    _take_rows,
+    _to_sparse_matrix,
     string_justify,
     format_p_value,
     format_floats,
@@ -51,15 +59,11 @@ matrix_axis_0_sum_to_array = lambda m: np.sum(m, 0)
 class BatchVsSingle:
     @staticmethod
     def decide(batch_mode, T):
-        n_total = T.shape[0]
-        n_unique = T.unique().shape[0]
-        frac_dups = n_unique / n_total
-        if batch_mode or (
-            # https://github.com/CamDavidsonPilon/lifelines/issues/591 for original issue.
-            # new values from from perf/batch_vs_single script.
-            (batch_mode is None)
-            and (0.712085 + -0.000025 * n_total + 0.579359 * frac_dups + 0.000044 * n_total * frac_dups < 1)
-        ):
+        if batch_mode is None:
+            # the vectorized algorithm has no Python loop over unique durations, and is as fast or
+            # faster than both alternatives for all N and fraction of ties. See perf_tests/batch_vs_single.py.
+            return "vectorized"
+        elif batch_mode:
             return "batch"
         return "single"
 
@@ -77,9 +81,9 @@ class CoxPHFitter(BaseFitter):
       alpha: float, optional (default=0.05)
         the level in the confidence intervals.
 
-      tie_method: string, optional
-        specify how the fitter should deal with ties. Currently only
-        'Efron' is available.
+      tie_method: string, optional (default="Efron")
+        specify how the fitter should deal with ties, either 'Efron' or 'Breslow'. Breslow's
+        method is faster, but is a worse approximation when there are many ties.
 
       penalizer: float, optional (default=0.0)
         Attach an L2 penalizer to the size of the coefficients during regression. This improves
@@ -131,13 +135,14 @@ class CoxPHFitter(BaseFitter):
         super(CoxPHFitter, self).__init__(alpha=alpha)
         if penalizer < 0:
             raise ValueError("penalizer parameter must be >= 0.")
-        if tie_method != "Efron":
-            raise NotImplementedError("Only Efron is available at the moment.")
+        if tie_method not in ("Efron", "Breslow"):
+            raise NotImplementedError("Only Efron and Breslow are available at the moment.")
 
         self.alpha = alpha
         self.tie_method = tie_method
         self.penalizer = penalizer
         self.strata = strata
+        self._executor = None
 
     @CensoringType.right_censoring
     def fit(
@@ -153,6 +158,8 @@ class CoxPHFitter(BaseFitter):
         cluster_col=None,
         robust=False,
         batch_mode=None,
+        n_jobs=1,
+        compress=False,
     ):
         """
         Fit the Cox proportional hazard model to a dataset.
@@ -165,6 +172,8 @@ class CoxPHFitter(BaseFitter):
             `duration_col` refers to
             the lifetimes of the subjects. `event_col` refers to whether
             the 'death' events was observed: 1 if observed, 0 else (censored).
+            Covariates can be pandas sparse columns (ex: from ``pd.get_dummies(..., sparse=True)``), which are not
+            made dense during fitting.
 
         duration_col: string
             the name of the column in DataFrame that contains the subjects'
@@ -200,8 +209,8 @@ class CoxPHFitter(BaseFitter):
             set an initial step size for the fitting algorithm. Setting to 1.0 may improve performance, but could also hurt convergence.
 
         robust: boolean, optional (default=False)
-            Compute the robust errors using the Huber sandwich estimator, aka Wei-Lin estimate. This does not handle
-            ties, so if there are high number of ties, results may significantly differ. See
+            Compute the robust errors using the Huber sandwich estimator, aka Wei-Lin estimate. Ties are
+            handled using Efron's method. See
             "The Robust Inference for the Cox Proportional Hazards Model", Journal of the American Statistical Association, Vol. 84, No. 408 (Dec., 1989), pp. 1074- 1078
 
         cluster_col: string, optional
@@ -209,7 +218,18 @@ class CoxPHFitter(BaseFitter):
             be used.
 
         batch_mode: bool, optional
-            enabling batch_mode can be faster for datasets with a large number of ties. If left as None, lifelines will choose the best option.
+            enabling batch_mode can be faster for datasets with a large number of ties. If left as None, lifelines will choose the best option,
+            which is a fully vectorized algorithm. Set to True or False to force the batch or single (row-by-row) algorithm.
+
+        n_jobs: int, optional (default=1)
+            when using strata, the number of threads used to compute the strata in parallel. Use -1 to use all CPUs.
+            This is useful when there are many, large, strata.
+
+        compress: bool, optional (default=False)
+            merge identical rows into a single, weighted, row before fitting. This is much faster for datasets with
+            few unique rows, ex: categorical covariates and integer durations. With Efron's tie method, only censored
+            rows are merged, as merging tied deaths would change Efron's approximation. Cannot be used with ``robust``
+            or ``cluster_col``.
 
         Returns
         -------
@@ -219,7 +239,7 @@ class CoxPHFitter(BaseFitter):
 
         Note
         ----
-        Tied survival times are handled using Efron's tie-method.
+        Tied survival times are handled using the ``tie_method`` given in the constructor, Efron's by default.
 
 
         Examples
@@ -255,6 +275,42 @@ class CoxPHFitter(BaseFitter):
         >>> cph.print_summary()
         >>> cph.predict_median(df)
 
+        """
+        self._fit(
+            df,
+            duration_col,
+            event_col=event_col,
+            show_progress=show_progress,
+            initial_point=initial_point,
+            strata=strata,
+            step_size=step_size,
+            weights_col=weights_col,
+            cluster_col=cluster_col,
+            robust=robust,
+            batch_mode=batch_mode,
+            n_jobs=n_jobs,
+            compress=compress,
+        )
+        return self
+
+    def _fit(
+        self,
+        df,
+        duration_col,
+        event_col=None,
+        show_progress=False,
+        initial_point=None,
+        strata=None,
+        step_size=None,
+        weights_col=None,
+        cluster_col=None,
+        robust=False,
+        batch_mode=None,
+        n_jobs=1,
+        compress=False,
+    ):
+        """
+        See ``fit``. Returns the preprocessed, sorted, X, the normalized X, T, E and weights, ex: for ``bootstrap``.
         """
         if duration_col is None:
             raise TypeError("duration_col cannot be None.")
@@ -280,18 +336,45 @@ class CoxPHFitter(BaseFitter):
             self.event_observed.index = original_index
             self.weights.index = original_index
 
-        self._norm_mean = X.mean(0)
-        self._norm_std = X.std(0)
-        X_norm = normalize(X, self._norm_mean, self._norm_std)
-
-        hazards_ = self._fit_model(
-            X_norm, T, E, weights=weights, initial_point=initial_point, show_progress=show_progress, step_size=step_size
-        )
+        if _has_sparse_columns(X):
+            mean, var = _sparse_mean_var(_to_sparse_matrix(X))
+            self._norm_mean = pd.Series(mean, index=X.columns)
+            self._norm_std = pd.Series(np.sqrt(var), index=X.columns)
+            # subtracting the mean would make the sparse columns dense. The partial likelihood doesn't change if the
+            # covariates are shifted, so they are only scaled.
+            X_norm = X / self._norm_std
+        else:
+            self._norm_mean = X.mean(0)
+            self._norm_std = X.std(0)
+            X_norm = normalize(X, self._norm_mean, self._norm_std)
+
+        if compress:
+            if self.robust or self.cluster_col:
+                raise ValueError("compress=True cannot be used with robust=True or cluster_col.")
+            X_fit, T_fit, E_fit, weights_fit = self._compress(X_norm, T, E, weights)
+        else:
+            X_fit, T_fit, E_fit, weights_fit = X_norm, T, E, weights
+
+        self._executor = _get_thread_pool(n_jobs) if self.strata is not None else None
+        try:
+            hazards_ = self._fit_model(
+                X_fit,
+                T_fit,
+                E_fit,
+                weights=weights_fit,
+                initial_point=initial_point,
+                show_progress=show_progress,
+                step_size=step_size,
+            )
 
-        self.hazards_ = pd.Series(hazards_, index=X.columns, name="coef") / self._norm_std
+            self.hazards_ = pd.Series(hazards_, index=X.columns, name="coef") / self._norm_std
 
-        self.variance_matrix_ = -inv(self._hessian_) / np.outer(self._norm_std, self._norm_std)
-        self.standard_errors_ = self._compute_standard_errors(X_norm, T, E, weights)
+            self.variance_matrix_ = -inv(self._hessian_) / np.outer(self._norm_std, self._norm_std)
+            self.standard_errors_ = self._compute_standard_errors(X_norm, T, E, weights)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
         self.confidence_intervals_ = self._compute_confidence_intervals()
 
         self._predicted_partial_hazards_ = (
@@ -308,20 +391,521 @@ class CoxPHFitter(BaseFitter):
             # we have already fit the model.
             del self._concordance_score_
 
+        return X, X_norm, T, E, weights
+
+    def fit_path(
+        self,
+        df,
+        duration_col,
+        event_col=None,
+        penalizers=None,
+        show_progress=False,
+        strata=None,
+        step_size=None,
+        weights_col=None,
+        batch_mode=None,
+        n_jobs=1,
+    ):
+        """
+        Fit the Cox proportional hazard model for a grid of penalizers, ex: to choose a value for ``penalizer``.
+        The DataFrame is only preprocessed once, and each fit starts from the coefficients of the previous fit.
+        This is much faster than calling ``fit`` for each penalizer.
+
+        Parameters
+        ----------
+        df: DataFrame
+            a Pandas DataFrame, see ``fit``.
+        duration_col: string
+            the name of the column in DataFrame that contains the subjects' lifetimes.
+        event_col: string, optional
+            the  name of thecolumn in DataFrame that contains the subjects' death
+            observation. If left as None, assume all individuals are uncensored.
+        penalizers: iterable of floats
+            the values of ``penalizer`` to fit, in the order given. Warm starts work best if the
+            penalizers are in decreasing order.
+        show_progress: boolean, optional (default=False)
+            since the fitter is iterative, show convergence diagnostics.
+        strata: list or string, optional
+            specify a column or list of columns n to use in stratification. See ``fit``.
+        step_size: float, optional
+            set an initial step size for the fitting algorithm.
+        weights_col: string, optional
+            an optional column in the DataFrame, df, that denotes the weight per subject. See ``fit``.
+        batch_mode: bool, optional
+            see ``fit``.
+        n_jobs: int, optional (default=1)
+            when using strata, the number of threads used to compute the strata in parallel. Use -1 to use all CPUs.
+
+        Returns
+        -------
+        path: DataFrame
+            indexed by the penalizers, with the coefficients of each fit, plus columns ``log-likelihood``, the
+            partial log-likelihood of the fit, and ``iterations``, the number of Newton-Rhaphson iterations it needed.
+
+
+        Note
+        ----
+        This only computes the coefficients; the fitter's own ``penalizer`` and fitted model, if any, are unchanged.
+        Call ``fit`` with the chosen penalizer to get the full model.
+
+        Examples
+        --------
+        >>> from lifelines import CoxPHFitter
+        >>> from lifelines.datasets import load_rossi
+        >>>
+        >>> cph = CoxPHFitter()
+        >>> path = cph.fit_path(load_rossi(), 'week', 'arrest', penalizers=np.logspace(2, -3, 50))
+        >>> path.drop(["log-likelihood", "iterations"], axis=1).plot(logx=True)
+
+        """
+        if penalizers is None:
+            raise ValueError("penalizers must contain at least one value.")
+        penalizers = np.atleast_1d(np.asarray(penalizers, dtype=float))
+        if penalizers.shape[0] == 0:
+            raise ValueError("penalizers must contain at least one value.")
+        if (penalizers < 0).any():
+            raise ValueError("penalizers must be >= 0.")
+
+        fitter = self.__class__(alpha=self.alpha, tie_method=self.tie_method, strata=coalesce(strata, self.strata))
+        fitter.duration_col = duration_col
+        fitter.event_col = event_col
+        fitter.weights_col = weights_col
+        fitter.cluster_col = None
+        fitter._n_examples = df.shape[0]
+        fitter._batch_mode = batch_mode
+
+        X, T, E, weights, _, _ = fitter._preprocess_dataframe(df)
+        norm_std = X.std(0)
+        X_norm = normalize(X, X.mean(0), norm_std)
+
+        coefs = np.empty((penalizers.shape[0], X.shape[1]))
+        log_likelihoods = np.empty(penalizers.shape[0])
+        iterations = np.empty(penalizers.shape[0], dtype=int)
+
+        beta = None
+        fitter._executor = _get_thread_pool(n_jobs) if fitter.strata is not None else None
+        try:
+            for i, penalizer in enumerate(penalizers):
+                fitter.penalizer = penalizer
+                # _fit_model updates the initial point inplace, so it's copied.
+                beta = fitter._fit_model(
+                    X_norm,
+                    T,
+                    E,
+                    weights=weights,
+                    initial_point=None if beta is None else beta.copy(),
+                    show_progress=show_progress,
+                    step_size=step_size,
+                )
+                coefs[i] = beta
+                log_likelihoods[i] = fitter._log_likelihood
+                iterations[i] = len(fitter.path)
+        finally:
+            if fitter._executor is not None:
+                fitter._executor.shutdown()
+                fitter._executor = None
+
+        path = pd.DataFrame(coefs / norm_std.values, index=pd.Index(penalizers, name="penalizer"), columns=X.columns)
+        path["log-likelihood"] = log_likelihoods
+        path["iterations"] = iterations
+        return path
+
+    @CensoringType.right_censoring
+    def fit_chunks(
+        self,
+        chunks,
+        duration_col,
+        event_col=None,
+        weights_col=None,
+        show_progress=False,
+        initial_point=None,
+        step_size=None,
+    ):
+        """
+        Fit the Cox proportional hazard model to a dataset that is too large for memory, by streaming it in chunks.
+        Each iteration of the fitting algorithm makes a single pass over the chunks, and only keeps running sums of the
+        risk set between chunks, so the peak memory is bounded by the size of a chunk.
+
+        Parameters
+        ----------
+        chunks: callable
+            a function, with no arguments, that returns an iterable of DataFrames. Every call must return the same
+            chunks, and the rows must be sorted by descending duration across all the chunks. For example,
+            ``lambda: pd.read_csv("sorted_events.csv", chunksize=10**6)``. The chunks are read once to normalize
+            the covariates, once per iteration, and once to compute the baseline hazard.
+        duration_col: string
+            the name of the column in the DataFrames that contains the subjects' lifetimes.
+        event_col: string, optional
+            the  name of thecolumn in the DataFrames that contains the subjects' death
+            observation. If left as None, assume all individuals are uncensored.
+        weights_col: string, optional
+            an optional column in the DataFrames that denotes the weight per subject. See ``fit``.
+        show_progress: boolean, optional (default=False)
+            since the fitter is iterative, show convergence diagnostics.
+        initial_point: (d,) numpy array, optional
+            initialize the starting point of the iterative
+            algorithm. Default is the zero vector.
+        step_size: float, optional
+            set an initial step size for the fitting algorithm.
+
+        Returns
+        -------
+        self: CoxPHFitter
+            self with additional new properties: ``print_summary``, ``hazards_``, ``confidence_intervals_``, ``baseline_survival_``, etc.
+
+
+        Note
+        ----
+        Strata and robust errors are not supported. Properties that need the entire dataset, like ``score_``,
+        ``durations`` and ``compute_residuals``, are not available after ``fit_chunks``.
+
+        Examples
+        --------
+        >>> from lifelines import CoxPHFitter
+        >>>
+        >>> cph = CoxPHFitter()
+        >>> cph.fit_chunks(lambda: pd.read_csv("events_sorted_by_descending_T.csv", chunksize=10**6), 'T', 'E')
+        >>> cph.print_summary()
+
+        """
+        if not callable(chunks):
+            raise TypeError(
+                "chunks must be a function that returns an iterable of DataFrames, as the data is read many times."
+            )
+        if self.strata is not None:
+            raise ValueError("fit_chunks does not support strata.")
+
+        self._time_fit_was_called = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S") + " UTC"
+        self.duration_col = duration_col
+        self.event_col = event_col
+        self.weights_col = weights_col
+        self.robust = False
+        self.cluster_col = None
+        self._batch_mode = None
+
+        # remove any state from a previous, in-memory, fit.
+        for attribute in (
+            "durations",
+            "event_observed",
+            "weights",
+            "_predicted_partial_hazards_",
+            "_concordance_score_",
+            "_log_likelihood_null",
+        ):
+            if hasattr(self, attribute):
+                delattr(self, attribute)
+
+        columns = self._covariates_of_chunks(chunks)
+        d = len(columns)
+
+        # Chan et al.'s algorithm to combine the means and variances of the chunks.
+        n, n_events, mean, m2 = 0, 0, np.zeros(d), np.zeros(d)
+        for X, _, E, _ in self._iterate_chunks(chunks, columns):
+            n_chunk = X.shape[0]
+            mean_chunk = X.mean(0)
+            delta = mean_chunk - mean
+            m2 = m2 + ((X - mean_chunk) ** 2).sum(0) + delta ** 2 * n * n_chunk / (n + n_chunk)
+            mean = mean + delta * n_chunk / (n + n_chunk)
+            n += n_chunk
+            n_events += E.sum()
+
+        if n == 0:
+            raise ValueError("chunks contains no rows.")
+
+        self._n_examples = n
+        self._n_events = n_events
+        self._norm_mean = pd.Series(mean, index=columns)
+        self._norm_std = pd.Series(np.sqrt(m2 / (n - 1)), index=columns)
+
+        def get_values(beta):
+            hessian, gradient, log_lik = np.zeros((d, d)), np.zeros(d), 0
+            risk_phi, risk_phi_x, risk_phi_x_x = 0.0, np.zeros(d), np.zeros((d, d))
+
+            for X, T, E, weights in self._iterate_chunks(chunks, columns):
+                X = (X - mean) / self._norm_std.values
+                h, g, ll = self._get_efron_values_vectorized(
+                    X, T, E, weights, beta, risk_offsets=(risk_phi, risk_phi_x, risk_phi_x_x)
+                )
+                hessian += h
+                gradient += g
+                log_lik += ll
+
+                # these subjects are in the risk set of all the durations in the following chunks.
+                scores = weights * np.exp(np.dot(X, beta))
+                risk_phi = risk_phi + scores.sum()
+                risk_phi_x = risk_phi_x + np.dot(scores, X)
+                risk_phi_x_x = risk_phi_x_x + np.dot(X.T, scores[:, None] * X)
+
+            return hessian, gradient, log_lik
+
+        beta = self._newton_rhaphson(
+            get_values, d, initial_point=initial_point, step_size=step_size, show_progress=show_progress
+        )
+        if not hasattr(self, "_log_likelihood_null"):
+            # the fit started from a non-trivial initial point.
+            self._log_likelihood_null = get_values(np.zeros(d))[2]
+
+        self.hazards_ = pd.Series(beta, index=columns, name="coef") / self._norm_std
+        self.variance_matrix_ = -inv(self._hessian_) / np.outer(self._norm_std, self._norm_std)
+        self.standard_errors_ = self._compute_standard_errors(None, None, None, None)
+        self.confidence_intervals_ = self._compute_confidence_intervals()
+
+        self.baseline_hazard_ = self._compute_baseline_hazard_of_chunks(chunks, columns, beta)
+        self.baseline_cumulative_hazard_ = self._compute_baseline_cumulative_hazard()
+        self.baseline_survival_ = self._compute_baseline_survival()
         return self
 
+    def _covariates_of_chunks(self, chunks):
+        for chunk in chunks():
+            return pd.Index(
+                [c for c in chunk.columns if c not in (self.duration_col, self.event_col, self.weights_col)]
+            )
+        raise ValueError("chunks contains no rows.")
+
+    def _iterate_chunks(self, chunks, columns):
+        """
+        Yields (X, T, E, weights) numpy arrays, sorted ascending on T, from chunks sorted by descending durations.
+        The rows with the smallest duration in a chunk are held back for the next chunk, so tied durations are
+        never split between two blocks.
+        """
+        held_back = None
+        previous_duration = np.inf
+
+        for chunk in chunks():
+            if chunk.shape[0] == 0:
+                continue
+
+            T = chunk[self.duration_col].values.astype(float)
+            if self.event_col is not None:
+                check_nans_or_infs(chunk[self.event_col])
+                E = chunk[self.event_col].values.astype(bool)
+            else:
+                E = np.ones(T.shape[0], dtype=bool)
+            W = chunk[self.weights_col].values.astype(float) if self.weights_col is not None else np.ones(T.shape[0])
+            X = chunk[columns].values.astype(float)
+
+            check_nans_or_infs(T)
+            check_nans_or_infs(X)
+            if T[0] > previous_duration or (np.diff(T) > 0).any():
+                raise ValueError("The rows in chunks must be sorted by descending %s." % self.duration_col)
+            if (W <= 0).any():
+                raise ValueError("values in weight column %s must be positive." % self.weights_col)
+            previous_duration = T[-1]
+
+            arrays = (X, T, E, W)
+            if held_back is not None:
+                arrays = tuple(np.concatenate([h, a]) for h, a in zip(held_back, arrays))
+
+            # the first row with the same duration as the last row.
+            T = arrays[1]
+            cut = np.searchsorted(-T, -T[-1], side="left")
+            held_back = tuple(a[cut:] for a in arrays)
+            if cut > 0:
+                yield tuple(a[:cut][::-1] for a in arrays)
+
+        if held_back is not None:
+            yield tuple(a[::-1] for a in held_back)
+
+    def _compute_baseline_hazard_of_chunks(self, chunks, columns, beta):
+        # the same as _compute_baseline_hazard, but streams through the chunks.
+        durations, hazards = [], []
+        risk_phi = 0.0
+
+        for X, T, E, weights in self._iterate_chunks(chunks, columns):
+            scores = weights * np.exp(np.dot((X - self._norm_mean.values) / self._norm_std.values, beta))
+            unique_durations, ix = np.unique(T, return_inverse=True)
+
+            deaths = np.bincount(ix, weights=weights * E)
+            risk = np.bincount(ix, weights=scores)[::-1].cumsum()[::-1] + risk_phi
+            risk_phi += scores.sum()
+
+            durations.append(unique_durations)
+            hazards.append(deaths / risk)
+
+        # chunks are in descending order of durations.
+        return pd.DataFrame(
+            {"baseline hazard": np.concatenate(hazards[::-1])},
+            index=pd.Index(np.concatenate(durations[::-1]), name="T"),
+        )
+
+    def bootstrap(
+        self,
+        df,
+        duration_col,
+        event_col=None,
+        statistic=None,
+        n_replicates=200,
+        method="poisson",
+        strata=None,
+        weights_col=None,
+        step_size=None,
+        n_jobs=1,
+        seed=None,
+    ):
+        """
+        Bootstrap any statistic of the fitted model, ex: a median survival time, the hazard ratio at some
+        covariates, or the concordance. Rather than resampling the DataFrame and calling ``fit`` for each
+        replicate, each replicate gives the rows random integer weights, which multiply the weights in
+        ``weights_col``. The DataFrame is only sorted and checked once, and each replicate starts from the
+        coefficients of the fit to the full data, so it converges in a few iterations.
+
+        Parameters
+        ----------
+        df: DataFrame
+            a Pandas DataFrame, see ``fit``.
+        duration_col: string
+            the name of the column in DataFrame that contains the subjects' lifetimes.
+        event_col: string, optional
+            the  name of thecolumn in DataFrame that contains the subjects' death
+            observation. If left as None, assume all individuals are uncensored.
+        statistic: function
+            a function that takes a fitted ``CoxPHFitter`` and returns a float, a Series or a dict,
+            ex: ``lambda cph: cph.hazards_``.
+        n_replicates: int, optional (default=200)
+            the number of bootstrap replicates.
+        method: string, optional (default="poisson")
+            the random weights of the rows. ``"poisson"`` draws independent Poisson(1) weights, and
+            ``"multinomial"`` draws the number of times each row is in a resample of the same size, like
+            the classic bootstrap.
+        strata: list or string, optional
+            specify a column or list of columns n to use in stratification. See ``fit``.
+        weights_col: string, optional
+            an optional column in the DataFrame, df, that denotes the weight per subject. See ``fit``.
+        step_size: float, optional
+            set an initial step size for the fitting algorithm.
+        n_jobs: int, optional (default=1)
+            the number of threads used to fit the replicates in parallel. Use -1 to use all CPUs.
+        seed: int, optional
+            the seed of the random weights.
+
+        Returns
+        -------
+        replicates: DataFrame
+            one row per replicate, with a column per value of the statistic, or a single ``statistic`` column
+            if the statistic is a float.
+
+
+        Note
+        ----
+        Rows with a weight of 0 are left out of a replicate. The models given to ``statistic`` only have
+        the coefficients, variance matrix and baseline hazards of the replicate; the concordance (``score_``)
+        is computed from the rows in the replicate, ignoring their weights.
+        The fitter's own fitted model, if any, is unchanged.
+
+        Examples
+        --------
+        >>> from lifelines import CoxPHFitter
+        >>> from lifelines.datasets import load_rossi
+        >>>
+        >>> rossi = load_rossi()
+        >>> subject = rossi.drop(["week", "arrest"], axis=1).iloc[[0]]
+        >>> replicates = CoxPHFitter().bootstrap(
+        >>>     rossi, 'week', 'arrest', statistic=lambda cph: cph.predict_median(subject).squeeze(), n_jobs=-1
+        >>> )
+        >>> replicates["statistic"].quantile([0.025, 0.975])
+
+        """
+        if statistic is None:
+            raise ValueError("statistic must be a function of a fitted CoxPHFitter.")
+        if method not in ("poisson", "multinomial"):
+            raise ValueError("method must be 'poisson' or 'multinomial'.")
+
+        fitter = self.__class__(
+            alpha=self.alpha, tie_method=self.tie_method, penalizer=self.penalizer, strata=coalesce(strata, self.strata)
+        )
+        # the data is only preprocessed, and sorted, once.
+        X, X_norm, T, E, weights = fitter._fit(
+            df, duration_col, event_col, weights_col=weights_col, step_size=step_size, show_progress=False
+        )
+        beta = (fitter.hazards_ * fitter._norm_std).values
+
+        # each replicate draws its own counts, from its own seed, so memory doesn't grow with n_replicates, and the
+        # replicates are the same for any n_jobs.
+        seeds = np.random.RandomState(seed).randint(np.iinfo(np.int32).max, size=n_replicates)
+        n = X.shape[0]
+
+        def fit_replicate(replicate_seed):
+            random_state = np.random.RandomState(replicate_seed)
+            if method == "poisson":
+                replicate_counts = random_state.poisson(1.0, size=n)
+            else:
+                replicate_counts = random_state.multinomial(n, np.ones(n) / n)
+
+            # the rows are still sorted after dropping the rows that aren't in the replicate.
+            in_replicate = replicate_counts > 0
+            replicate = fitter._fit_replicate(
+                X[in_replicate],
+                X_norm[in_replicate],
+                T[in_replicate],
+                E[in_replicate],
+                weights[in_replicate] * replicate_counts[in_replicate],
+                initial_point=beta.copy(),
+                step_size=step_size,
+            )
+            return statistic(replicate)
+
+        executor = _get_thread_pool(n_jobs)
+        try:
+            if executor is None:
+                results = [fit_replicate(replicate_seed) for replicate_seed in seeds]
+            else:
+                results = list(executor.map(fit_replicate, seeds))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if all(np.isscalar(result) for result in results):
+            replicates = pd.DataFrame({"statistic": results})
+        else:
+            replicates = pd.DataFrame([pd.Series(result) for result in results]).reset_index(drop=True)
+        replicates.index.name = "replicate"
+        return replicates
+
+    def _fit_replicate(self, X, X_norm, T, E, weights, initial_point=None, step_size=None):
+        """
+        Returns a copy of this fitted model, refit to the (sorted) rows given. The copy has its own coefficients,
+        variance matrix and baseline hazards, so many replicates can be fit at the same time.
+        """
+        replicate = copy.copy(self)
+        replicate._executor = None
+        replicate.__dict__.pop("_concordance_score_", None)
+
+        beta = replicate._fit_model(
+            X_norm, T, E, weights=weights, initial_point=initial_point, step_size=step_size, show_progress=False
+        )
+        replicate.hazards_ = pd.Series(beta, index=X.columns, name="coef") / self._norm_std
+        replicate.variance_matrix_ = -inv(replicate._hessian_) / np.outer(self._norm_std, self._norm_std)
+        replicate.standard_errors_ = replicate._compute_standard_errors(X_norm, T, E, weights)
+        replicate.confidence_intervals_ = replicate._compute_confidence_intervals()
+
+        replicate.durations = pd.Series(T.values, name=T.name)
+        replicate.event_observed = pd.Series(E.values, name=E.name)
+        replicate.weights = pd.Series(weights.values, name=weights.name)
+        replicate._predicted_partial_hazards_ = (
+            replicate.predict_partial_hazard(X)
+            .rename(columns={0: "P"})
+            .assign(T=T.values, E=E.values, W=weights.values)
+            .set_index(X.index)
+        )
+        replicate.baseline_hazard_ = replicate._compute_baseline_hazards()
+        replicate.baseline_cumulative_hazard_ = replicate._compute_baseline_cumulative_hazard()
+        replicate.baseline_survival_ = replicate._compute_baseline_survival()
+        return replicate
+
     def _preprocess_dataframe(self, df):
         # this should be a pure function
 
         df = df.copy()
 
+        sort_by = _to_list(self.strata) + [self.duration_col] if self.strata is not None else self.duration_col
+        if _has_sparse_columns(df):
+            df = _take_rows(df, df[_to_list(sort_by)].reset_index(drop=True).sort_values(by=sort_by).index.values)
+        else:
+            df = df.sort_values(by=sort_by)
+        original_index = df.index.copy()
+
         if self.strata is not None:
-            df = df.sort_values(by=_to_list(self.strata) + [self.duration_col])
-            original_index = df.index.copy()
             df = df.set_index(self.strata)
-        else:
-            df = df.sort_values(by=self.duration_col)
-            original_index = df.index.copy()
 
         # Extract time and event
         T = df.pop(self.duration_col)
@@ -349,6 +933,33 @@ class CoxPHFitter(BaseFitter):
 
         return X, T, E, W, original_index, _clusters
 
+    def _compress(self, X, T, E, weights):
+        """
+        Merges identical rows (within a stratum) into a single row, with the sum of their weights. The log-likelihood,
+        and hence the coefficients and Hessian, are unchanged, and the data remains sorted by strata and T.
+        """
+        df = X.copy()
+        df["__T"] = T.values
+        df["__E"] = E.values
+        if self.tie_method == "Efron":
+            # Efron's approximation depends on the number of tied deaths, so deaths are never merged.
+            df["__death"] = np.where(E.values, np.arange(E.shape[0]), -1)
+
+        if self.strata is not None:
+            df = df.reset_index()
+
+        # sort=False keeps the groups in order of their first row, so the data is still sorted.
+        compressed = df.assign(__weights=weights.values).groupby(list(df.columns), sort=False)["__weights"].sum()
+        compressed = compressed.reset_index()
+
+        if self.strata is not None:
+            compressed = compressed.set_index(_to_list(self.strata))
+
+        T = pd.Series(compressed["__T"].values, index=compressed.index, name=T.name)
+        E = pd.Series(compressed["__E"].values, index=compressed.index, name=E.name)
+        weights = pd.Series(compressed["__weights"].values, index=compressed.index, name=weights.name)
+        return compressed[X.columns], T, E, weights
+
     def _check_values(self, X, T, E, W):
         check_for_numeric_dtypes_or_raise(X)
         check_nans_or_infs(T)
@@ -379,7 +990,7 @@ estimate the variances. See paper "Variance estimation when using inverse probab
         precision=1e-07,
         show_progress=True,
         max_steps=50,
-    ):  # pylint: disable=too-many-statements,too-many-branches
+    ):
         """
         Newton Rhaphson algorithm for fitting CPH model.
 
@@ -410,9 +1021,62 @@ estimate the variances. See paper "Variance estimation when using inverse probab
         -------
         beta: (1,d) numpy array.
         """
+        _, d = X.shape
+
+        # the engines handle both Efron and Breslow ties, see self.tie_method.
+        if self.tie_method not in ("Efron", "Breslow"):
+            raise NotImplementedError("Only Efron and Breslow are available.")
+
+        if _has_sparse_columns(X):
+            get_gradients = self._get_efron_values_sparse
+            X_values = _to_sparse_matrix(X)
+        else:
+            decision = BatchVsSingle.decide(self._batch_mode, T)
+            get_gradients = getattr(self, "_get_efron_values_%s" % decision)
+            self._batch_mode = decision == "batch"
+            X_values = X.values
+
+        if self.strata is None:
+
+            def get_values(beta):
+                return get_gradients(X_values, T.values, E.values, weights.values, beta)
+
+        else:
+            # the strata don't change between iterations, so only partition the data once.
+            partitions = [
+                (X_values[start:stop], T.values[start:stop], E.values[start:stop], weights.values[start:stop])
+                for _, start, stop in _contiguous_strata(X.index)
+            ]
+
+            def get_values(beta):
+                g = np.zeros_like(beta)
+                h = np.zeros((beta.shape[0], beta.shape[0]))
+                ll = 0
+                for _h, _g, _ll in self._apply_to_partitions(partitions, get_gradients, beta):
+                    g += _g
+                    h += _h
+                    ll += _ll
+                return h, g, ll
+
+        return self._newton_rhaphson(
+            get_values,
+            d,
+            initial_point=initial_point,
+            step_size=step_size,
+            precision=precision,
+            show_progress=show_progress,
+            max_steps=max_steps,
+        )
+
+    def _newton_rhaphson(
+        self, get_values, d, initial_point=None, step_size=None, precision=1e-07, show_progress=True, max_steps=50
+    ):  # pylint: disable=too-many-statements,too-many-branches
+        """
+        The Newton Rhaphson iterations, given a function ``get_values(beta)`` that returns the Hessian,
+        gradient and log-likelihood at ``beta``. See _fit_model for the parameters.
+        """
         self.path = []
         assert precision <= 1.0, "precision must be less than or equal to 1."
-        _, d = X.shape
 
         # make sure betas are correct size.
         if initial_point is not None:
@@ -424,14 +1088,6 @@ estimate the variances. See paper "Variance estimation when using inverse probab
         step_sizer = StepSizer(step_size)
         step_size = step_sizer.next()
 
-        # Method of choice is just efron right now
-        if self.tie_method == "Efron":
-            decision = BatchVsSingle.decide(self._batch_mode, T)
-            get_gradients = getattr(self, "_get_efron_values_%s" % decision)
-            self._batch_mode = decision == "batch"
-        else:
-            raise NotImplementedError("Only Efron is available.")
-
         i = 0
         converging = True
         ll, previous_ll = 0, 0
@@ -442,18 +1098,7 @@ estimate the variances. See paper "Variance estimation when using inverse probab
 
             i += 1
 
-            if self.strata is None:
-
-                h, g, ll = get_gradients(X.values, T.values, E.values, weights.values, beta)
-
-            else:
-                g = np.zeros_like(beta)
-                h = np.zeros((beta.shape[0], beta.shape[0]))
-                ll = 0
-                for _h, _g, _ll in self._partition_by_strata_and_apply(X, T, E, weights, get_gradients, beta):
-                    g += _g
-                    h += _h
-                    ll += _ll
+            h, g, ll = get_values(beta)
 
             if i == 1 and np.all(beta == 0):
                 # this is a neat optimization, the null partial likelihood
@@ -575,6 +1220,8 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         the Efron approximation for ties (default) is employed replication of the data will not give exactly the same coefficients as the
         weights option, and in this case the weighted fit is arguably the correct one."
 
+        If ``tie_method`` is "Breslow", every tied death uses the full risk set, so there is no adjustment.
+
         Parameters
         ----------
         X: array
@@ -654,19 +1301,19 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
             #
             # This code is near identical to the _batch algorithm below. In fact, see _batch for comments.
             #
-            weighted_average = weight_count / tied_death_counts
-
-            if tied_death_counts > 1:
+            if self.tie_method == "Breslow" or tied_death_counts == 1:
+                weighted_average = weight_count
+                denom = 1.0 / np.array([risk_phi])
+                numer = risk_phi_x
+                a1 = risk_phi_x_x * denom
+            else:
+                weighted_average = weight_count / tied_death_counts
                 increasing_proportion = np.arange(tied_death_counts) / tied_death_counts
                 denom = 1.0 / (risk_phi - increasing_proportion * tie_phi)
                 numer = risk_phi_x - np.outer(increasing_proportion, tie_phi_x)
                 a1 = np.einsum("ab,i->ab", risk_phi_x_x, denom) - np.einsum(
                     "ab,i->ab", tie_phi_x_x, increasing_proportion * denom
                 )
-            else:
-                denom = 1.0 / np.array([risk_phi])
-                numer = risk_phi_x
-                a1 = risk_phi_x_x * denom
 
             summand = numer * denom[:, None]
             a2 = summand.T.dot(summand)
@@ -687,7 +1334,7 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         return hessian, gradient, log_lik
 
     @staticmethod
-    def _trivial_log_likelihood_batch(T, E, weights):
+    def _trivial_log_likelihood_batch(T, E, weights, tie_method="Efron"):
         # used for log-likelihood test
         n = T.shape[0]
         log_lik = 0
@@ -718,7 +1365,9 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
             weights_deaths = weights_at_t[deaths]
             weight_count = array_sum_to_scalar(weights_deaths)
 
-            if tied_death_counts > 1:
+            if tie_method == "Breslow":
+                factor = tied_death_counts * np.log(risk_phi)
+            elif tied_death_counts > 1:
                 tie_phi = array_sum_to_scalar(phi_i[deaths])
                 factor = np.log(risk_phi - np.arange(tied_death_counts) * tie_phi / tied_death_counts).sum()
             else:
@@ -730,7 +1379,7 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         return log_lik
 
     @staticmethod
-    def _trivial_log_likelihood_single(T, E, weights):
+    def _trivial_log_likelihood_single(T, E, weights, tie_method="Efron"):
         # assumes sorted on T!
 
         log_lik = 0
@@ -770,7 +1419,9 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
                 # Only censored with current time, move on
                 continue
 
-            if tied_death_counts > 1:
+            if tie_method == "Breslow":
+                factor = tied_death_counts * np.log(risk_phi)
+            elif tied_death_counts > 1:
                 factor = np.log(risk_phi - np.arange(tied_death_counts) * tie_phi / tied_death_counts).sum()
             else:
                 factor = np.log(risk_phi)
@@ -792,6 +1443,9 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         (φ1 + φ2 + φ3) is adjusted from sum_j^{5} φj after one fails. Similarly two-third
         of (φ1 + φ2 + φ3) is adjusted after first two individuals fail, etc.
 
+        If ``tie_method`` is "Breslow", there is no adjustment: all the tied deaths share the full risk set,
+        and contribute a single term.
+
         Returns
         -------
         hessian: (d, d) numpy array,
@@ -814,6 +1468,7 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         _, counts = np.unique(-T, return_counts=True)
         scores = weights * np.exp(np.dot(X, beta))
         pos = n
+        breslow = self.tie_method == "Breslow"
 
         for count_of_removals in counts:
 
@@ -846,9 +1501,16 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
             x_death_sum = matrix_axis_0_sum_to_array(weights_deaths[:, None] * xi_deaths)
 
             weight_count = array_sum_to_scalar(weights_deaths)
-            weighted_average = weight_count / tied_death_counts
 
-            if tied_death_counts > 1:
+            if breslow or tied_death_counts == 1:
+                # no tensors here, but do some casting to make it easier in the converging step next.
+                # With Breslow, the tied deaths all have the same risk set, so they are summed into one term.
+                weighted_average = weight_count
+                denom = 1.0 / np.array([risk_phi])
+                numer = risk_phi_x
+                a1 = risk_phi_x_x * denom
+            else:
+                weighted_average = weight_count / tied_death_counts
 
                 # a lot of this is now in Einstein notation for performance, but see original "expanded" code here
                 # https://github.com/CamDavidsonPilon/lifelines/blob/e7056e7817272eb5dff5983556954f56c33301b1/lifelines/fitters/coxph_fitter.py#L755-L789
@@ -872,11 +1534,6 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
                 a1 = np.einsum("ab,i->ab", risk_phi_x_x, denom) - np.einsum(
                     "ab,i->ab", tie_phi_x_x, increasing_proportion * denom
                 )
-            else:
-                # no tensors here, but do some casting to make it easier in the converging step next.
-                denom = 1.0 / np.array([risk_phi])
-                numer = risk_phi_x
-                a1 = risk_phi_x_x * denom
 
             summand = numer * denom[:, None]
             # This is a batch outer product.
@@ -891,17 +1548,256 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
 
         return hessian, gradient, log_lik
 
+    @staticmethod
+    def _efron_risk_sets(T, E, scores, X, tie_method="Efron"):
+        """
+        Assumes sorted ascending on T, and that there is at least one death.
+
+        Computes the Efron-adjusted risk set sums for every death, without a Python loop over the unique durations:
+
+        1) the risk set sums at each unique duration are reverse cumulative sums, read off at the first row of the tie group.
+        2) the tie set sums are ``np.add.reduceat`` over the (contiguous) deaths in each tie group.
+        3) Efron's correction expands each tie group into one row per death, so all tie groups are handled in one step:
+           the kth of m tied deaths has denominator risk_phi - k/m * tie_phi (and similarly for risk_phi_x).
+           With ``tie_method="Breslow"`` there is no correction, i.e. k/m is always 0.
+
+        Returns
+        -------
+        group_of_row: (n,) numpy array
+            the index of the tie group (unique duration) of each row.
+        tie_starts: (k,) numpy array
+            the position, among the deaths, of the first death in each tie group with deaths.
+        tied_death_counts: (k,) numpy array
+            the number of deaths in each tie group with deaths.
+        tie_ix: (n_deaths,) numpy array
+            the tie group (among tie groups with deaths) of each death.
+        increasing_proportion: (n_deaths,) numpy array
+            k/m for the kth of m tied deaths.
+        denom: (n_deaths,) numpy array
+            the Efron-adjusted risk_phi.
+        numer: (n_deaths, d) numpy array
+            the Efron-adjusted risk_phi_x.
+        """
+        n = T.shape[0]
+        n_deaths = E.sum()
+        phi_x = scores[:, None] * X
+
+        # map each row to its tie group. Groups are contiguous since T is sorted.
+        new_group = np.empty(n, dtype=bool)
+        new_group[0] = True
+        np.not_equal(T[1:], T[:-1], out=new_group[1:])
+        group_starts = np.flatnonzero(new_group)
+        group_of_row = np.cumsum(new_group) - 1
+
+        # risk set sums, evaluated at the first row of the tie group of each death
+        death_groups = group_of_row[E]
+        death_group_starts = group_starts[death_groups]
+        risk_phi = scores[::-1].cumsum()[::-1][death_group_starts]
+        risk_phi_x = phi_x[::-1].cumsum(0)[::-1][death_group_starts]
+
+        # deaths are contiguous within each tie group, so we can reduce over them.
+        is_first_death_in_group = np.empty(n_deaths, dtype=bool)
+        is_first_death_in_group[0] = True
+        np.not_equal(death_groups[1:], death_groups[:-1], out=is_first_death_in_group[1:])
+        tie_starts = np.flatnonzero(is_first_death_in_group)
+        tied_death_counts = np.diff(np.append(tie_starts, n_deaths))
+
+        # expand the tie groups so there is one row per death, indexed by tie_ix.
+        tie_ix = np.repeat(np.arange(tie_starts.shape[0]), tied_death_counts)
+
+        if tie_method == "Breslow":
+            increasing_proportion = np.zeros(n_deaths)
+            return group_of_row, tie_starts, tied_death_counts, tie_ix, increasing_proportion, risk_phi, risk_phi_x
+
+        tie_phi = np.add.reduceat(scores[E], tie_starts)
+        tie_phi_x = np.add.reduceat(phi_x[E], tie_starts, axis=0)
+        increasing_proportion = (np.arange(n_deaths) - tie_starts[tie_ix]) / tied_death_counts[tie_ix]
+
+        denom = risk_phi - increasing_proportion * tie_phi[tie_ix]
+        numer = risk_phi_x - increasing_proportion[:, None] * tie_phi_x[tie_ix]
+        return group_of_row, tie_starts, tied_death_counts, tie_ix, increasing_proportion, denom, numer
+
+    def _get_efron_values_vectorized(
+        self, X, T, E, weights, beta, risk_offsets=None
+    ):  # pylint: disable=too-many-locals
+        """
+        Assumes sorted ascending on T
+        Calculates the first and second order vector differentials, with respect to beta.
+
+        This computes the same quantities as _batch and _single, but without a Python loop over the unique durations.
+        See _efron_risk_sets for how the risk sets are computed. The risk_phi_x_x terms are never materialized per
+        duration: since sum_t c_t * risk_phi_x_x(t) is equal to sum_j phi_j * x_j x_j' * (sum_{t <= T_j} c_t),
+        the Hessian contribution is a single weighted X'X product.
+
+        ``risk_offsets`` is an optional tuple of (risk_phi, risk_phi_x, risk_phi_x_x) of subjects that are not in X,
+        but are in the risk set of every duration in X, i.e. they have larger durations. This is used by fit_chunks.
+
+        Returns
+        -------
+        hessian: (d, d) numpy array,
+        gradient: (1, d) numpy array
+        log_likelihood: float
+        """
+        _, d = X.shape
+        E = E.astype(bool)
+
+        if not np.any(E):
+            return np.zeros((d, d)), np.zeros((d,)), 0
+
+        scores = weights * np.exp(np.dot(X, beta))
+        group_of_row, tie_starts, tied_death_counts, tie_ix, increasing_proportion, denom, numer = self._efron_risk_sets(
+            T, E, scores, X, self.tie_method
+        )
+        if risk_offsets is not None:
+            risk_phi_offset, risk_phi_x_offset, risk_phi_x_x_offset = risk_offsets
+            denom = denom + risk_phi_offset
+            numer = numer + risk_phi_x_offset
+
+        weights_deaths = weights[E]
+        x_death_sum = matrix_axis_0_sum_to_array(weights_deaths[:, None] * X[E])
+
+        # coefficients of risk_phi_x_x and tie_phi_x_x per tie group, see docstring above.
+        risk_coef = np.zeros(group_of_row[-1] + 1)
+
+        if self.tie_method == "Breslow":
+            # the tied deaths all have the same risk set, so each tie group is a single term,
+            # weighted by the total weight of its deaths.
+            weighted_average = np.add.reduceat(weights_deaths, tie_starts)
+            denom = 1.0 / denom[tie_starts]
+            summand = numer[tie_starts] * denom[:, None]
+
+            risk_coef[group_of_row[E][tie_starts]] = weighted_average * denom
+            row_coef = scores * risk_coef.cumsum()[group_of_row]
+        else:
+            weighted_average = (np.add.reduceat(weights_deaths, tie_starts) / tied_death_counts)[tie_ix]
+            denom = 1.0 / denom
+            summand = numer * denom[:, None]
+
+            risk_coef[group_of_row[E][tie_starts]] = np.add.reduceat(weighted_average * denom, tie_starts)
+            tie_coef = np.add.reduceat(weighted_average * increasing_proportion * denom, tie_starts)
+            row_coef = scores * risk_coef.cumsum()[group_of_row]
+            row_coef[E] -= scores[E] * tie_coef[tie_ix]
+
+        gradient = x_death_sum - matrix_axis_0_sum_to_array(weighted_average[:, None] * summand)
+        log_lik = np.dot(x_death_sum, beta) + array_sum_to_scalar(weighted_average * np.log(denom))
+
+        a2 = summand.T.dot(weighted_average[:, None] * summand)
+        a1 = np.dot(X.T, row_coef[:, None] * X)
+        if risk_offsets is not None:
+            a1 += risk_coef.sum() * risk_phi_x_x_offset
+
+        hessian = a2 - a1
+        return hessian, gradient, log_lik
+
+    def _get_efron_values_sparse(self, X, T, E, weights, beta):  # pylint: disable=too-many-locals
+        """
+        Assumes sorted ascending on T, and that X is a scipy.sparse matrix.
+        Calculates the first and second order vector differentials, with respect to beta.
+
+        This computes the same quantities as _vectorized, but X is never made dense, and nothing of shape
+        (number of deaths, d) is created. Instead, everything is summed over each of the K unique death times:
+
+        1) the risk set sums, risk_phi_x, and the tie set sums, tie_phi_x, are dense (K, d) matrices, A and B.
+        2) the sums over Efron's k/m = p_k are scalars per death time, so ex: the a2 term of the Hessian is
+           sum_k (A - p_k B)(A - p_k B)' / den_k^2 = AA' sum_k 1/den_k^2 - (AB' + BA') sum_k p_k/den_k^2 + BB' sum_k p_k^2/den_k^2
+        3) the risk_phi_x_x terms are a single sparse X'X product, see _vectorized.
+
+        Returns
+        -------
+        hessian: (d, d) numpy array,
+        gradient: (1, d) numpy array
+        log_likelihood: float
+        """
+        n, d = X.shape
+        E = E.astype(bool)
+
+        if not np.any(E):
+            return np.zeros((d, d)), np.zeros((d,)), 0
+
+        X = sparse.csr_matrix(X)
+        scores = weights * np.exp(X.dot(beta))
+        phi_x = sparse.diags(scores).dot(X)
+
+        # row j is in the risk set of the first n_risk_sets[j] death times.
+        death_times, tied_death_counts = np.unique(T[E], return_counts=True)
+        K = death_times.shape[0]
+        n_risk_sets = np.searchsorted(death_times, T, side="right")
+
+        risk_phi = np.bincount(n_risk_sets, weights=scores, minlength=K + 1)[::-1].cumsum()[::-1][1:]
+        by_n_risk_sets = sparse.csr_matrix((np.ones(n), (n_risk_sets, np.arange(n))), shape=(K + 1, n))
+        risk_phi_x = by_n_risk_sets.dot(phi_x).toarray()[::-1].cumsum(0)[::-1][1:]
+
+        # deaths are sorted, so each death time is a contiguous block of deaths.
+        death_ix = n_risk_sets[E] - 1
+        n_deaths = death_ix.shape[0]
+        tie_starts = np.cumsum(tied_death_counts) - tied_death_counts
+        X_deaths = X[np.flatnonzero(E)]
+        weights_deaths = weights[E]
+
+        x_death_sum = X_deaths.T.dot(weights_deaths)
+        weighted_average = (np.bincount(death_ix, weights=weights_deaths) / tied_death_counts)[death_ix]
+
+        def sum_per_death_time(values):
+            return np.bincount(death_ix, weights=values, minlength=K)
+
+        if self.tie_method == "Breslow":
+            increasing_proportion = np.zeros(n_deaths)
+            tie_phi, tie_phi_x = np.zeros(K), np.zeros((K, d))
+        else:
+            increasing_proportion = (np.arange(n_deaths) - tie_starts[death_ix]) / tied_death_counts[death_ix]
+            tie_phi = sum_per_death_time(scores[E])
+            by_death_time = sparse.csr_matrix((np.ones(n_deaths), (death_ix, np.arange(n_deaths))), shape=(K, n_deaths))
+            tie_phi_x = by_death_time.dot(phi_x[np.flatnonzero(E)]).toarray()
+
+        denom = risk_phi[death_ix] - increasing_proportion * tie_phi[death_ix]
+        s0 = sum_per_death_time(weighted_average / denom)
+        s1 = sum_per_death_time(weighted_average * increasing_proportion / denom)
+        q0 = sum_per_death_time(weighted_average / denom ** 2)
+        q1 = sum_per_death_time(weighted_average * increasing_proportion / denom ** 2)
+        q2 = sum_per_death_time(weighted_average * increasing_proportion ** 2 / denom ** 2)
+
+        gradient = x_death_sum - (risk_phi_x.T.dot(s0) - tie_phi_x.T.dot(s1))
+        log_lik = np.dot(x_death_sum, beta) - array_sum_to_scalar(weighted_average * np.log(denom))
+
+        cross = risk_phi_x.T.dot(q1[:, None] * tie_phi_x)
+        a2 = (
+            risk_phi_x.T.dot(q0[:, None] * risk_phi_x)
+            - cross
+            - cross.T
+            + tie_phi_x.T.dot(q2[:, None] * tie_phi_x)
+        )
+
+        # subject j is in the risk sets of the first n_risk_sets[j] death times, so its coefficient is a cumulative sum.
+        row_coef = scores * np.append(0, s0.cumsum())[n_risk_sets]
+        a1 = X.T.dot(sparse.diags(row_coef).dot(X)).toarray()
+        a1 -= X_deaths.T.dot(sparse.diags(scores[E] * s1[death_ix]).dot(X_deaths)).toarray()
+
+        hessian = a2 - a1
+        return hessian, gradient, log_lik
+
     def _partition_by_strata(self, X, T, E, weights, as_dataframes=False):
-        for stratum, stratified_X in X.groupby(self.strata):
-            stratified_E, stratified_T, stratified_W = (E.loc[[stratum]], T.loc[[stratum]], weights.loc[[stratum]])
-            if not as_dataframes:
-                yield (stratified_X.values, stratified_T.values, stratified_E.values, stratified_W.values), stratum
-            else:
-                yield (stratified_X, stratified_T, stratified_E, stratified_W), stratum
+        # the data is sorted by strata in _preprocess_dataframe, so each stratum is a contiguous block of
+        # rows, and the partitions can be views rather than copies made by pandas indexing.
+        strata = _contiguous_strata(X.index)
+        if not as_dataframes:
+            X, T, E, weights = X.values, T.values, E.values, weights.values
+            for stratum, start, stop in strata:
+                yield (X[start:stop], T[start:stop], E[start:stop], weights[start:stop]), stratum
+        else:
+            for stratum, start, stop in strata:
+                yield (X.iloc[start:stop], T.iloc[start:stop], E.iloc[start:stop], weights.iloc[start:stop]), stratum
 
     def _partition_by_strata_and_apply(self, X, T, E, weights, function, *args):
-        for (stratified_X, stratified_T, stratified_E, stratified_W), _ in self._partition_by_strata(X, T, E, weights):
-            yield function(stratified_X, stratified_T, stratified_E, stratified_W, *args)
+        partitions = [partition for partition, _ in self._partition_by_strata(X, T, E, weights)]
+        return self._apply_to_partitions(partitions, function, *args)
+
+    def _apply_to_partitions(self, partitions, function, *args):
+        if self._executor is None:
+            for (stratified_X, stratified_T, stratified_E, stratified_W) in partitions:
+                yield function(stratified_X, stratified_T, stratified_E, stratified_W, *args)
+        else:
+            # threads share memory, so the partitions are not copied. Results are yielded in the order of the strata.
+            yield from self._executor.map(lambda partition: function(*(partition + args)), partitions)
 
     def _compute_martingale(self, X, T, E, _weights, index=None):
         # TODO: _weights unused
@@ -965,15 +1861,11 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         # Assumes sorted on T and on strata
         # cluster does nothing to this, as expected.
 
-        _, d = X.shape
-
         if self.strata is not None:
-            schoenfeld_residuals = np.empty((0, d))
-
-            for schoenfeld_residuals_in_strata in self._partition_by_strata_and_apply(
-                X, T, E, weights, self._compute_schoenfeld_within_strata
-            ):
-                schoenfeld_residuals = np.append(schoenfeld_residuals, schoenfeld_residuals_in_strata, axis=0)
+            schoenfeld_residuals = np.concatenate(
+                list(self._partition_by_strata_and_apply(X, T, E, weights, self._compute_schoenfeld_within_strata)),
+                axis=0,
+            )
 
         else:
             schoenfeld_residuals = self._compute_schoenfeld_within_strata(X.values, T.values, E.values, weights.values)
@@ -985,89 +1877,30 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
     def _compute_schoenfeld_within_strata(self, X, T, E, weights):
         """
         A positive value of the residual shows an X value that is higher than expected at that death time.
-        """
-        # TODO: the diff_against is gross
-        # This uses Efron ties.
 
+        With Efron ties, the expected X value at a death time is the average, over the k tied deaths, of the
+        Efron-adjusted weighted means (risk_phi_x - k/m * tie_phi_x) / (risk_phi - k/m * tie_phi). With Breslow
+        ties, it is the weighted mean over the risk set, risk_phi_x / risk_phi.
+        """
         n, d = X.shape
+        E = E.astype(bool)
+
+        schoenfeld_residuals = np.zeros((n, d))
 
         if not np.any(E):
             # sometimes strata have no deaths. This means nothing is returned
             # in the below code.
-            return np.zeros((n, d))
-
-        # Init risk and tie sums to zero
-        risk_phi, tie_phi = 0, 0
-        risk_phi_x, tie_phi_x = np.zeros((1, d)), np.zeros((1, d))
-
-        # Init number of ties and weights
-        weight_count = 0.0
-        tie_count = 0
-
-        scores = weights * np.exp(np.dot(X, self.hazards_))
-
-        diff_against = []
-
-        schoenfeld_residuals = np.empty((0, d))
-
-        # Iterate backwards to utilize recursive relationship
-        for i in range(n - 1, -1, -1):
-            # Doing it like this to preserve shape
-            ti = T[i]
-            ei = E[i]
-            xi = X[i : i + 1]
-            score = scores[i : i + 1]
-            w = weights[i]
-
-            # Calculate phi values
-            phi_i = score
-            phi_x_i = phi_i * xi
-
-            # Calculate sums of Risk set
-            risk_phi = risk_phi + phi_i
-            risk_phi_x = risk_phi_x + phi_x_i
+            return schoenfeld_residuals
 
-            # Calculate sums of Ties, if this is an event
-            diff_against.append((xi, ei))
-            if ei:
-
-                tie_phi = tie_phi + phi_i
-                tie_phi_x = tie_phi_x + phi_x_i
-
-                # Keep track of count
-                tie_count += 1  # aka death counts
-                weight_count += w
-
-            if i > 0 and T[i - 1] == ti:
-                # There are more ties/members of the risk set
-                continue
-            elif tie_count == 0:
-                for _ in diff_against:
-                    schoenfeld_residuals = np.append(schoenfeld_residuals, np.zeros((1, d)), axis=0)
-                diff_against = []
-                continue
-
-            # There was atleast one event and no more ties remain. Time to sum.
-            weighted_mean = np.zeros((1, d))
-
-            for l in range(tie_count):
-
-                numer = risk_phi_x - l * tie_phi_x / tie_count
-                denom = risk_phi - l * tie_phi / tie_count
-
-                weighted_mean += numer / (denom * tie_count)
-
-            for xi, ei in diff_against:
-                schoenfeld_residuals = np.append(schoenfeld_residuals, ei * (xi - weighted_mean), axis=0)
+        scores = weights * np.exp(np.dot(X, self.hazards_.values))
+        _, tie_starts, tied_death_counts, tie_ix, _, denom, numer = self._efron_risk_sets(
+            T, E, scores, X, self.tie_method
+        )
 
-            # reset tie values
-            tie_count = 0
-            weight_count = 0.0
-            tie_phi = 0
-            tie_phi_x = np.zeros((1, d))
-            diff_against = []
+        weighted_mean = np.add.reduceat(numer / denom[:, None], tie_starts, axis=0) / tied_death_counts[:, None]
 
-        return schoenfeld_residuals[::-1]
+        schoenfeld_residuals[E] = X[E] - weighted_mean[tie_ix]
+        return schoenfeld_residuals
 
     def _compute_delta_beta(self, X, T, E, weights, index=None):
         """
@@ -1086,62 +1919,81 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
 
     def _compute_score(self, X, T, E, weights, index=None):
 
-        _, d = X.shape
-
         if self.strata is not None:
-            score_residuals = np.empty((0, d))
-
-            for score_residuals_in_strata in self._partition_by_strata_and_apply(
-                X, T, E, weights, self._compute_score_within_strata
-            ):
-                score_residuals = np.append(score_residuals, score_residuals_in_strata, axis=0)
+            score_residuals = np.concatenate(
+                list(self._partition_by_strata_and_apply(X, T, E, weights, self._compute_score_within_strata)), axis=0
+            )
 
         else:
-            score_residuals = self._compute_score_within_strata(X.values, T, E.values, weights.values)
+            score_residuals = self._compute_score_within_strata(X.values, T.values, E.values, weights.values)
 
         return pd.DataFrame(score_residuals, columns=self.hazards_.index, index=index)
 
-    def _compute_score_within_strata(self, X, _T, E, weights):
+    def _compute_score_within_strata(self, X, T, E, weights):  # pylint: disable=too-many-locals
         # https://www.stat.tamu.edu/~carroll/ftp/gk001.pdf
         # lin1989
         # https://www.ics.uci.edu/~dgillen/STAT255/Handouts/lecture10.pdf
         # Assumes X already sorted by T with strata
-        # TODO: doesn't handle ties.
-        # TODO: _T unused
+        #
+        # The score residual of subject i is
+        #
+        #    E_i (x_i - xbar(T_i)) - phi_i * sum_{t <= T_i} dH(t) (x_i - xbar(t))
+        #
+        # where dH(t) = sum of death weights / risk_phi(t). The sum is split into two forward cumulative sums,
+        # of dH(t) and of dH(t) * xbar(t) = E*w/risk_phi and E*w*risk_phi_x/risk_phi**2, so this is O(n*d).
+        # With Efron ties, the denominators within a tie group are risk_phi - k/m * tie_phi, and a subject who dies
+        # in the tie group is only partially (1 - k/m) in the kth denominator. With Breslow ties, k/m is always 0.
+        # This matches R's residuals(..., type="score").
 
         n, d = X.shape
+        E = E.astype(bool)
+
+        if not np.any(E):
+            return np.zeros((n, d))
 
         # we already unnormalized the betas in `fit`, so we need normalize them again since X is
         # normalized.
         beta = self.hazards_.values * self._norm_std
 
-        E = E.astype(int)
-        score_residuals = np.zeros((n, d))
-
         phi_s = np.exp(np.dot(X, beta))
+        scores = weights * phi_s
 
-        # need to store these histories, as we access them often
-        # this is a reverse cumulative sum. See original code in https://github.com/CamDavidsonPilon/lifelines/pull/496/files#diff-81ee0759dbae0770e1a02cf17f4cfbb1R431
-        risk_phi_x_history = (X * (weights * phi_s)[:, None])[::-1].cumsum(0)[::-1]
-        risk_phi_history = (weights * phi_s)[::-1].cumsum()[::-1][:, None]
-
-        # Iterate forwards
-        for i in range(0, n):
-
-            xi = X[i : i + 1]
-            phi_i = phi_s[i]
+        group_of_row, tie_starts, tied_death_counts, tie_ix, increasing_proportion, denom, numer = self._efron_risk_sets(
+            T, E, scores, X, self.tie_method
+        )
+        weighted_average = np.add.reduceat(weights[E], tie_starts) / tied_death_counts
+
+        x_bar = numer / denom[:, None]
+        hazard = weighted_average[tie_ix] / denom
+        x_hazard = x_bar * hazard[:, None]
+
+        # increments per tie group. Subjects that die in the tie group use the down-weighted versions.
+        n_groups = group_of_row[-1] + 1
+        groups_with_deaths = group_of_row[E][tie_starts]
+
+        hazard_increment = np.zeros(n_groups)
+        hazard_increment[groups_with_deaths] = np.add.reduceat(hazard, tie_starts)
+        x_hazard_increment = np.zeros((n_groups, d))
+        x_hazard_increment[groups_with_deaths] = np.add.reduceat(x_hazard, tie_starts, axis=0)
+
+        hazard_correction = np.zeros(n_groups)
+        hazard_correction[groups_with_deaths] = np.add.reduceat(increasing_proportion * hazard, tie_starts)
+        x_hazard_correction = np.zeros((n_groups, d))
+        x_hazard_correction[groups_with_deaths] = np.add.reduceat(
+            increasing_proportion[:, None] * x_hazard, tie_starts, axis=0
+        )
 
-            score = -phi_i * matrix_axis_0_sum_to_array(
-                (
-                    E[: i + 1] * weights[: i + 1] / risk_phi_history[: i + 1].T
-                ).T  # this is constant-ish, and could be cached
-                * (xi - risk_phi_x_history[: i + 1] / risk_phi_history[: i + 1])
-            )
+        x_bar_mean = np.zeros((n_groups, d))
+        x_bar_mean[groups_with_deaths] = np.add.reduceat(x_bar, tie_starts, axis=0) / tied_death_counts[:, None]
 
-            if E[i]:
-                score = score + (xi - risk_phi_x_history[i] / risk_phi_history[i])
+        cumulative_hazard = hazard_increment.cumsum()[group_of_row] - E * hazard_correction[group_of_row]
+        cumulative_x_hazard = (
+            x_hazard_increment.cumsum(0)[group_of_row] - E[:, None] * x_hazard_correction[group_of_row]
+        )
 
-            score_residuals[i, :] = score
+        score_residuals = E[:, None] * (X - x_bar_mean[group_of_row]) - phi_s[:, None] * (
+            X * cumulative_hazard[:, None] - cumulative_x_hazard
+        )
 
         return score_residuals * weights[:, None]
 
@@ -1256,7 +2108,8 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
             print("{} = {}".format(justify("penalizer"), self.penalizer))
 
         print("{} = {}".format(justify("number of subjects"), self._n_examples))
-        print("{} = {}".format(justify("number of events"), self.event_observed.sum()))
+        n_events = self.event_observed.sum() if hasattr(self, "event_observed") else self._n_events
+        print("{} = {}".format(justify("number of events"), n_events))
         print("{} = {:.{prec}f}".format(justify("partial log-likelihood"), self._log_likelihood, prec=decimals))
         print("{} = {}".format(justify("time fit was run"), self._time_fit_was_called))
 
@@ -1277,7 +2130,8 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
 
         # Significance code explanation
         print("---")
-        print("Concordance = {:.{prec}f}".format(self.score_, prec=decimals))
+        if hasattr(self, "_predicted_partial_hazards_"):
+            print("Concordance = {:.{prec}f}".format(self.score_, prec=decimals))
         with np.errstate(invalid="ignore", divide="ignore"):
             sr = self.log_likelihood_ratio_test()
             print(
@@ -1297,11 +2151,11 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         else:
             if self._batch_mode:
                 ll_null = self._trivial_log_likelihood_batch(
-                    self.durations.values, self.event_observed.values, self.weights.values
+                    self.durations.values, self.event_observed.values, self.weights.values, self.tie_method
                 )
             else:
                 ll_null = self._trivial_log_likelihood_single(
-                    self.durations.values, self.event_observed.values, self.weights.values
+                    self.durations.values, self.event_observed.values, self.weights.values, self.tie_method
                 )
         ll_alt = self._log_likelihood
         test_stat = 2 * ll_alt - 2 * ll_null
@@ -1347,10 +2201,11 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
 
         Parameters
         ----------
-        X:  numpy array or DataFrame
-            a (n,d) covariate numpy array or DataFrame. If a DataFrame, columns
-            can be in any order. If a numpy array, columns must be in the
-            same order as the training data.
+        X:  numpy array, scipy.sparse matrix or DataFrame
+            a (n,d) covariate numpy array, sparse matrix or DataFrame. If a DataFrame, columns
+            can be in any order. If a numpy array or sparse matrix, columns must be in the
+            same order as the training data. Sparse matrices, and DataFrames with sparse
+            columns, are not made dense.
 
         Returns
         -------
@@ -1379,7 +2234,12 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
             order = hazard_names
             X = X.reindex(order, axis="columns")
             check_for_numeric_dtypes_or_raise(X)
-            X = X.values
+            X = _to_sparse_matrix(X) if _has_sparse_columns(X) else X.values
+
+        if sparse.issparse(X):
+            # subtracting the mean from X would make it dense, so it's subtracted from the product instead.
+            log_partial_hazard = X.dot(self.hazards_.values) - np.dot(self._norm_mean.values, self.hazards_.values)
+            return pd.DataFrame(log_partial_hazard, index=index)
 
         X = X.astype(float)
 
@@ -1407,25 +2267,15 @@ See https://stats.stackexchange.com/questions/11109/how-to-deal-with-perfect-sep
         """
 
         if self.strata:
-            cumulative_hazard_ = pd.DataFrame()
-            for stratum, stratified_X in X.groupby(self.strata):
-                try:
-                    c_0 = self.baseline_cumulative_hazard_[[stratum]]
-                except KeyError:
-                    raise StatError(
-                        """The stratum %s was not found in the original training data. For example, try
-the following on the original dataset, df: `df.groupby(%s).size()`. Expected is that %s is not present in the output.
-"""
-                        % (stratum, self.strata, stratum)
-                    )
-                col = _get_index(stratified_X)
-                v = self.predict_partial_hazard(stratified_X)
-                cumulative_hazard_ = cumulative_hazard_.merge(
-                    pd.DataFrame(np.dot(c_0, v.T), index=c_0.index, columns=col),
-                    how="outer",
-                    right_index=True,
-                    left_index=True,
-                )
+            # every stratum's baseline shares the same index, so the subjects are filled into a single array.
+            c_0 = self.baseline_cumulative_hazard_
+            v = self.predict_partial_hazard(X)[0].values
+            cumulative_hazard_ = np.full((c_0.shape[0], v.shape[0]), np.nan)
+            for stratum, positions in X.groupby(self.strata).indices.items():
+                if stratum not in c_0.columns:
+                    raise self._unknown_stratum_error(stratum)
+                cumulative_hazard_[:, positions] = np.outer(c_0[stratum].values, v[positions])
+            cumulative_hazard_ = pd.DataFrame(cumulative_hazard_, index=c_0.index, columns=_get_index(X))
         else:
 
             c_0 = self.baseline_cumulative_hazard_
@@ -1463,6 +2313,87 @@ the following on the original dataset, df: `df.groupby(%s).size()`. Expected is
         """
         return np.exp(-self.predict_cumulative_hazard(X, times=times))
 
+    def _unknown_stratum_error(self, stratum):
+        return StatError(
+            """The stratum %s was not found in the original training data. For example, try
+the following on the original dataset, df: `df.groupby(%s).size()`. Expected is that %s is not present in the output.
+"""
+            % (stratum, self.strata, stratum)
+        )
+
+    def iter_predict_cumulative_hazard(self, X, times=None, chunksize=10000):
+        """
+        Like ``predict_cumulative_hazard``, but yields the cumulative hazards of ``chunksize`` subjects at a time.
+        Memory use is bounded by ``len(times) * chunksize``, rather than growing with the number of subjects.
+
+        Parameters
+        ----------
+        X: numpy array or DataFrame
+            a (n,d) covariate numpy array or DataFrame. If a DataFrame, columns
+            can be in any order. If a numpy array, columns must be in the
+            same order as the training data.
+        times: iterable, optional
+            an iterable of increasing times to predict the cumulative hazard at. Default
+            is the set of all durations (observed and unobserved). Uses a linear interpolation if
+            points in time are not in the index. A coarse grid of times uses much less memory.
+        chunksize: int, optional (default=10000)
+            the number of subjects in each chunk.
+
+        Yields
+        -------
+        cumulative_hazard_ : DataFrame
+            the cumulative hazard of the next ``chunksize`` individuals over the timeline
+
+        Examples
+        --------
+        >>> # write the survival functions of many subjects to disk.
+        >>> out = np.lib.format.open_memmap("survival.npy", mode="w+", shape=(len(times), X.shape[0]))
+        >>> start = 0
+        >>> for chunk in cph.iter_predict_survival_function(X, times=times):
+        >>>     out[:, start:start + chunk.shape[1]] = chunk.values
+        >>>     start += chunk.shape[1]
+
+        """
+        if chunksize < 1:
+            raise ValueError("chunksize must be >= 1.")
+
+        # the baseline is only interpolated once, rather than for every chunk.
+        baseline = self.baseline_cumulative_hazard_
+        if times is not None:
+            times = _to_array(times)
+            baseline = baseline.reindex(baseline.index.union(times)).interpolate(method="index").loc[times]
+
+        subjects = _get_index(X)
+        for start in range(0, X.shape[0], chunksize):
+            stop = start + chunksize
+            X_chunk = X.iloc[start:stop] if isinstance(X, pd.DataFrame) else X[start:stop]
+            cumulative_hazard = np.full((baseline.shape[0], X_chunk.shape[0]), np.nan)
+
+            if self.strata:
+                for stratum, positions in X_chunk.groupby(self.strata).indices.items():
+                    if stratum not in baseline.columns:
+                        raise self._unknown_stratum_error(stratum)
+                    partial_hazard = self.predict_partial_hazard(X_chunk.iloc[positions])[0].values
+                    cumulative_hazard[:, positions] = np.outer(baseline[stratum].values, partial_hazard)
+            else:
+                partial_hazard = self.predict_partial_hazard(X_chunk)[0].values
+                cumulative_hazard[:] = np.outer(baseline.values[:, 0], partial_hazard)
+
+            yield pd.DataFrame(cumulative_hazard, index=baseline.index, columns=subjects[start:stop])
+
+    def iter_predict_survival_function(self, X, times=None, chunksize=10000):
+        """
+        Like ``predict_survival_function``, but yields the survival functions of ``chunksize`` subjects at a time.
+        See ``iter_predict_cumulative_hazard``.
+
+        Yields
+        -------
+        survival_function : DataFrame
+            the survival probabilities of the next ``chunksize`` individuals over the timeline
+        """
+        for cumulative_hazard in self.iter_predict_cumulative_hazard(X, times=times, chunksize=chunksize):
+            yield np.exp(-cumulative_hazard)
+
     def predict_percentile(self, X, p=0.5):
         """
         Returns the median lifetimes for the individuals, by default. If the survival curve of an
@@ -1550,12 +2481,103 @@ the following on the original dataset, df: `df.groupby(%s).size()`. Expected is
         predict_percentile
 
         """
-        subjects = _get_index(X)
-        v = self.predict_survival_function(X)[subjects]
-        return pd.DataFrame(trapz(v.values.T, v.index), index=subjects)
+        return pd.DataFrame(self._integrate_survival_functions(X), index=_get_index(X))
+
+    def predict_restricted_expectation(self, X, t):
+        r"""
+        Compute the restricted mean lifetime, :math:`E[\min(T, t)]`, using covariates X. This is the area under the
+        survival function up to time t, computed in the same way as ``predict_expectation``. Unlike the expectation,
+        it's finite even if the survival function doesn't converge to 0.
+
+        Parameters
+        ----------
+        X: numpy array or DataFrame
+            a (n,d) covariate numpy array or DataFrame. If a DataFrame, columns
+            can be in any order. If a numpy array, columns must be in the
+            same order as the training data.
+        t: float
+            the time horizon.
+
+        Returns
+        -------
+        restricted_expectations : DataFrame
+
+        See Also
+        --------
+        predict_expectation
+        """
+        return pd.DataFrame(self._integrate_survival_functions(X, horizon=t), index=_get_index(X))
+
+    def _integrate_survival_functions(self, X, horizon=None, chunksize=10000):
+        """
+        The trapezoidal rule is a weighted sum of the survival function at each time, and the survival functions are
+        exp(-baseline * partial hazard), so the integrals only need the partial hazards and the baseline. The
+        survival functions are computed chunksize subjects at a time, so memory is bounded by the size of the
+        timeline times chunksize, rather than creating the full (timeline, subjects) matrix.
+        """
+        timeline = self.baseline_cumulative_hazard_.index.values.astype(float)
+        baselines = {stratum: b.values for stratum, b in self.baseline_cumulative_hazard_.iteritems()}
+
+        if timeline[0] > 0:
+            # the integrals start at 0, where the cumulative hazard is 0 and the survival function is 1.
+            timeline = np.append(0.0, timeline)
+            baselines = {stratum: np.append(0.0, b) for stratum, b in baselines.items()}
+
+        if horizon is not None:
+            before = timeline < horizon
+            # the survival function is linearly interpolated at the horizon, like predict_survival_function.
+            baselines = {
+                stratum: np.append(b[before], np.interp(horizon, timeline, b)) for stratum, b in baselines.items()
+            }
+            timeline = np.append(timeline[before], horizon)
+
+        # the weight of each time in the trapezoidal rule.
+        half_dt = np.diff(timeline) / 2
+        weights = np.append(half_dt, 0) + np.append(0, half_dt)
+
+        partial_hazards = self.predict_partial_hazard(X)[0].values
+        if self.strata:
+            positions_of_strata = X.groupby(self.strata).indices.items()
+        else:
+            positions_of_strata = [("baseline hazard", np.arange(partial_hazards.shape[0]))]
+
+        integrals = np.empty(partial_hazards.shape[0])
+        for stratum, positions in positions_of_strata:
+            if stratum not in baselines:
+                raise self._unknown_stratum_error(stratum)
+            baseline = baselines[stratum]
+            for start in range(0, positions.shape[0], chunksize):
+                chunk = positions[start : start + chunksize]
+                integrals[chunk] = np.dot(weights, np.exp(-np.outer(baseline, partial_hazards[chunk])))
+        return integrals
+
+    def to_scorer(self):
+        """
+        Returns an immutable ``CoxPHScorer`` that predicts the partial hazard, survival function and percentiles
+        of new subjects from numpy arrays. It skips the pandas overhead of the ``predict_*`` methods, so it's much
+        faster for scoring one subject at a time, and can be shared between threads.
+
+        Returns
+        -------
+        scorer: CoxPHScorer
+
+        Examples
+        --------
+        >>> from lifelines import CoxPHFitter
+        >>> from lifelines.datasets import load_rossi
+        >>>
+        >>> rossi = load_rossi()
+        >>> cph = CoxPHFitter().fit(rossi, 'week', 'arrest')
+        >>> scorer = cph.to_scorer()
+        >>> scorer.predict_survival_function(rossi[list(scorer.columns)].values[0], times=[10, 20])
+
+        """
+        return CoxPHScorer(self)
 
     def _compute_baseline_hazard(self, partial_hazards, name):
         # https://stats.stackexchange.com/questions/46532/cox-baseline-hazard
+        # This is Breslow's estimator, which is the maximum likelihood estimate when tie_method="Breslow", and is
+        # also used (as in previous versions of lifelines) when tie_method="Efron".
         ind_hazards = partial_hazards.copy()
         ind_hazards["P"] *= ind_hazards["W"]
         ind_hazards["E"] *= ind_hazards["W"]
@@ -1568,18 +2590,17 @@ the following on the original dataset, df: `df.groupby(%s).size()`. Expected is
 
     def _compute_baseline_hazards(self):
         if self.strata:
-
-            index = self.durations.unique()
-            baseline_hazards_ = pd.DataFrame(index=index).sort_index()
-
+            # all strata share the index of unique durations, and are 0 at the durations of the other strata.
+            index = np.unique(self.durations.values)
+            names, baseline_hazards_ = [], []
             for name, stratum_predicted_partial_hazards_ in self._predicted_partial_hazards_.groupby(self.strata):
-                baseline_hazards_ = baseline_hazards_.merge(
-                    self._compute_baseline_hazard(stratum_predicted_partial_hazards_, name),
-                    left_index=True,
-                    right_index=True,
-                    how="left",
-                )
-            return baseline_hazards_.fillna(0)
+                stratum_baseline_hazard = self._compute_baseline_hazard(stratum_predicted_partial_hazards_, name)
+                baseline_hazard = np.zeros(index.shape[0])
+                positions = np.searchsorted(index, stratum_baseline_hazard.index.values)
+                baseline_hazard[positions] = stratum_baseline_hazard.iloc[:, 0].values
+                names.append(name)
+                baseline_hazards_.append(baseline_hazard)
+            return pd.DataFrame(np.column_stack(baseline_hazards_), index=index, columns=names)
 
         return self._compute_baseline_hazard(self._predicted_partial_hazards_, name="baseline hazard")
 
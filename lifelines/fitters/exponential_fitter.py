@@ -76,3 +76,13 @@ class ExponentialFitter(KnownModelParametericUnivariateFitter):
     def _cumulative_hazard(self, params, times):
         lambda_ = params[0]
         return times / lambda_
+
+    def _cumulative_hazard_and_derivatives(self, params, times):
+        lambda_ = params[0]
+        cum_haz = times / lambda_
+        return cum_haz, np.array([-cum_haz / lambda_]), np.array([[2 * cum_haz / lambda_ ** 2]])
+
+    def _log_hazard_and_derivatives(self, params, times):
+        lambda_ = params[0]
+        ones = np.ones_like(times, dtype=float)
+        return -np.log(lambda_) * ones, np.array([-ones / lambda_]), np.array([[ones / lambda_ ** 2]])
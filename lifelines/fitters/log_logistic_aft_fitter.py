@@ -6,6 +6,7 @@ import pandas as pd
 
 from lifelines.utils import _get_index, coalesce
 from lifelines.fitters import ParametericAFTRegressionFitter
+from lifelines.scorers import LogLogisticAFTScorer
 
 
 class LogLogisticAFTFitter(ParametericAFTRegressionFitter):
@@ -57,6 +58,8 @@ class LogLogisticAFTFitter(ParametericAFTRegressionFitter):
         the concordance index of the model.
     """
 
+    _scorer_class = LogLogisticAFTScorer
+
     def __init__(self, alpha=0.05, penalizer=0.0, l1_ratio=0.0, fit_intercept=True):
         self._ancillary_parameter_name = "beta_"
         self._primary_parameter_name = "alpha_"
@@ -121,7 +124,7 @@ class LogLogisticAFTFitter(ParametericAFTRegressionFitter):
         """
         alpha_, beta_ = self._prep_inputs_for_prediction_and_return_scores(X, ancillary_X)
 
-        return pd.DataFrame(alpha_ * (1 / p - 1) ** beta_, index=_get_index(X))
+        return pd.DataFrame(alpha_ * (1 / p - 1) ** (1 / beta_), index=_get_index(X))
 
     def predict_expectation(self, X, ancillary_X=None):
         """
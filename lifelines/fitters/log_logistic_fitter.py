@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import autograd.numpy as np
+from scipy.special import expit
 
 from lifelines.fitters import KnownModelParametericUnivariateFitter
 
@@ -84,6 +85,31 @@ class LogLogisticFitter(KnownModelParametericUnivariateFitter):
         alpha_, beta_ = params
         return np.log1p((times / alpha_) ** beta_)
 
+    def _log_scaled_times_and_derivatives(self, params, times):
+        # u = beta_ * log(times / alpha_), and its derivatives with respect to (alpha_, beta_)
+        alpha_, beta_ = params
+        log_ratio = np.log(times / alpha_)
+        ones = np.ones_like(log_ratio)
+        gradient = np.array([-beta_ / alpha_ * ones, log_ratio])
+        hessian = np.array([[beta_ / alpha_ ** 2 * ones, -ones / alpha_], [-ones / alpha_, 0 * ones]])
+        return beta_ * log_ratio, gradient, hessian
+
+    def _cumulative_hazard_and_derivatives(self, params, times):
+        u, u_gradient, u_hessian = self._log_scaled_times_and_derivatives(params, times)
+        p = expit(u)
+        return self._chain_rule(np.logaddexp(0, u), p, p * (1 - p), u_gradient, u_hessian)
+
+    def _log_hazard_and_derivatives(self, params, times):
+        beta_ = params[1]
+        u, u_gradient, u_hessian = self._log_scaled_times_and_derivatives(params, times)
+        p = expit(u)
+        log_hz, gradient, hessian = self._chain_rule(
+            np.log(beta_) - np.log(times) + u - np.logaddexp(0, u), 1 - p, -p * (1 - p), u_gradient, u_hessian
+        )
+        gradient[1] += 1 / beta_
+        hessian[1, 1] -= 1 / beta_ ** 2
+        return log_hz, gradient, hessian
+
     def _log_1m_sf(self, params, times):
         alpha_, beta_ = params
         return -np.log1p((times / alpha_) ** -beta_)
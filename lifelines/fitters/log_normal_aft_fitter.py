@@ -6,6 +6,7 @@ import pandas as pd
 
 from lifelines.utils import _get_index, coalesce
 from lifelines.fitters import ParametericAFTRegressionFitter
+from lifelines.scorers import LogNormalAFTScorer
 from lifelines.utils.logsf import logsf
 
 
@@ -58,6 +59,8 @@ class LogNormalAFTFitter(ParametericAFTRegressionFitter):
         the concordance index of the model.
     """
 
+    _scorer_class = LogNormalAFTScorer
+
     def __init__(self, alpha=0.05, penalizer=0.0, l1_ratio=0.0, fit_intercept=True):
         self._primary_parameter_name = "mu_"
         self._ancillary_parameter_name = "sigma_"
@@ -81,6 +81,37 @@ class LogNormalFitter(KnownModelParametericUnivariateFitter):
         Z = (np.log(times) - mu_) / sigma_
         return norm.logpdf(Z, loc=0, scale=1) - np.log(sigma_) - np.log(times) - logsf(Z)
 
+    def _z_and_derivatives(self, params, times):
+        # Z, and its derivatives with respect to (mu_, sigma_)
+        mu_, sigma_ = params
+        Z = (np.log(times) - mu_) / sigma_
+        ones = np.ones_like(Z)
+        gradient = np.array([-ones, -Z]) / sigma_
+        hessian = np.array([[0 * ones, ones], [ones, 2 * Z]]) / sigma_ ** 2
+        return Z, gradient, hessian
+
+    def _cumulative_hazard_and_derivatives(self, params, times):
+        Z, Z_gradient, Z_hessian = self._z_and_derivatives(params, times)
+        inverse_mills_ratio = np.exp(norm.logpdf(Z, loc=0, scale=1) - logsf(Z))
+        return self._chain_rule(
+            -logsf(Z), inverse_mills_ratio, inverse_mills_ratio * (inverse_mills_ratio - Z), Z_gradient, Z_hessian
+        )
+
+    def _log_hazard_and_derivatives(self, params, times):
+        sigma_ = params[1]
+        Z, Z_gradient, Z_hessian = self._z_and_derivatives(params, times)
+        inverse_mills_ratio = np.exp(norm.logpdf(Z, loc=0, scale=1) - logsf(Z))
+        log_hz, gradient, hessian = self._chain_rule(
+            self._log_hazard(params, times),
+            inverse_mills_ratio - Z,
+            inverse_mills_ratio * (inverse_mills_ratio - Z) - 1,
+            Z_gradient,
+            Z_hessian,
+        )
+        gradient[1] -= 1 / sigma_
+        hessian[1, 1] += 1 / sigma_ ** 2
+        return log_hz, gradient, hessian
+
     def _log_1m_sf(self, params, times):
         mu_, sigma_ = params
         Z = (np.log(times) - mu_) / sigma_
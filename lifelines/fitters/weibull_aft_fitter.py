@@ -5,6 +5,7 @@ import pandas as pd
 
 from lifelines.utils import _get_index, coalesce
 from lifelines.fitters import ParametericAFTRegressionFitter
+from lifelines.scorers import WeibullAFTScorer
 
 
 class WeibullAFTFitter(ParametericAFTRegressionFitter):
@@ -58,6 +59,8 @@ class WeibullAFTFitter(ParametericAFTRegressionFitter):
         the concordance index of the model.
     """
 
+    _scorer_class = WeibullAFTScorer
+
     def __init__(self, alpha=0.05, penalizer=0.0, l1_ratio=0.0, fit_intercept=True):
         self._ancillary_parameter_name = "rho_"
         self._primary_parameter_name = "lambda_"
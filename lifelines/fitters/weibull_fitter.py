@@ -87,6 +87,28 @@ class WeibullFitter(KnownModelParametericUnivariateFitter):
         lambda_, rho_ = params
         return (times / lambda_) ** rho_
 
+    def _log_scaled_times_and_derivatives(self, params, times):
+        # u = rho_ * log(times / lambda_), and its derivatives with respect to (lambda_, rho_)
+        lambda_, rho_ = params
+        log_ratio = np.log(times / lambda_)
+        ones = np.ones_like(log_ratio)
+        gradient = np.array([-rho_ / lambda_ * ones, log_ratio])
+        hessian = np.array([[rho_ / lambda_ ** 2 * ones, -ones / lambda_], [-ones / lambda_, 0 * ones]])
+        return rho_ * log_ratio, gradient, hessian
+
+    def _cumulative_hazard_and_derivatives(self, params, times):
+        u, u_gradient, u_hessian = self._log_scaled_times_and_derivatives(params, times)
+        cum_haz = np.exp(u)
+        return self._chain_rule(cum_haz, cum_haz, cum_haz, u_gradient, u_hessian)
+
+    def _log_hazard_and_derivatives(self, params, times):
+        rho_ = params[1]
+        u, u_gradient, u_hessian = self._log_scaled_times_and_derivatives(params, times)
+        log_hz, gradient, hessian = self._chain_rule(np.log(rho_) - np.log(times) + u, 1, 0, u_gradient, u_hessian)
+        gradient[1] += 1 / rho_
+        hessian[1, 1] -= 1 / rho_ ** 2
+        return log_hz, gradient, hessian
+
     @property
     def median_(self):
         return self.lambda_ * (np.log(2) ** (1.0 / self.rho_))
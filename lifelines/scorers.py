@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight, immutable objects for scoring new subjects with a fitted regression model. They are created
+with ``model.to_scorer()``, and only work with numpy arrays, so they skip the pandas bookkeeping of the
+``predict_*`` methods. This makes them much faster for scoring one, or a few, subjects at a time.
+
+Scorers have no mutable state, so a single scorer can be shared between threads.
+"""
+import numpy as np
+from scipy.special import erfinv, gamma
+from scipy.stats import norm
+
+from lifelines.utils import StatError
+
+
+__all__ = ["CoxPHScorer", "WeibullAFTScorer", "LogNormalAFTScorer", "LogLogisticAFTScorer"]
+
+
+def _frozen(array):
+    array = np.array(array, dtype=float)
+    array.setflags(write=False)
+    return array
+
+
+def _as_2d(X, d, name="X"):
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    if X.shape[1] != d:
+        raise ValueError(
+            "%s must have %d columns, in the same order as the training data, got %d." % (name, d, X.shape[1])
+        )
+    return X
+
+
+def _check_p(p):
+    if not 0 < p < 1:
+        raise ValueError("p must be between 0 and 1.")
+
+
+class _Scorer(object):
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is immutable." % self.__class__.__name__)
+
+    def _set(self, name, value):
+        object.__setattr__(self, name, value)
+
+    def predict_survival_function(self, X, *args, **kwargs):
+        """
+        See ``predict_cumulative_hazard``.
+
+        Returns
+        -------
+        survival_function: (len(times), n) numpy array
+        """
+        return np.exp(-self.predict_cumulative_hazard(X, *args, **kwargs))
+
+
+class CoxPHScorer(_Scorer):
+    """
+    Scores new subjects with a fitted ``CoxPHFitter``, see ``CoxPHFitter.to_scorer``.
+
+    All methods take X as a (d,) numpy array, for a single subject, or a (n,d) numpy array. The columns
+    must be in the same order as the training data, ``columns``. The results are numpy arrays with the same
+    orientation as the ``predict_*`` methods of ``CoxPHFitter``, ex: ``predict_survival_function`` returns a
+    (len(times), n) array.
+
+    Parameters
+    ----------
+    model: CoxPHFitter
+        a fitted model.
+    """
+
+    __slots__ = ("columns", "coefficients", "strata", "timeline", "_offset", "_baseline_cumulative_hazards")
+
+    def __init__(self, model):
+        coefficients = model.hazards_.values
+        baseline_cumulative_hazard = model.baseline_cumulative_hazard_
+
+        self._set("columns", tuple(model.hazards_.index))
+        self._set("coefficients", _frozen(coefficients))
+        self._set("strata", model.strata)
+        self._set("timeline", _frozen(baseline_cumulative_hazard.index.values))
+        # centering X is the same as subtracting the product of the centers and coefficients.
+        self._set("_offset", float(np.dot(model._norm_mean.values, coefficients)))
+        self._set(
+            "_baseline_cumulative_hazards",
+            {
+                stratum: _frozen(baseline_cumulative_hazard[stratum].values)
+                for stratum in baseline_cumulative_hazard.columns
+            },
+        )
+
+    def _baseline_cumulative_hazard(self, stratum):
+        if self.strata is None:
+            return self._baseline_cumulative_hazards["baseline hazard"]
+        try:
+            return self._baseline_cumulative_hazards[stratum]
+        except KeyError:
+            raise StatError("The stratum %s was not found in the original training data." % (stratum,))
+
+    def predict_log_partial_hazard(self, X):
+        """
+        Returns
+        -------
+        log_partial_hazard: (n,) numpy array
+        """
+        return np.dot(_as_2d(X, self.coefficients.shape[0]), self.coefficients) - self._offset
+
+    def predict_partial_hazard(self, X):
+        """
+        Returns
+        -------
+        partial_hazard: (n,) numpy array
+        """
+        return np.exp(self.predict_log_partial_hazard(X))
+
+    def predict_cumulative_hazard(self, X, times=None, stratum=None):
+        """
+        Parameters
+        ----------
+        X: numpy array
+            a (d,) or (n,d) covariate array.
+        times: iterable, optional
+            an iterable of increasing times. Default is the ``timeline`` of the training data. Uses a linear
+            interpolation if points in time are not in the timeline.
+        stratum: optional
+            the stratum of the subjects, if the model was fit with strata.
+
+        Returns
+        -------
+        cumulative_hazard: (len(times), n) numpy array
+        """
+        baseline = self._baseline_cumulative_hazard(stratum)
+        if times is not None:
+            # like CoxPHFitter, this is undefined before the first time, and constant after the last.
+            baseline = np.interp(np.asarray(times, dtype=float), self.timeline, baseline, left=np.nan)
+        return np.outer(baseline, self.predict_partial_hazard(X))
+
+    def predict_percentile(self, X, p=0.5, stratum=None):
+        """
+        Returns the first time in the ``timeline`` that the survival function of each subject is at or below p,
+        or infinity if it never is.
+
+        Returns
+        -------
+        percentiles: (n,) numpy array
+        """
+        _check_p(p)
+        baseline = self._baseline_cumulative_hazard(stratum)
+        # S(t) <= p iff H_0(t) >= -log(p) / partial hazard, and H_0 is non-decreasing.
+        ix = np.searchsorted(baseline, -np.log(p) / self.predict_partial_hazard(X), side="left")
+        return np.append(self.timeline, np.inf)[ix]
+
+    def predict_median(self, X, stratum=None):
+        """
+        See ``predict_percentile``.
+        """
+        return self.predict_percentile(X, p=0.5, stratum=stratum)
+
+
+class _AFTScorer(_Scorer):
+    """
+    Scores new subjects with a fitted AFT model, see ``to_scorer``.
+
+    All methods take X, and ancillary_X if the model was fit with an ancillary_df, as (d,) numpy arrays, for
+    a single subject, or (n,d) numpy arrays. The columns must be in the same order as the training data,
+    ``columns`` and ``ancillary_columns``, and exclude the ``_intercept`` column. The results are numpy arrays
+    with the same orientation as the ``predict_*`` methods of the model.
+
+    Parameters
+    ----------
+    model: ParametericAFTRegressionFitter
+        a fitted model.
+    """
+
+    __slots__ = (
+        "columns",
+        "ancillary_columns",
+        "timeline",
+        "_coefficients",
+        "_intercept",
+        "_ancillary_coefficients",
+        "_ancillary_intercept",
+    )
+
+    def __init__(self, model):
+        primary = model.params_.loc[model._primary_parameter_name]
+        ancillary = model.params_.loc[model._ancillary_parameter_name]
+        primary_columns = [c for c in primary.index if c != "_intercept"]
+        ancillary_columns = [c for c in ancillary.index if c != "_intercept"]
+
+        self._set("columns", tuple(primary_columns))
+        self._set("ancillary_columns", tuple(ancillary_columns))
+        self._set("timeline", _frozen(np.unique(model.durations) if model.timeline is None else model.timeline))
+        self._set("_coefficients", _frozen(primary[primary_columns].values))
+        self._set("_intercept", float(primary.get("_intercept", 0.0)))
+        self._set("_ancillary_coefficients", _frozen(ancillary[ancillary_columns].values))
+        self._set("_ancillary_intercept", float(ancillary.get("_intercept", 0.0)))
+
+    def _scores(self, X, ancillary_X):
+        X = _as_2d(X, self._coefficients.shape[0])
+        primary = np.dot(X, self._coefficients) + self._intercept
+
+        if self.ancillary_columns:
+            if ancillary_X is None:
+                raise ValueError("ancillary_X is required, as the model was fit with an ancillary_df.")
+            ancillary_X = _as_2d(ancillary_X, self._ancillary_coefficients.shape[0], name="ancillary_X")
+            ancillary = np.dot(ancillary_X, self._ancillary_coefficients) + self._ancillary_intercept
+        else:
+            ancillary = np.full(X.shape[0], self._ancillary_intercept)
+        return primary, ancillary
+
+    def predict_cumulative_hazard(self, X, times=None, ancillary_X=None):
+        """
+        Parameters
+        ----------
+        X: numpy array
+            a (d,) or (n,d) covariate array.
+        times: iterable, optional
+            an iterable of increasing times. Default is the ``timeline`` of the model.
+        ancillary_X: numpy array, optional
+            a (d,) or (n,d) covariate array, if the model was fit with an ancillary_df.
+
+        Returns
+        -------
+        cumulative_hazard: (len(times), n) numpy array
+        """
+        times = self.timeline if times is None else np.asarray(times, dtype=float)
+        return self._cumulative_hazard(times, *self._scores(X, ancillary_X))
+
+    def predict_percentile(self, X, ancillary_X=None, p=0.5):
+        """
+        Returns
+        -------
+        percentiles: (n,) numpy array
+        """
+        _check_p(p)
+        return self._percentile(p, *self._scores(X, ancillary_X))
+
+    def predict_median(self, X, ancillary_X=None):
+        """
+        See ``predict_percentile``.
+        """
+        return self.predict_percentile(X, ancillary_X=ancillary_X, p=0.5)
+
+    def predict_expectation(self, X, ancillary_X=None):
+        """
+        Returns
+        -------
+        expectations: (n,) numpy array
+        """
+        return self._expectation(*self._scores(X, ancillary_X))
+
+    def _cumulative_hazard(self, times, primary, ancillary):
+        raise NotImplementedError()
+
+    def _percentile(self, p, primary, ancillary):
+        raise NotImplementedError()
+
+    def _expectation(self, primary, ancillary):
+        raise NotImplementedError()
+
+
+class WeibullAFTScorer(_AFTScorer):
+    """
+    Scores new subjects with a fitted ``WeibullAFTFitter``, see ``_AFTScorer``.
+    """
+
+    __slots__ = ()
+
+    def _cumulative_hazard(self, times, log_lambda_, log_rho_):
+        return np.outer(times, np.exp(-log_lambda_)) ** np.exp(log_rho_)
+
+    def _percentile(self, p, log_lambda_, log_rho_):
+        return np.exp(log_lambda_) * np.power(-np.log(p), np.exp(-log_rho_))
+
+    def _expectation(self, log_lambda_, log_rho_):
+        return np.exp(log_lambda_) * gamma(1 + np.exp(-log_rho_))
+
+
+class LogNormalAFTScorer(_AFTScorer):
+    """
+    Scores new subjects with a fitted ``LogNormalAFTFitter``, see ``_AFTScorer``.
+    """
+
+    __slots__ = ()
+
+    def _cumulative_hazard(self, times, mu_, log_sigma_):
+        return -norm.logsf(np.subtract.outer(np.log(times), mu_) / np.exp(log_sigma_))
+
+    def _percentile(self, p, mu_, log_sigma_):
+        return np.exp(mu_ + np.sqrt(2) * np.exp(log_sigma_) * erfinv(2 * p - 1))
+
+    def _expectation(self, mu_, log_sigma_):
+        return np.exp(mu_ + np.exp(log_sigma_) ** 2 / 2)
+
+
+class LogLogisticAFTScorer(_AFTScorer):
+    """
+    Scores new subjects with a fitted ``LogLogisticAFTFitter``, see ``_AFTScorer``.
+    """
+
+    __slots__ = ()
+
+    def _cumulative_hazard(self, times, log_alpha_, log_beta_):
+        return np.log1p(np.outer(times, np.exp(-log_alpha_)) ** np.exp(log_beta_))
+
+    def _percentile(self, p, log_alpha_, log_beta_):
+        return np.exp(log_alpha_) * (1 / p - 1) ** np.exp(-log_beta_)
+
+    def _expectation(self, log_alpha_, log_beta_):
+        alpha_, beta_ = np.exp(log_alpha_), np.exp(log_beta_)
+        v = (alpha_ * np.pi / beta_) / np.sin(np.pi / beta_)
+        return np.where(beta_ > 1, v, np.nan)
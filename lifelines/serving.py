@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Serve predictions of a fitted lifelines regression model to many concurrent asyncio callers. Each caller
+asks for the prediction of a single subject, and the requests are batched into one vectorized call of the
+model's ``predict_*`` method.
+"""
+import asyncio
+import functools
+
+import numpy as np
+import pandas as pd
+
+
+__all__ = ["BatchingPredictor"]
+
+
+# these methods return one column per subject. The others return one row per subject.
+_SUBJECTS_AS_COLUMNS = ("predict_survival_function", "predict_cumulative_hazard")
+
+
+class BatchingPredictor(object):
+    """
+    Collects the subjects of concurrent ``predict`` calls for up to ``max_delay`` seconds, or until there are
+    ``max_batch_size`` of them, and then predicts all of them with a single call of the model's ``predict_*``
+    method.
+
+    Works with any fitted regression model whose ``predict_*`` methods take a DataFrame or numpy array of
+    subjects, ex: ``CoxPHFitter``, ``WeibullAFTFitter``, ``LogNormalAFTFitter``, ``LogLogisticAFTFitter``
+    and ``AalenAdditiveFitter``.
+
+    Parameters
+    ----------
+    model: fitted regression model
+    method: string, optional (default="predict_survival_function")
+        the name of the ``predict_*`` method of the model to call.
+    max_batch_size: int, optional (default=256)
+        a batch is predicted as soon as it has this many subjects.
+    max_delay: float, optional (default=0.002)
+        the maximum number of seconds a subject waits for the rest of its batch.
+    executor: concurrent.futures.Executor, optional
+        if given, the predictions are computed in this executor, instead of blocking the event loop.
+    kwargs:
+        passed to the ``predict_*`` method, ex: ``times`` or ``p``. They are the same for every subject.
+
+    Examples
+    --------
+    >>> from lifelines import CoxPHFitter
+    >>> from lifelines.datasets import load_rossi
+    >>> from lifelines.serving import BatchingPredictor
+    >>>
+    >>> rossi = load_rossi()
+    >>> cph = CoxPHFitter().fit(rossi, 'week', 'arrest')
+    >>> predictor = BatchingPredictor(cph, "predict_median", max_batch_size=128)
+    >>>
+    >>> async def handle_request(subject):
+    >>>     return await predictor.predict(subject)
+
+    """
+
+    def __init__(
+        self, model, method="predict_survival_function", max_batch_size=256, max_delay=0.002, executor=None, **kwargs
+    ):
+        if not hasattr(model, method) or not method.startswith("predict"):
+            raise ValueError("%s is not a predict method of %s." % (method, model.__class__.__name__))
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1.")
+        if max_delay < 0:
+            raise ValueError("max_delay must be >= 0.")
+
+        self.model = model
+        self.method = method
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._predict = functools.partial(getattr(model, method), **kwargs)
+        self._executor = executor
+        self._pending = []
+        self._timer = None
+        # the event loop only keeps weak references to tasks, so the batches in flight are kept here.
+        self._tasks = set()
+
+    async def predict(self, subject):
+        """
+        Predict a single subject.
+
+        Parameters
+        ----------
+        subject: dict, Series or numpy array
+            the covariates of a subject. A numpy array must be in the same order as the training data.
+
+        Returns
+        -------
+        prediction: Series or float
+            a Series indexed by the timeline for ``predict_survival_function`` and ``predict_cumulative_hazard``,
+            else the subject's value, ex: its median.
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.append((subject, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+
+        return await future
+
+    def flush(self):
+        """
+        Predict all the waiting subjects now, rather than waiting for ``max_delay``.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._predict_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def close(self):
+        """
+        Predict all the waiting subjects now, and wait until every batch has been predicted.
+        """
+        self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    async def _predict_batch(self, batch):
+        subjects, futures = zip(*batch)
+        try:
+            X = self._stack(subjects)
+            if self._executor is None:
+                predictions = self._predict(X)
+            else:
+                predictions = await asyncio.get_event_loop().run_in_executor(self._executor, self._predict, X)
+        except Exception as e:  # pylint: disable=broad-except
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for i, future in enumerate(futures):
+            # the caller may have been cancelled while waiting.
+            if future.done():
+                continue
+            try:
+                future.set_result(self._unstack(predictions, i))
+            except Exception as e:  # pylint: disable=broad-except
+                future.set_exception(e)
+
+    @staticmethod
+    def _stack(subjects):
+        if isinstance(subjects[0], (dict, pd.Series)):
+            return pd.DataFrame([dict(subject) for subject in subjects])
+        return np.vstack([np.asarray(subject, dtype=float) for subject in subjects])
+
+    def _unstack(self, predictions, i):
+        if np.isscalar(predictions):
+            # ex: the percentile of a batch of one subject is a float.
+            return predictions
+        if self.method in _SUBJECTS_AS_COLUMNS:
+            return predictions.iloc[:, i]
+        if predictions.shape[1] == 1:
+            return predictions.iloc[i, 0]
+        return predictions.iloc[i]
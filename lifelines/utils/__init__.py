@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 
+import os
+import time
 import warnings
 import collections
+import multiprocessing
 from datetime import datetime
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 
 
 import numpy as np
 from scipy.linalg import solve
+from scipy import sparse
 from scipy import stats
 import pandas as pd
 
@@ -24,6 +29,7 @@ __all__ = [
     "datetimes_to_durations",
     "concordance_index",
     "k_fold_cross_validation",
+    "parallel_k_fold_cross_validation",
     "to_long_format",
     "to_episodic_format",
     "add_covariate_to_timeline",
@@ -120,7 +126,7 @@ def qth_survival_times(q, survival_functions, cdf=False):
     --------
     qth_survival_time, median_survival_times
     """
-    # pylint: disable=cell-var-from-loop,misplaced-comparison-constant,no-else-return
+    # pylint: disable=no-else-return
 
     q = pd.Series(q)
 
@@ -128,24 +134,45 @@ def qth_survival_times(q, survival_functions, cdf=False):
         raise ValueError("q must be between 0 and 1")
 
     survival_functions = pd.DataFrame(survival_functions)
+    values = survival_functions.values
+    times = survival_functions.index.values
+    n = values.shape[0]
+
+    positions = _qth_survival_positions(q.values, values, cdf=cdf)
+    never_crossed = positions == n
+    # with cdf=True, the cdf can already be above q at the first time.
+    crossed_before_start = (values[:1] > q.values[:, None]) if cdf else np.zeros_like(never_crossed)
+
+    if never_crossed.any() or crossed_before_start.any():
+        survival_times = np.append(times.astype(float), np.inf)[positions]
+        survival_times[crossed_before_start] = -np.inf
+    else:
+        # keep the dtype of the times, ex: ints.
+        survival_times = times[positions]
 
     if survival_functions.shape[1] == 1 and q.shape == (1,):
-        q = q[0]
-        # If you add print statements to `qth_survival_time`, you'll see it's called
-        # once too many times. This is expected Pandas behavior
-        # https://stackoverflow.com/questions/21635915/why-does-pandas-apply-calculate-twice
-        return survival_functions.apply(lambda s: qth_survival_time(q, s, cdf=cdf)).iloc[0]
+        return survival_times[0, 0]
     else:
-        d = {_q: survival_functions.apply(lambda s: qth_survival_time(_q, s, cdf=cdf)) for _q in q}
-        survival_times = pd.DataFrame(d).T
+        return pd.DataFrame(survival_times, index=q.values, columns=survival_functions.columns)
 
-        #  Typically, one would expect that the output should equal the "height" of q.
-        #  An issue can arise if the Series q contains duplicate values. We solve
-        #  this by duplicating the entire row.
-        if q.duplicated().any():
-            survival_times = survival_times.loc[q]
 
-        return survival_times
+def _qth_survival_positions(q, values, cdf=False):
+    """
+    For each q, and each column of values, the position of the first row where the survival function is at or
+    below q (or, if cdf, the cdf is at or above q). If a column never crosses q, the position is the number of
+    rows. The columns don't need to be monotone, ex: the survival functions of ``AalenAdditiveFitter``.
+
+    Returns
+    -------
+    positions: (len(q), d) numpy array
+    """
+    n, d = values.shape
+    positions = np.empty((q.shape[0], d), dtype=int)
+    for i, q_ in enumerate(q):
+        crossed = values >= q_ if cdf else values <= q_
+        positions[i] = crossed.argmax(0)
+        positions[i, ~crossed.any(0)] = n
+    return positions
 
 
 def qth_survival_time(q, survival_function, cdf=False):
@@ -707,6 +734,176 @@ def k_fold_cross_validation(
     return fitterscores
 
 
+def parallel_k_fold_cross_validation(
+    fitters,
+    df,
+    duration_col,
+    event_col=None,
+    k=5,
+    n_repeats=1,
+    stratify=True,
+    evaluation_measure=concordance_index,
+    predictor="predict_expectation",
+    predictor_kwargs={},
+    fitter_kwargs={},
+    n_jobs=1,
+    seed=None,
+):  # pylint: disable=dangerous-default-value,too-many-arguments,too-many-locals
+    """
+    Perform (repeated) k-fold cross validation of one or several fitters, with each (fitter, fold) pair
+    fit in parallel on a pool of processes. Unlike ``k_fold_cross_validation``, the fit and predict
+    times of each fold are recorded too.
+
+    The workers are given the DataFrame once, when they start, rather than with each job. On platforms that
+    fork new processes (ex: Linux), the DataFrame isn't copied at all until a fold is taken from it.
+
+    Parameters
+    ----------
+    fitters: model
+      one or several objects which possess a method: ``fit(self, data, duration_col, event_col)``.
+      See ``k_fold_cross_validation``.
+    df: DataFrame
+      a Pandas DataFrame with necessary columns `duration_col` and (optional) `event_col`, plus
+      other covariates.
+    duration_col: string
+      the column in DataFrame that contains the subjects lifetimes.
+    event_col: string, optional
+      the column in DataFrame that contains the subject's death observation. If left
+      as None, assumes all individuals are non-censored.
+    k: int
+      the number of folds to perform. n/k data will be withheld for testing on.
+    n_repeats: int, optional (default=1)
+      the number of times to repeat the k-fold cross validation, each time with a new random split of the data.
+    stratify: boolean, optional (default=True)
+      if True, each fold has the same proportion of observed events.
+    evaluation_measure: function
+      a function that accepts either (event_times, predicted_event_times),
+      or (event_times, predicted_event_times, event_observed). See ``k_fold_cross_validation``.
+    predictor: string
+      a string that matches a prediction method on the fitter instances.
+      Default is "predict_expectation"
+    predictor_kwargs:
+      keyword args to pass into predictor-method.
+    fitter_kwargs:
+      keyword args to pass into fitter.fit method
+    n_jobs: int, optional (default=1)
+      the number of processes to use. Use -1 to use all CPUs.
+    seed: int, optional
+      the seed of the random splits.
+
+    Returns
+    -------
+    results: DataFrame
+      one row per fitter, repeat and fold, with the ``score``, and the ``fit_time`` and ``predict_time`` in
+      seconds. The ``fitter`` column is the position of the fitter in ``fitters``.
+
+    Examples
+    --------
+    >>> from lifelines import CoxPHFitter, WeibullAFTFitter
+    >>> from lifelines.datasets import load_rossi
+    >>> from lifelines.utils import parallel_k_fold_cross_validation
+    >>>
+    >>> results = parallel_k_fold_cross_validation(
+    >>>     [CoxPHFitter(), WeibullAFTFitter()], load_rossi(), 'week', 'arrest', k=10, n_repeats=3, n_jobs=-1
+    >>> )
+    >>> results.groupby("fitter")[["score", "fit_time"]].mean()
+
+    """
+    try:
+        fitters = list(fitters)
+    except TypeError:
+        fitters = [fitters]
+
+    if k < 2:
+        raise ValueError("k must be >= 2.")
+    if n_repeats < 1:
+        raise ValueError("n_repeats must be >= 1.")
+    n_jobs = _effective_n_jobs(n_jobs)
+
+    if event_col is None:
+        event_col = "E"
+        df = df.assign(**{event_col: 1.0})
+
+    random_state = np.random.RandomState(seed)
+    E = df[event_col].values
+    n, _ = df.shape
+
+    # folds[r, j] is the fold of the jth row in the rth repeat.
+    folds = np.empty((n_repeats, n), dtype=int)
+    for repeat in range(n_repeats):
+        order = random_state.permutation(n)
+        if stratify:
+            # dealing the rows out in order of their event, so each fold gets its share of events.
+            order = order[np.argsort(E[order], kind="mergesort")]
+        folds[repeat, order] = np.arange(n) % k
+
+    state = {
+        "fitters": fitters,
+        "df": df,
+        "duration_col": duration_col,
+        "event_col": event_col,
+        "folds": folds,
+        "evaluation_measure": evaluation_measure,
+        "predictor": predictor,
+        "predictor_kwargs": predictor_kwargs,
+        "fitter_kwargs": fitter_kwargs,
+    }
+    jobs = [(i, repeat, fold) for repeat in range(n_repeats) for fold in range(k) for i in range(len(fitters))]
+
+    if n_jobs == 1:
+        results = [_cross_validation_job(job, state) for job in jobs]
+    else:
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+        pool = context.Pool(min(n_jobs, len(jobs)), initializer=_init_cross_validation_worker, initargs=(state,))
+        try:
+            results = pool.map(_cross_validation_job, jobs, chunksize=1)
+        finally:
+            pool.terminate()
+
+    results = pd.DataFrame(results, columns=["fitter", "repeat", "fold", "score", "fit_time", "predict_time"])
+    return results.sort_values(["fitter", "repeat", "fold"]).reset_index(drop=True)
+
+
+# the state of parallel_k_fold_cross_validation, set once when each worker process starts.
+_CROSS_VALIDATION_STATE = {}
+
+
+def _init_cross_validation_worker(state):
+    _CROSS_VALIDATION_STATE.update(state)
+
+
+def _cross_validation_job(job, state=None):
+    state = state if state is not None else _CROSS_VALIDATION_STATE
+    i, repeat, fold = job
+    df, duration_col, event_col = state["df"], state["duration_col"], state["event_col"]
+    fitter = state["fitters"][i]
+
+    ix = state["folds"][repeat] == fold
+    training_data = df.loc[~ix]
+    testing_data = df.loc[ix]
+
+    T_actual = testing_data[duration_col].values
+    E_actual = testing_data[event_col].values
+    X_testing = testing_data.drop([duration_col, event_col], axis=1)
+
+    start = time.perf_counter()
+    fitter.fit(training_data, duration_col=duration_col, event_col=event_col, **state["fitter_kwargs"])
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    T_pred = getattr(fitter, state["predictor"])(X_testing, **state["predictor_kwargs"]).values
+    predict_time = time.perf_counter() - start
+
+    try:
+        score = state["evaluation_measure"](T_actual, T_pred, E_actual)
+    except TypeError:
+        score = state["evaluation_measure"](T_actual, T_pred)
+    return i, repeat, fold, score, fit_time, predict_time
+
+
 def normalize(X, mean=None, std=None):
     """
     Normalize X. If mean OR std is None, normalizes
@@ -933,6 +1130,10 @@ def check_positivity(array):
 
 
 def _low_var(df):
+    if _has_sparse_columns(df):
+        # pandas would make the columns dense to compute their variance.
+        _, var = _sparse_mean_var(_to_sparse_matrix(df))
+        return pd.Series(var < 1e-4, index=df.columns)
     return df.var(0) < 1e-4
 
 
@@ -952,9 +1153,15 @@ if convergence fails.%s"
 def check_complete_separation_low_variance(df, events, event_col):
 
     events = events.astype(bool)
-    deaths_only = df.columns[_low_var(df.loc[events])]
-    censors_only = df.columns[_low_var(df.loc[~events])]
-    total = df.columns[_low_var(df)]
+    if _has_sparse_columns(df):
+        X, events = _to_sparse_matrix(df), events.values
+        deaths_only = df.columns[_sparse_mean_var(X[events])[1] < 1e-4]
+        censors_only = df.columns[_sparse_mean_var(X[~events])[1] < 1e-4]
+        total = df.columns[_sparse_mean_var(X)[1] < 1e-4]
+    else:
+        deaths_only = df.columns[_low_var(df.loc[events])]
+        censors_only = df.columns[_low_var(df.loc[~events])]
+        total = df.columns[_low_var(df)]
     problem_columns = censors_only.union(deaths_only).difference(total).tolist()
     if problem_columns:
         warning_text = """Column {cols} have very low variance when conditioned on death event present or not. This may harm convergence. This could be a form of 'complete separation'. For example, try the following code:
@@ -1002,6 +1209,15 @@ def check_complete_separation(df, events, durations, event_col):
 
 
 def check_nans_or_infs(df_or_array):
+    if isinstance(df_or_array, pd.DataFrame) and _has_sparse_columns(df_or_array):
+        for _, series in df_or_array.iteritems():
+            check_nans_or_infs(series)
+        return None
+
+    if isinstance(df_or_array, pd.Series) and pd.api.types.is_sparse(df_or_array):
+        # only check the stored values, so the column isn't made dense.
+        return check_nans_or_infs(np.append(df_or_array.values.sp_values, df_or_array.values.fill_value))
+
     if isinstance(df_or_array, (pd.Series, pd.DataFrame)):
         return check_nans_or_infs(df_or_array.values)
 
@@ -1398,6 +1614,102 @@ class StepSizer:
         return self.step_size
 
 
+def _get_thread_pool(n_jobs):
+    """
+    Returns a thread pool with ``n_jobs`` workers, or None if ``n_jobs`` is 1. Use ``n_jobs=-1`` for all CPUs.
+
+    Threads share memory, so the data is not copied (or pickled) to the workers, and numpy
+    releases the GIL for most numerical operations.
+    """
+    n_jobs = _effective_n_jobs(n_jobs)
+    if n_jobs == 1:
+        return None
+    return ThreadPoolExecutor(max_workers=n_jobs)
+
+
+def _effective_n_jobs(n_jobs):
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if not isinstance(n_jobs, int) or n_jobs < 1:
+        raise ValueError("n_jobs must be a positive integer, or -1 to use all CPUs.")
+    return n_jobs
+
+
+def _contiguous_strata(index):
+    """
+    Yields ``(stratum, start, stop)`` for each stratum in ``index``, such that rows ``start:stop`` belong to the stratum.
+    The index must be sorted so that each stratum is a contiguous block of rows. Like ``groupby``, null strata are skipped.
+    """
+    codes, _ = pd.factorize(index)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    stops = np.r_[starts[1:], codes.shape[0]]
+    for start, stop in zip(starts, stops):
+        if codes[start] != -1:
+            yield index[start], start, stop
+
+
+def _has_sparse_columns(df):
+    return any(pd.api.types.is_sparse(dtype) for dtype in df.dtypes)
+
+
+def _to_sparse_matrix(df):
+    """
+    Converts a DataFrame, with some sparse columns, to a scipy CSR matrix without making the sparse columns dense.
+    """
+    rows, columns, values = [np.zeros(0, dtype=int)], [np.zeros(0, dtype=int)], [np.zeros(0)]
+    for j, (_, series) in enumerate(df.iteritems()):
+        if pd.api.types.is_sparse(series) and series.values.fill_value == 0:
+            row = series.values.sp_index.to_int_index().indices
+            value = series.values.sp_values
+        else:
+            value = np.asarray(series, dtype=float)
+            row = np.flatnonzero(value)
+            value = value[row]
+        rows.append(row)
+        columns.append(np.full(row.shape[0], j))
+        values.append(value)
+
+    return sparse.csr_matrix(
+        (np.concatenate(values).astype(float), (np.concatenate(rows), np.concatenate(columns))), shape=df.shape
+    )
+
+
+def _sparse_mean_var(X):
+    """
+    Column means and (sample) variances of a scipy sparse matrix.
+    """
+    n = X.shape[0]
+    mean = np.asarray(X.mean(0)).ravel()
+    var = (np.asarray(X.multiply(X).sum(0)).ravel() - n * mean ** 2) / (n - 1)
+    return mean, var
+
+
+def _take_rows(df, positions):
+    """
+    Like ``df.iloc[positions]``, but the sparse columns are reordered together as a scipy matrix. pandas looks up
+    the rows of each sparse column separately, which is very slow for many sparse columns.
+    """
+    is_sparse = [pd.api.types.is_sparse(dtype) and dtype.fill_value == 0 for dtype in df.dtypes]
+    if not any(is_sparse):
+        return df.iloc[positions]
+
+    sparse_columns = df.columns[is_sparse]
+    X = _to_sparse_matrix(df[sparse_columns]).tocsr()[positions].tocsc()
+    X.sort_indices()
+
+    taken = {}
+    for j, column in enumerate(sparse_columns):
+        # one dense column at a time, so memory is bounded by the number of rows.
+        dtype = df[column].dtype
+        values = np.zeros(X.shape[0], dtype=dtype.subtype)
+        values[X.indices[X.indptr[j] : X.indptr[j + 1]]] = X.data[X.indptr[j] : X.indptr[j + 1]]
+        taken[column] = pd.SparseArray(values, fill_value=dtype.fill_value)
+
+    dense = df.iloc[positions, [j for j, sparse_ in enumerate(is_sparse) if not sparse_]]
+    taken = pd.DataFrame(taken, index=dense.index, columns=sparse_columns)
+    return pd.concat([dense, taken], axis=1)[df.columns]
+
+
 def _to_array(x):
     if not isinstance(x, collections.Iterable):
         return np.array([x])
@@ -7,6 +7,7 @@ from lifelines import CoxPHFitter
 import statsmodels.api as sm
 
 # This compares the batch algorithm (in CTV) vs the single iteration algorithm (original in CPH)
+# vs the vectorized algorithm (the default in CPH)
 # N vs (% ties == unique(T) / N)
 
 
@@ -41,10 +42,22 @@ for n_copies in [1, 2, 4, 6, 8, 10, 13, 17, 20, 25]:
             cph_single.fit(df, "week", "arrest", batch_mode=False)
             single_results.append(time() - start_time)
 
+        vectorized_results = []
+        for _ in range(3):
+            cph_vectorized = CoxPHFitter()
+            start_time = time()
+            cph_vectorized.fit(df, "week", "arrest", batch_mode=None)
+            vectorized_results.append(time() - start_time)
+
         batch_time = min(batch_results)
         single_time = min(single_results)
-        print({"batch": batch_time, "single": single_time})
-        results[(n_copies * ROSSI_ROWS, fraction)] = {"batch": batch_time, "single": single_time}
+        vectorized_time = min(vectorized_results)
+        print({"batch": batch_time, "single": single_time, "vectorized": vectorized_time})
+        results[(n_copies * ROSSI_ROWS, fraction)] = {
+            "batch": batch_time,
+            "single": single_time,
+            "vectorized": vectorized_time,
+        }
 
 results = pd.DataFrame(results).T.sort_index()
 results = results.reset_index()
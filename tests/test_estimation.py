@@ -16,6 +16,8 @@ import numpy as np
 import pandas as pd
 import pytest
 from scipy.stats import weibull_min, norm, logistic
+from scipy.integrate import trapz
+from scipy import sparse
 
 from flaky import flaky
 
@@ -248,6 +250,34 @@ class TestParametricUnivariateFitters:
             assert f.confidence_interval_survival_function_ is not None
             assert f.confidence_interval_hazard_ is not None
 
+    def test_confidence_intervals_are_the_same_as_the_intervals_of_the_transforms(
+        self, positive_sample_lifetimes, known_parametric_univariate_fitters
+    ):
+        T, E = positive_sample_lifetimes
+        for fitter in known_parametric_univariate_fitters:
+            f = fitter().fit(T, E)
+            for ci, transform in [
+                (f.confidence_interval_cumulative_hazard_, f._cumulative_hazard),
+                (f.confidence_interval_hazard_, f._hazard),
+                (f.confidence_interval_survival_function_, f._survival_function),
+                (f.confidence_interval_cumulative_density_, f._cumulative_density),
+            ]:
+                expected = f._compute_confidence_bounds_of_transform(transform, f.alpha, None)
+                assert_frame_equal(ci, expected, check_less_precise=3)
+
+    def test_jacobians_of_the_confidence_intervals_are_computed_once_per_fit(self, positive_sample_lifetimes):
+        T, E = positive_sample_lifetimes
+        wf = WeibullFitter().fit(T, E)
+        jacobians = wf._jacobians_on_timeline()
+        wf.confidence_interval_survival_function_
+        wf.confidence_interval_hazard_
+        assert wf._jacobians_on_timeline() is jacobians
+        assert jacobians["cumulative_hazard_"].shape == (2, wf.timeline.shape[0])
+
+        wf.fit(T, E, timeline=[0.0, 1.0, 2.0])
+        assert wf._jacobians_on_timeline() is not jacobians
+        assert wf.confidence_interval_.shape == (3, 2)
+
     def test_warnings_for_problematic_cumulative_hazards(self):
         class NegativeFitter(ParametericUnivariateFitter):
 
@@ -269,6 +299,143 @@ class TestParametricUnivariateFitters:
         with pytest.warns(StatisticalWarning, match="non-decreasing") as w:
             DecreasingFitter().fit([0.01, 0.5, 10.0, 20])
 
+    @pytest.mark.parametrize("fitter", [ExponentialFitter, WeibullFitter, LogNormalFitter, LogLogisticFitter])
+    def test_closed_form_derivatives_are_the_same_as_autograd(self, fitter):
+        from autograd import value_and_grad, hessian
+
+        np.random.seed(10)
+        T = np.random.exponential(2, size=100)
+        E = np.random.rand(100) < 0.7
+        entry = np.where(np.random.rand(100) < 0.3, np.random.rand(100) * T, 0)
+        W = np.random.randint(1, 5, size=100).astype(float)
+
+        f = fitter()
+        assert f._has_closed_form_derivatives()
+        params = f._initial_values + 0.3
+        args = ((T, None), E, entry, W)
+
+        value, gradient, hessian_ = f._negative_log_likelihood_right_censoring_and_derivatives(params, *args)
+        expected_value, expected_gradient = value_and_grad(f._negative_log_likelihood_right_censoring)(params, *args)
+        npt.assert_allclose(value, expected_value)
+        npt.assert_allclose(gradient, expected_gradient)
+        npt.assert_allclose(hessian_, hessian(f._negative_log_likelihood_right_censoring)(params, *args))
+
+    def test_subclasses_that_change_the_hazard_use_autograd(self, positive_sample_lifetimes):
+        class ShiftedWeibullFitter(WeibullFitter):
+            def _cumulative_hazard(self, params, times):
+                lambda_, rho_ = params
+                return ((times + 1) / lambda_) ** rho_ - (1 / lambda_) ** rho_
+
+        assert not ShiftedWeibullFitter()._has_closed_form_derivatives()
+        assert not PiecewiseExponentialFitterTesting()._has_closed_form_derivatives()
+        ShiftedWeibullFitter().fit(positive_sample_lifetimes[0])
+
+    def test_compressing_duplicate_rows_does_not_change_the_likelihood(self, known_parametric_univariate_fitters):
+        np.random.seed(10)
+        n = 500
+        T = np.random.randint(1, 20, size=n).astype(float)
+        E = np.random.rand(n) < 0.7
+        entry = np.where(np.random.rand(n) < 0.3, 0.5, 0)
+        W = np.random.randint(1, 3, size=n).astype(float)
+        df = load_diabetes()
+        interval_E = (df["left"] == df["right"]).values
+
+        for fitter in known_parametric_univariate_fitters:
+            f = fitter()
+            params = f._initial_values + 0.1
+            for nll, Ts, E_, entry_, W_ in [
+                (f._negative_log_likelihood_right_censoring, (T, None), E, entry, W),
+                (f._negative_log_likelihood_left_censoring, (None, T), E, entry, W),
+                (
+                    f._negative_log_likelihood_interval_censoring,
+                    (df["left"].values.clip(1e-20), df["right"].values),
+                    interval_E,
+                    np.zeros(df.shape[0]),
+                    np.ones(df.shape[0]),
+                ),
+            ]:
+                compressed = f._compress(Ts, E_, entry_, W_)
+                assert compressed[1].shape[0] < E_.shape[0]
+                assert compressed[3].sum() == W_.sum()
+                npt.assert_allclose(nll(params, *compressed), nll(params, Ts, E_, entry_, W_))
+
+    def test_compressed_fit_is_the_same_as_a_weighted_fit(self):
+        T = np.array([1, 1, 1, 2, 2, 3, 3, 3, 3, 4, 5, 5])
+        E = np.array([1, 1, 0, 1, 1, 1, 0, 0, 1, 1, 1, 0])
+        wf = WeibullFitter().fit(T, E)
+
+        unique_T = np.array([1, 1, 2, 3, 3, 4, 5, 5])
+        unique_E = np.array([1, 0, 1, 1, 0, 1, 1, 0])
+        weights = np.array([2, 1, 2, 2, 2, 1, 1, 1])
+        weighted_wf = WeibullFitter().fit(unique_T, unique_E, weights=weights)
+
+        npt.assert_allclose(wf._fitted_parameters_, weighted_wf._fitted_parameters_, rtol=1e-5)
+        npt.assert_allclose(wf._log_likelihood, weighted_wf._log_likelihood, rtol=1e-5)
+        npt.assert_allclose(wf.variance_matrix_, weighted_wf.variance_matrix_, rtol=1e-4)
+
+    def test_default_timeline_is_bounded_and_estimates_are_lazy(self, known_parametric_univariate_fitters):
+        T = np.random.exponential(2, size=5000)
+        for fitter in known_parametric_univariate_fitters:
+            f = fitter().fit(T)
+            assert f.timeline.shape[0] == f._TIMELINE_RESOLUTION
+            assert f.timeline[0] == T.min() and f.timeline[-1] == T.max()
+            assert f._estimates == {}
+
+            assert_frame_equal(f.survival_function_, f.survival_function_at_times(f.timeline).to_frame())
+            assert_frame_equal(f.cumulative_hazard_, f.cumulative_hazard_at_times(f.timeline).to_frame())
+            assert set(f._estimates) == {"survival_function_", "cumulative_hazard_"}
+            assert f.survival_function_ is f.survival_function_
+
+            f._TIMELINE_RESOLUTION = 50
+            f.fit(T)
+            assert f.timeline.shape[0] == 50
+            assert f.hazard_.shape[0] == 50
+
+    def test_fit_groups_is_the_same_as_fitting_each_group(self, known_parametric_univariate_fitters):
+        np.random.seed(10)
+        n = 600
+        groups = np.random.choice(["a", "b", "c"], size=n)
+        scales = pd.Series({"a": 1.0, "b": 5.0, "c": 20.0})[groups].values
+        T = scales * np.random.weibull(1.5, size=n)
+        E = np.random.rand(n) < 0.8
+
+        for fitter in known_parametric_univariate_fitters:
+            summary = fitter().fit_groups(T, E, groups)
+            assert summary["converged"].all()
+            assert summary.index.get_level_values("group").unique().tolist() == ["a", "b", "c"]
+
+            for group in ["a", "b", "c"]:
+                f = fitter().fit(T[groups == group], E[groups == group])
+                npt.assert_allclose(summary.loc[group, "coef"].values, f.summary["coef"].values, rtol=1e-3)
+                npt.assert_allclose(summary.loc[group, "se(coef)"].values, f.summary["se(coef)"].values, rtol=1e-2)
+                npt.assert_allclose(summary.loc[group, "log-likelihood"].values, f._log_likelihood, rtol=1e-4)
+
+    def test_fit_groups_converges_with_large_durations(self):
+        np.random.seed(10)
+        n_groups, n = 200, 4000
+        groups = np.random.randint(n_groups, size=n)
+        scales = np.exp(np.random.uniform(8, 10, size=n_groups))[groups]
+        T = scales * np.random.weibull(1.5, size=n)
+        E = np.random.rand(n) < 0.8
+
+        summary = WeibullFitter().fit_groups(T, E, groups)
+        assert summary["converged"].all()
+        for group in [0, 1, 2]:
+            wf = WeibullFitter().fit(T[groups == group], E[groups == group])
+            npt.assert_allclose(summary.loc[group, "coef"].values, wf._fitted_parameters_, rtol=1e-3)
+            assert summary.loc[group, "log-likelihood"].values[0] >= wf._log_likelihood - 1e-6
+
+    def test_fit_groups_warns_for_groups_that_dont_converge(self):
+        T = np.array([1.0, 2.0, 3.0, 4.0, 1.0, 2.0, 3.0])
+        E = np.array([1, 1, 0, 1, 0, 0, 0])
+        groups = np.array([1, 1, 1, 1, 2, 2, 2])
+
+        with pytest.warns(ConvergenceWarning, match="1 of 2 groups did not converge within max_steps=100"):
+            summary = ExponentialFitter().fit_groups(T, E, groups)
+        assert summary.loc[1, "converged"].all()
+        assert not summary.loc[2, "converged"].any()
+        npt.assert_allclose(summary.loc[1, "coef"].values, ExponentialFitter().fit(T[:4], E[:4]).lambda_, rtol=1e-5)
+
     def test_parameteric_models_all_can_do_interval_censoring(self, known_parametric_univariate_fitters):
         df = load_diabetes()
         for fitter in known_parametric_univariate_fitters:
@@ -1657,6 +1824,38 @@ class TestAFTFitters:
         for model in models:
             model.fit_left_censoring(df, "T", "E")
 
+    @pytest.mark.parametrize("ancillary_df", [False, True])
+    def test_to_scorer_is_the_same_as_predict(self, models, rossi, ancillary_df):
+        X = rossi.drop(["week", "arrest"], axis=1).iloc[:5]
+
+        for fitter in models:
+            fitter.fit(rossi, "week", "arrest", ancillary_df=ancillary_df)
+            scorer = fitter.to_scorer()
+            x = X[list(scorer.columns)].values
+            ancillary_x = X[list(scorer.ancillary_columns)].values if ancillary_df else None
+            ancillary_X = X if ancillary_df else None
+
+            npt.assert_allclose(
+                scorer.predict_survival_function(x, ancillary_X=ancillary_x),
+                fitter.predict_survival_function(X, ancillary_X=ancillary_X).values,
+            )
+            npt.assert_allclose(
+                scorer.predict_percentile(x, ancillary_X=ancillary_x, p=0.8),
+                fitter.predict_percentile(X, ancillary_X=ancillary_X, p=0.8)[0].values,
+            )
+            npt.assert_allclose(
+                scorer.predict_expectation(x, ancillary_X=ancillary_x),
+                fitter.predict_expectation(X, ancillary_X=ancillary_X)[0].values,
+            )
+
+    def test_scorer_is_immutable(self, models, rossi):
+        for fitter in models:
+            scorer = fitter.fit(rossi, "week", "arrest").to_scorer()
+            with pytest.raises(AttributeError):
+                scorer.timeline = None
+            with pytest.raises(ValueError):
+                scorer.timeline[0] = 0
+
 
 class TestLogNormalAFTFitter:
     @pytest.fixture
@@ -1699,6 +1898,13 @@ class TestLogLogisticAFTFitter:
         npt.assert_allclose(aft.summary.loc[("beta_", "prio"), "coef"], 0.02707661, rtol=1e-2)
         npt.assert_allclose(aft.summary.loc[("beta_", "age"), "coef"], -0.03853006, rtol=1e-1)
 
+    def test_survival_function_at_predicted_percentile_is_p(self, aft, rossi):
+        aft.fit(rossi, "week", "arrest")
+        X = rossi.drop(["week", "arrest"], axis=1).iloc[:5]
+        percentiles = aft.predict_percentile(X, p=0.8)[0].values
+        survival = aft.predict_survival_function(X, times=percentiles).values
+        npt.assert_allclose(np.diag(survival), 0.8)
+
     def test_proportional_odds(self, aft, rossi):
 
         aft.fit(rossi, "week", "arrest")
@@ -2159,6 +2365,14 @@ class TestCoxPHFitter:
         )
         assert_frame_equal(results, expected, check_less_precise=3)
 
+    def test_schoenfeld_residuals_with_strata_without_deaths(self, rossi, cph):
+        rossi.loc[rossi["race"] == 0, "arrest"] = 0
+
+        cph.fit(rossi, "week", "arrest", strata=["race"])
+        results = cph.compute_residuals(rossi, "schoenfeld")
+        assert results.shape == (rossi["arrest"].sum(), rossi.shape[1] - 3)
+        assert results.index.isin(rossi.index[rossi["race"] == 1]).all()
+
     def test_schoenfeld_residuals_with_first_subjects_censored(self, rossi, cph):
         rossi.loc[rossi["week"] == 1, "arrest"] = 0
 
@@ -2402,6 +2616,298 @@ Log-likelihood ratio test = 33.27 on 7 df, -log2(p)=15.37
         beta = beta + u / l[0]
         assert np.abs(beta - -0.0335) < 0.01
 
+    @pytest.mark.parametrize("tie_method", ["Efron", "Breslow"])
+    def test_vectorized_efron_agrees_with_batch_and_single(self, rossi, cph, tie_method):
+        cph.tie_method = tie_method
+        rossi = rossi.sort_values("week")
+        X = rossi.drop(["week", "arrest"], axis=1)
+        X = normalize(X, X.mean(0), X.std(0)).values
+        T = rossi["week"].values.astype(float)
+        E = rossi["arrest"].values.astype(bool)
+        weights = np.random.uniform(0.5, 2.0, size=T.shape[0])
+        beta = 0.1 * np.random.randn(X.shape[1])
+
+        h_v, g_v, ll_v = cph._get_efron_values_vectorized(X, T, E, weights, beta)
+        for algorithm in [cph._get_efron_values_batch, cph._get_efron_values_single]:
+            h, g, ll = algorithm(X, T, E, weights, beta)
+            npt.assert_allclose(h_v, h)
+            npt.assert_allclose(g_v, g, atol=1e-10)
+            npt.assert_allclose(ll_v, ll)
+
+    def test_breslow_is_the_same_as_efron_without_ties(self, regression_dataset):
+        efron = CoxPHFitter(tie_method="Efron").fit(regression_dataset, "T", "E")
+        breslow = CoxPHFitter(tie_method="Breslow").fit(regression_dataset, "T", "E")
+        assert_frame_equal(breslow.summary, efron.summary, check_less_precise=True)
+
+    @pytest.mark.parametrize("batch_mode", [None, True, False])
+    def test_breslow_log_likelihood_ratio_test_against_trivial_log_likelihood(self, rossi, batch_mode):
+        cph = CoxPHFitter(tie_method="Breslow").fit(rossi, "week", "arrest", batch_mode=batch_mode)
+        expected = cph.log_likelihood_ratio_test().test_statistic
+        del cph._log_likelihood_null
+        npt.assert_allclose(cph.log_likelihood_ratio_test().test_statistic, expected)
+
+    def test_unknown_tie_method_raises(self):
+        with pytest.raises(NotImplementedError):
+            CoxPHFitter(tie_method="Exact")
+
+    def test_vectorized_efron_with_no_deaths(self, cph):
+        X = np.random.randn(5, 2)
+        T = np.arange(5.0)
+        E = np.zeros(5, dtype=bool)
+        h, g, ll = cph._get_efron_values_vectorized(X, T, E, np.ones(5), np.zeros(2))
+        npt.assert_allclose(h, np.zeros((2, 2)))
+        npt.assert_allclose(g, np.zeros(2))
+        assert ll == 0
+
+    def test_strata_in_parallel_is_the_same_as_serial(self, rossi, cph):
+        cph.fit(rossi, "week", "arrest", strata=["race", "paro", "mar", "wexp"], robust=True)
+        expected = cph.summary
+
+        cph.fit(rossi, "week", "arrest", strata=["race", "paro", "mar", "wexp"], robust=True, n_jobs=-1)
+        assert_frame_equal(cph.summary, expected)
+        assert cph._executor is None
+
+    def test_strata_partitions_are_views_of_the_sorted_data(self, rossi, cph):
+        cph.strata = ["race", "wexp"]
+        cph.duration_col, cph.event_col, cph.weights_col, cph.cluster_col = "week", "arrest", None, None
+        cph._n_examples = rossi.shape[0]
+        X, T, E, W, _, _ = cph._preprocess_dataframe(rossi)
+
+        partitions = list(cph._partition_by_strata(X, T, E, W))
+        assert [stratum for _, stratum in partitions] == [stratum for stratum, _ in X.groupby(cph.strata)]
+        for (stratified_X, stratified_T, _, _), stratum in partitions:
+            assert np.shares_memory(stratified_X, X.values)
+            npt.assert_array_equal(stratified_X, X.loc[[stratum]].values)
+            npt.assert_array_equal(stratified_T, T.loc[[stratum]].values)
+
+    def test_n_jobs_must_be_positive_or_negative_one(self, rossi, cph):
+        with pytest.raises(ValueError):
+            cph.fit(rossi, "week", "arrest", strata=["race"], n_jobs=0)
+
+    def test_fit_path_is_the_same_as_fitting_each_penalizer(self, rossi, cph):
+        penalizers = [10.0, 1.0, 0.1, 0.0]
+        path = cph.fit_path(rossi, "week", "arrest", penalizers=penalizers, strata=["race"])
+        assert path.index.tolist() == penalizers
+        assert cph.penalizer == 0.0
+        assert not hasattr(cph, "hazards_")
+
+        for penalizer in penalizers:
+            fitted = CoxPHFitter(penalizer=penalizer).fit(rossi, "week", "arrest", strata=["race"])
+            npt.assert_allclose(path.loc[penalizer, fitted.hazards_.index], fitted.hazards_, atol=1e-5)
+            npt.assert_allclose(path.loc[penalizer, "log-likelihood"], fitted._log_likelihood)
+
+    def test_fit_path_warm_starts_need_fewer_iterations(self, rossi, cph):
+        penalizers = np.logspace(1, -2, 10)
+        path = cph.fit_path(rossi, "week", "arrest", penalizers=penalizers)
+        cold_iterations = [
+            len(CoxPHFitter(penalizer=penalizer).fit(rossi, "week", "arrest").path) for penalizer in penalizers
+        ]
+        assert path["iterations"].sum() < sum(cold_iterations)
+
+    def test_fit_path_with_negative_penalizer_raises(self, rossi, cph):
+        with pytest.raises(ValueError):
+            cph.fit_path(rossi, "week", "arrest", penalizers=[1.0, -1.0])
+
+    @pytest.mark.parametrize("chunksize", [1, 7, 1000])
+    def test_fit_chunks_is_the_same_as_fit(self, rossi, chunksize):
+        rossi["weights"] = np.random.uniform(0.5, 2.0, size=rossi.shape[0])
+        sorted_rossi = rossi.sort_values("week", ascending=False)
+
+        def chunks():
+            return (sorted_rossi.iloc[i : i + chunksize] for i in range(0, sorted_rossi.shape[0], chunksize))
+
+        expected = CoxPHFitter().fit(rossi, "week", "arrest", weights_col="weights")
+        cph = CoxPHFitter().fit_chunks(chunks, "week", "arrest", weights_col="weights")
+
+        assert_frame_equal(cph.summary, expected.summary, check_less_precise=True)
+        npt.assert_allclose(cph._log_likelihood, expected._log_likelihood)
+        npt.assert_allclose(
+            cph.log_likelihood_ratio_test().test_statistic, expected.log_likelihood_ratio_test().test_statistic
+        )
+        assert_frame_equal(cph.baseline_survival_, expected.baseline_survival_, check_names=False)
+        assert_frame_equal(cph.predict_survival_function(rossi), expected.predict_survival_function(rossi))
+
+    def test_fit_chunks_with_unsorted_chunks_raises(self, rossi, cph):
+        with pytest.raises(ValueError):
+            cph.fit_chunks(lambda: [rossi.iloc[:200], rossi.iloc[200:]], "week", "arrest")
+
+    def test_fit_chunks_with_an_iterator_raises(self, rossi, cph):
+        with pytest.raises(TypeError):
+            cph.fit_chunks(iter([rossi.sort_values("week", ascending=False)]), "week", "arrest")
+
+    @pytest.mark.parametrize("tie_method", ["Efron", "Breslow"])
+    def test_compress_is_the_same_as_not_compressing(self, rossi, tie_method):
+        rossi = rossi[["week", "arrest", "fin", "race", "wexp", "mar", "paro"]]
+        rossi = pd.concat([rossi, rossi.iloc[:100]], ignore_index=True)
+        rossi["weights"] = np.random.randint(1, 3, size=rossi.shape[0])
+
+        for strata in [None, ["wexp"]]:
+            expected = CoxPHFitter(tie_method=tie_method).fit(
+                rossi, "week", "arrest", weights_col="weights", strata=strata
+            )
+            cph = CoxPHFitter(tie_method=tie_method).fit(
+                rossi, "week", "arrest", weights_col="weights", strata=strata, compress=True
+            )
+            assert_frame_equal(cph.summary, expected.summary, check_less_precise=True)
+            npt.assert_allclose(cph._log_likelihood, expected._log_likelihood)
+            assert_frame_equal(cph.baseline_cumulative_hazard_, expected.baseline_cumulative_hazard_)
+            assert cph.score_ == expected.score_
+            assert_frame_equal(
+                cph.compute_residuals(rossi, "martingale"), expected.compute_residuals(rossi, "martingale")
+            )
+
+    def test_compress_with_robust_raises(self, rossi, cph):
+        with pytest.raises(ValueError):
+            cph.fit(rossi, "week", "arrest", robust=True, compress=True)
+
+    @pytest.mark.parametrize("tie_method", ["Efron", "Breslow"])
+    def test_sparse_columns_are_the_same_as_dense_columns(self, rossi, tie_method):
+        rossi = rossi[["week", "arrest", "fin", "age", "race", "wexp", "mar", "paro", "prio"]]
+        sparse_rossi = rossi.copy()
+        for col in ["fin", "race", "wexp", "mar", "paro"]:
+            sparse_rossi[col] = pd.SparseArray(rossi[col].values, fill_value=0)
+
+        for strata in [None, ["wexp"]]:
+            expected = CoxPHFitter(tie_method=tie_method).fit(rossi, "week", "arrest", strata=strata)
+            cph = CoxPHFitter(tie_method=tie_method).fit(sparse_rossi, "week", "arrest", strata=strata)
+            assert_frame_equal(cph.summary, expected.summary, check_less_precise=True)
+            npt.assert_allclose(cph._log_likelihood, expected._log_likelihood)
+            assert_frame_equal(
+                cph.baseline_cumulative_hazard_, expected.baseline_cumulative_hazard_, check_less_precise=True
+            )
+
+    def test_predict_log_partial_hazard_with_sparse_matrix(self, rossi, cph):
+        cph.fit(rossi, "week", "arrest")
+        X = rossi.drop(["week", "arrest"], axis=1)[cph.hazards_.index]
+        expected = cph.predict_log_partial_hazard(X.values)
+        assert_frame_equal(cph.predict_log_partial_hazard(sparse.csr_matrix(X.values)), expected)
+
+    def test_to_scorer_is_the_same_as_predict(self, rossi, cph):
+        cph.fit(rossi, "week", "arrest")
+        scorer = cph.to_scorer()
+        X = rossi.drop(["week", "arrest"], axis=1).iloc[:5]
+        x = X[list(scorer.columns)].values
+
+        npt.assert_allclose(scorer.predict_log_partial_hazard(x), cph.predict_log_partial_hazard(X)[0].values)
+        npt.assert_allclose(scorer.predict_log_partial_hazard(x[0]), cph.predict_log_partial_hazard(X)[0].values[:1])
+        npt.assert_allclose(scorer.predict_survival_function(x), cph.predict_survival_function(X).values)
+        npt.assert_allclose(
+            scorer.predict_survival_function(x, times=[5.5, 10, 20.5]),
+            cph.predict_survival_function(X, times=[5.5, 10, 20.5]).values,
+        )
+        npt.assert_allclose(scorer.predict_percentile(x, p=0.8), cph.predict_percentile(X, p=0.8).values.ravel())
+
+    def test_to_scorer_with_strata(self, rossi, cph):
+        cph.fit(rossi, "week", "arrest", strata=["wexp"])
+        scorer = cph.to_scorer()
+        X = rossi[rossi["wexp"] == 1].iloc[:5]
+        x = X[list(scorer.columns)].values
+
+        npt.assert_allclose(scorer.predict_survival_function(x, stratum=1), cph.predict_survival_function(X).values)
+        with pytest.raises(StatError):
+            scorer.predict_survival_function(x, stratum=2)
+
+    def test_iter_predict_survival_function_is_the_same_as_predict_survival_function(self, rossi, cph):
+        X = rossi.drop(["week", "arrest"], axis=1)
+
+        for strata in [None, ["wexp"]]:
+            cph.fit(rossi, "week", "arrest", strata=strata)
+            for times in [None, [5.5, 10.0, 40.0]]:
+                chunks = list(cph.iter_predict_survival_function(X, times=times, chunksize=100))
+                assert [chunk.shape[1] for chunk in chunks] == [100, 100, 100, 100, 32]
+                actual = pd.concat(chunks, axis=1)
+                expected = cph.predict_survival_function(X, times=times)
+                npt.assert_allclose(actual.index.values, expected.index.values)
+                npt.assert_allclose(actual.values, expected[actual.columns].values)
+
+    def test_predict_expectation_is_the_integral_of_the_survival_function(self, rossi, cph):
+        X = rossi.drop(["week", "arrest"], axis=1)
+
+        for strata in [None, ["wexp"]]:
+            cph.fit(rossi, "week", "arrest", strata=strata)
+            # the survival functions are 1 at time 0.
+            sf = cph.predict_survival_function(X)[list(X.index)]
+            expected = trapz(np.column_stack([np.ones(X.shape[0]), sf.values.T]), np.append(0, sf.index))
+            npt.assert_allclose(cph.predict_expectation(X)[0].values, expected)
+
+            times = np.append(sf.index.values[sf.index.values < 20.5], 20.5)
+            sf = cph.predict_survival_function(X, times=times)[list(X.index)]
+            expected = trapz(np.column_stack([np.ones(X.shape[0]), sf.values.T]), np.append(0, times))
+            npt.assert_allclose(cph.predict_restricted_expectation(X, 20.5)[0].values, expected)
+
+            last_time = cph.baseline_cumulative_hazard_.index.max()
+            assert_frame_equal(cph.predict_restricted_expectation(X, last_time), cph.predict_expectation(X))
+
+    def test_predict_restricted_expectation_integrates_from_time_zero(self, rossi, cph):
+        X = rossi.drop(["week", "arrest"], axis=1)
+        cph.fit(rossi, "week", "arrest")
+        first_time = cph.baseline_cumulative_hazard_.index.min()
+        assert first_time > 0.5
+
+        # almost no one has the event before the first event time.
+        actual = cph.predict_restricted_expectation(X, 0.5)[0].values
+        npt.assert_allclose(actual, 0.5, rtol=1e-2)
+        assert (actual <= 0.5).all()
+
+        # a fine grid from 0, where the survival function is 1, to the horizon.
+        times = np.linspace(first_time, 30.0, 5000)
+        sf = cph.predict_survival_function(X, times=times)
+        expected = np.trapz(np.column_stack([np.ones(X.shape[0]), sf.values.T]), np.append(0, times))
+        npt.assert_allclose(cph.predict_restricted_expectation(X, 30.0)[0].values, expected, rtol=1e-3)
+
+    def test_predict_cumulative_hazard_with_strata_keeps_the_order_of_X(self, rossi, cph):
+        cph.fit(rossi, "week", "arrest", strata=["wexp", "paro"])
+        X = rossi.sample(50, random_state=0)
+
+        cumulative_hazard = cph.predict_cumulative_hazard(X)
+        assert list(cumulative_hazard.columns) == list(X.index)
+
+        partial_hazard = cph.predict_partial_hazard(X)[0]
+        for ix, row in X.iterrows():
+            expected = cph.baseline_cumulative_hazard_[(row["wexp"], row["paro"])] * partial_hazard.loc[ix]
+            npt.assert_allclose(cumulative_hazard[ix].values, expected.values)
+
+    def test_bootstrap_replicates_of_the_coefficients_are_close_to_the_standard_errors(self, rossi, cph):
+        cph.fit(rossi, "week", "arrest")
+        replicates = CoxPHFitter().bootstrap(
+            rossi, "week", "arrest", statistic=lambda model: model.hazards_, n_replicates=200, seed=0
+        )
+        assert replicates.shape == (200, cph.hazards_.shape[0])
+        npt.assert_allclose(replicates.mean(), cph.hazards_, atol=0.1)
+        npt.assert_allclose(replicates.std(), cph.standard_errors_, rtol=0.35)
+
+    @pytest.mark.parametrize("method", ["poisson", "multinomial"])
+    def test_bootstrap_is_the_same_in_parallel_as_in_serial(self, rossi, method):
+        kwargs = dict(statistic=lambda model: model.score_, n_replicates=10, method=method, strata=["wexp"], seed=1)
+        serial = CoxPHFitter().bootstrap(rossi, "week", "arrest", n_jobs=1, **kwargs)
+        parallel = CoxPHFitter().bootstrap(rossi, "week", "arrest", n_jobs=2, **kwargs)
+        assert list(serial.columns) == ["statistic"]
+        assert_frame_equal(serial, parallel)
+
+    def test_bootstrap_preprocesses_the_data_once(self, rossi, monkeypatch):
+        calls = []
+        preprocess_dataframe = CoxPHFitter._preprocess_dataframe
+
+        def counting_preprocess_dataframe(self, df):
+            calls.append(df.shape)
+            return preprocess_dataframe(self, df)
+
+        monkeypatch.setattr(CoxPHFitter, "_preprocess_dataframe", counting_preprocess_dataframe)
+        CoxPHFitter().bootstrap(rossi, "week", "arrest", statistic=lambda model: model.hazards_, n_replicates=3)
+        assert len(calls) == 1
+
+    def test_bootstrap_is_reproducible_with_a_seed(self, rossi):
+        kwargs = dict(statistic=lambda model: model.hazards_, n_replicates=3, seed=5)
+        first = CoxPHFitter().bootstrap(rossi, "week", "arrest", **kwargs)
+        assert_frame_equal(first, CoxPHFitter().bootstrap(rossi, "week", "arrest", **kwargs))
+        assert not first.duplicated().any()
+
+    def test_bootstrap_doesnt_change_the_fitted_model(self, rossi, cph):
+        cph.fit(rossi, "week", "arrest")
+        hazards = cph.hazards_.copy()
+        cph.bootstrap(rossi, "week", "arrest", statistic=lambda model: model.hazards_, n_replicates=2)
+        assert_series_equal(cph.hazards_, hazards)
+
     def test_efron_newtons_method(self, data_nus, cph):
         cph._batch_mode = False
         newton = cph._fit_model
@@ -2563,6 +3069,9 @@ Log-likelihood ratio test = 33.27 on 7 df, -log2(p)=15.37
         cf.fit(rossi, duration_col="week", event_col="arrest", show_progress=True, batch_mode=False)
         npt.assert_array_almost_equal(cf.hazards_.values, expected, decimal=6)
 
+        cf.fit(rossi, duration_col="week", event_col="arrest", show_progress=True, batch_mode=None)
+        npt.assert_array_almost_equal(cf.hazards_.values, expected, decimal=6)
+
     def test_coef_output_against_R_with_strata_super_accurate(self, rossi):
         """
         from http://cran.r-project.org/doc/contrib/Fox-Companion/appendix-cox-regression.pdf
@@ -2719,6 +3228,25 @@ Log-likelihood ratio test = 33.27 on 7 df, -log2(p)=15.37
         actual = cph._compute_delta_beta(X, df["T"], df["E"], df["weights"])
         npt.assert_allclose(expected, actual, rtol=0.001)
 
+    @pytest.mark.parametrize("tie_method", ["Efron", "Breslow"])
+    def test_score_residuals_with_ties_sum_to_the_efron_gradient(self, rossi, tie_method):
+        rossi = rossi.sort_values("week")
+        weights = np.random.uniform(0.5, 2.0, size=rossi.shape[0])
+        T = rossi["week"].values.astype(float)
+        E = rossi["arrest"].values.astype(bool)
+
+        cph = CoxPHFitter(tie_method=tie_method)
+        cph.fit(rossi, "week", "arrest")
+        X = normalize(rossi.drop(["week", "arrest"], axis=1), cph._norm_mean, cph._norm_std).values
+
+        # move away from the MLE, so the gradient is non-trivial.
+        beta = cph.hazards_.values * cph._norm_std.values + 0.1 * np.random.randn(X.shape[1])
+        cph.hazards_ = pd.Series(beta, index=cph.hazards_.index) / cph._norm_std
+
+        score_residuals = cph._compute_score_within_strata(X, T, E, weights)
+        _, gradient, _ = cph._get_efron_values_batch(X, T, E, weights, beta)
+        npt.assert_allclose(score_residuals.sum(0), gradient, atol=1e-8)
+
     def test_cluster_option(self):
         """
         library(survival)
@@ -3802,6 +4330,30 @@ class TestCoxTimeVaryingFitter:
         ctv.fit(rossi_ctv, start_col="start", stop_col="stop", event_col="arrest", id_col="index")
         npt.assert_array_almost_equal(ctv.hazards_.values, expected, decimal=4)
 
+    def test_ctv_robust_errors_are_the_same_as_static_cox_model(self, ctv, rossi):
+        cph = CoxPHFitter()
+        cph.fit(rossi, "week", "arrest", robust=True)
+
+        rossi_ctv = rossi.reset_index()
+        rossi_ctv = to_long_format(rossi_ctv, "week")
+
+        ctv.fit(rossi_ctv, start_col="start", stop_col="stop", event_col="arrest", id_col="index", robust=True)
+        npt.assert_allclose(ctv.standard_errors_.values, cph.standard_errors_.values, rtol=1e-4)
+
+    def test_ctv_robust_errors_are_invariant_to_splitting_subjects_into_more_periods(self, ctv, heart):
+        ctv.fit(heart, id_col="id", event_col="event", robust=True)
+        expected = ctv.standard_errors_
+
+        first = heart.copy()
+        first["stop"] = (heart["start"] + heart["stop"]) / 2
+        first["event"] = 0
+        second = heart.copy()
+        second["start"] = first["stop"]
+        split_heart = pd.concat([first, second]).reset_index(drop=True)
+
+        ctv.fit(split_heart, id_col="id", event_col="event", robust=True)
+        assert_series_equal(ctv.standard_errors_, expected)
+
     def test_ctv_fitter_will_handle_integer_weight_as_static_model(self, ctv, rossi):
         # deleting some columns to create more duplicates
         del rossi["age"]
@@ -3978,6 +4530,19 @@ class TestCoxTimeVaryingFitter:
             ctv.baseline_cumulative_hazard_.values[:, 0], expected, decimal=2
         )  # errors accumulate fast =(
 
+    def test_risk_set_sums_are_the_same_as_scanning_every_death_time(self, ctv, heart):
+        start, stop = heart["start"].values, heart["stop"].values
+        values = np.random.exponential(size=heart.shape[0])
+        death_times = np.unique(stop[heart["event"].values.astype(bool)])
+
+        entries, exits = ctv._risk_set_entries_and_exits(start, stop, death_times)
+        actual = ctv._sum_over_risk_sets(values, entries, exits, death_times.shape[0])
+        expected = np.array([values[(start < t) & (t <= stop)].sum() for t in death_times])
+        npt.assert_allclose(actual, expected)
+
+        actual = ctv._sum_over_risk_sets(np.c_[values, 2 * values], entries, exits, death_times.shape[0])
+        npt.assert_allclose(actual, np.c_[expected, 2 * expected])
+
     def test_repr_with_fitter(self, ctv, heart):
         ctv.fit(heart, id_col="id", event_col="event")
         uniques = heart["id"].unique().shape[0]
@@ -4098,6 +4663,14 @@ Likelihood ratio test = 15.11 on 4 df, -log2(p)=7.80
         ctv.fit(heart, id_col="id", event_col="event", strata=["transplant", "surgery"])
         npt.assert_allclose(ctv._log_likelihood, -230.6726, atol=0.01)
 
+    def test_ctv_with_strata_in_parallel_is_the_same_as_serial(self, ctv, heart):
+        ctv.fit(heart, id_col="id", event_col="event", strata=["transplant", "surgery"], robust=True)
+        expected = ctv.summary
+
+        ctv.fit(heart, id_col="id", event_col="event", strata=["transplant", "surgery"], robust=True, n_jobs=2)
+        assert_frame_equal(ctv.summary, expected)
+        assert ctv._executor is None
+
     def test_ctv_ratio_test_with_strata(self, ctv, heart):
         ctv.fit(heart, id_col="id", event_col="event", strata=["transplant"])
         npt.assert_allclose(ctv.log_likelihood_ratio_test().test_statistic, 15.68, atol=0.01)
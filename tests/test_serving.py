@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+from pandas.util.testing import assert_series_equal
+
+from lifelines import CoxPHFitter, WeibullAFTFitter, AalenAdditiveFitter
+from lifelines.datasets import load_rossi
+from lifelines.serving import BatchingPredictor
+
+
+@pytest.fixture
+def rossi():
+    return load_rossi()
+
+
+def predict_concurrently(predictor, subjects):
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(asyncio.gather(*[predictor.predict(subject) for subject in subjects]))
+
+
+@pytest.mark.parametrize("model", [CoxPHFitter(), WeibullAFTFitter(), AalenAdditiveFitter()])
+def test_batched_survival_functions_are_the_same_as_predict(rossi, model):
+    model.fit(rossi, "week", "arrest")
+    X = rossi.drop(["week", "arrest"], axis=1).iloc[:10]
+
+    predictor = BatchingPredictor(model, "predict_survival_function", max_batch_size=4)
+    results = predict_concurrently(predictor, [row for _, row in X.iterrows()])
+
+    expected = model.predict_survival_function(X)
+    for i, result in enumerate(results):
+        assert_series_equal(result, expected.iloc[:, i], check_names=False)
+
+
+def test_batched_scalar_predictions_are_the_same_as_predict(rossi):
+    cph = CoxPHFitter().fit(rossi, "week", "arrest")
+    X = rossi.drop(["week", "arrest"], axis=1).iloc[:10]
+
+    predictor = BatchingPredictor(cph, "predict_partial_hazard", max_delay=0.01)
+    results = predict_concurrently(predictor, [row.to_dict() for _, row in X.iterrows()])
+    npt.assert_allclose(results, cph.predict_partial_hazard(X)[0].values)
+
+    predictor = BatchingPredictor(cph, "predict_median", max_batch_size=1)
+    results = predict_concurrently(predictor, [row for _, row in X.iterrows()])
+    npt.assert_allclose(results, cph.predict_median(X).values.ravel())
+
+
+def test_batches_are_computed_in_an_executor(rossi):
+    cph = CoxPHFitter().fit(rossi, "week", "arrest")
+    X = rossi.drop(["week", "arrest"], axis=1).iloc[:5]
+
+    with ThreadPoolExecutor(2) as executor:
+        predictor = BatchingPredictor(cph, "predict_survival_function", executor=executor, times=[10, 20])
+        results = predict_concurrently(predictor, [row for _, row in X.iterrows()])
+
+    npt.assert_allclose(np.column_stack(results), cph.predict_survival_function(X, times=[10, 20]).values)
+
+
+def test_errors_are_raised_to_every_caller(rossi):
+    cph = CoxPHFitter().fit(rossi, "week", "arrest")
+    predictor = BatchingPredictor(cph, "predict_partial_hazard")
+
+    # the wrong number of columns
+    subjects = [np.ones(2)] * 3
+    loop = asyncio.get_event_loop()
+    results = loop.run_until_complete(
+        asyncio.gather(*[predictor.predict(subject) for subject in subjects], return_exceptions=True)
+    )
+    assert all(isinstance(result, Exception) for result in results)
+
+
+def test_unknown_method_raises(rossi):
+    cph = CoxPHFitter().fit(rossi, "week", "arrest")
+    with pytest.raises(ValueError):
+        BatchingPredictor(cph, "fit")
+
+
+def test_close_waits_for_the_batches_in_flight(rossi):
+    cph = CoxPHFitter().fit(rossi, "week", "arrest")
+    X = rossi.drop(["week", "arrest"], axis=1).iloc[:6]
+    predictor = BatchingPredictor(cph, "predict_partial_hazard", max_batch_size=4, max_delay=60)
+
+    async def predict_and_close():
+        futures = [asyncio.ensure_future(predictor.predict(row)) for _, row in X.iterrows()]
+        await asyncio.sleep(0)
+        # the first batch of 4 is in flight, and the last 2 subjects are waiting for max_delay.
+        assert len(predictor._tasks) == 1
+        await predictor.close()
+        assert not predictor._tasks
+        return await asyncio.gather(*futures)
+
+    results = asyncio.get_event_loop().run_until_complete(predict_and_close())
+    npt.assert_allclose(results, cph.predict_partial_hazard(X)[0].values)
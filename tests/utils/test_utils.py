@@ -200,6 +200,37 @@ def test_qth_survival_times_with_duplicate_q_returns_valid_index_and_shape():
     npt.assert_almost_equal(actual.index.values, q.values)
 
 
+def test_qth_survival_times_is_the_same_as_qth_survival_time_for_each_column():
+    sf = pd.DataFrame(
+        np.exp(-np.cumsum(np.random.exponential(0.1, size=(100, 20)), 0)), index=np.sort(np.random.rand(100) * 10)
+    )
+    sf[20] = 1.0  # never crosses
+
+    for q in [0.2, 0.5, 0.9]:
+        expected = [utils.qth_survival_time(q, sf[col]) for col in sf.columns]
+        npt.assert_allclose(utils.qth_survival_times(q, sf).loc[q].values, expected)
+
+    cdf = 1 - sf
+    for q in [0.01, 0.5, 0.9]:
+        expected = [utils.qth_survival_time(q, cdf[col], cdf=True) for col in cdf.columns[:-1]]
+        actual = utils.qth_survival_times([q, 0.999], cdf, cdf=True).loc[q]
+        npt.assert_allclose(actual.values[:-1], expected)
+        assert actual.values[-1] == np.inf
+
+
+def test_qth_survival_times_of_non_monotone_columns_is_the_first_crossing():
+    non_monotone = [1.0, 0.4, 0.7, 0.45, 0.3]
+    sf = pd.DataFrame({"a": non_monotone, "b": np.linspace(1, 0.1, 5), "c": 1.0}, index=[1.0, 2.0, 3.0, 4.0, 5.0])
+
+    assert utils.qth_survival_times(0.5, sf[["a"]]) == 2.0
+    npt.assert_allclose(utils.qth_survival_times(0.5, sf).loc[0.5].values, [2.0, 4.0, np.inf])
+    npt.assert_allclose(utils.qth_survival_times([0.5, 0.42], sf[["a"]])["a"].values, [2.0, 2.0])
+
+    cdf = 1 - sf
+    assert utils.qth_survival_times(0.5, cdf[["a"]], cdf=True) == 2.0
+    npt.assert_allclose(utils.qth_survival_times(0.5, cdf, cdf=True).loc[0.5].values, [2.0, 4.0, np.inf])
+
+
 def test_qth_survival_time_with_cdf_instead_of_survival_function():
     cdf = np.linspace(0, 1, 50)
     assert utils.qth_survival_times(0.5, cdf, cdf=True) == 25
@@ -420,6 +451,37 @@ def test_cross_validator_with_specific_loss_function():
     assert list(results_sq) != list(results_con)
 
 
+def test_parallel_cross_validator_returns_a_row_per_fitter_repeat_and_fold():
+    fitters = [CoxPHFitter(), CoxPHFitter(penalizer=0.1)]
+    results = utils.parallel_k_fold_cross_validation(
+        fitters, load_regression_dataset(), duration_col="T", event_col="E", k=3, n_repeats=2
+    )
+    assert results.shape[0] == 2 * 2 * 3
+    assert list(results.columns) == ["fitter", "repeat", "fold", "score", "fit_time", "predict_time"]
+    assert (results[["fit_time", "predict_time"]] > 0).all().all()
+
+
+def test_parallel_cross_validator_is_the_same_in_parallel_as_in_serial():
+    fitters = [CoxPHFitter(), CoxPHFitter(penalizer=0.1)]
+    kwargs = dict(duration_col="week", event_col="arrest", k=4, seed=0)
+    serial = utils.parallel_k_fold_cross_validation(fitters, load_rossi(), n_jobs=1, **kwargs)
+    parallel = utils.parallel_k_fold_cross_validation(fitters, load_rossi(), n_jobs=2, **kwargs)
+    assert_frame_equal(serial[["fitter", "repeat", "fold", "score"]], parallel[["fitter", "repeat", "fold", "score"]])
+
+
+def test_parallel_cross_validator_stratifies_by_event():
+    rossi = load_rossi()
+
+    def events_in_fold(T_actual, T_pred, E_actual):
+        return E_actual.sum()
+
+    results = utils.parallel_k_fold_cross_validation(
+        CoxPHFitter(), rossi, "week", "arrest", k=4, evaluation_measure=events_in_fold, n_repeats=3
+    )
+    assert results["score"].max() - results["score"].min() <= 1
+    assert results.groupby("repeat")["score"].sum().eq(rossi["arrest"].sum()).all()
+
+
 def test_concordance_index():
     size = 1000
     T = np.random.normal(size=size)